@@ -0,0 +1,55 @@
+"""
+Benchmark the scaling of parallel chunked evaluation with the number of threads.
+
+Evaluates each expression over a large uniform grid with app.utils.parallel.ParallelEvaluator
+configured with 1, 2, 4 and 8 threads, and reports the median time and the speedup over a single
+thread. The speedup is bounded by the number of cores of the machine.
+
+Usage:
+    PYTHONPATH=src python benchmarks/parallel.py [--samples 10000000] [--repeats 5] [--threads 1 2 4 8]
+"""
+import argparse
+import os
+import statistics
+import time
+
+from app.utils.evaluation import compile_function, linear_grid
+from app.utils.parallel import ParallelEvaluator
+
+EXPRESSIONS = [
+    "x^5 - 4*x^3 + 2*x - 7",
+    "exp(-x^2/10)*sin(5*x)",
+    "sin(cos(x)^2 + exp(sin(x/3)))*sqrt(x^2 + 1)",
+]
+X_RANGE = (-10.0, 10.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10_000_000, help="number of x samples evaluated")
+    parser.add_argument("--repeats", type=int, default=5, help="number of timed evaluations per measurement")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts to measure")
+    args = parser.parse_args()
+
+    x_data = linear_grid(X_RANGE, args.samples)
+    print(f"{args.samples} samples, {os.cpu_count()} cores")
+    print(f"{'expression':<48}{'threads':>8}{'time (ms)':>12}{'speedup':>10}")
+    for expression in EXPRESSIONS:
+        function = compile_function(expression)
+        baseline = None
+        for threads in args.threads:
+            evaluator = ParallelEvaluator(threads=threads)
+            evaluator(function, x_data)
+            timings = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                evaluator(function, x_data)
+                timings.append((time.perf_counter() - start) * 1000)
+            evaluator.set_threads(1)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            print(f"{expression:<48}{threads:>8}{median:>12.2f}{baseline / median:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark the redraw latency of each plot type.
+
+Compares rebuilding the figure on every draw, as Plotter did before artists were kept between
+draws, with updating the persistent artists of app.utils.renderers in place. Both strategies
+render to an Agg canvas, so no display is needed. The plot types that draw one artist per sample
+are also measured with their collection renderers, marked with '(collection)'.
+
+Usage:
+    PYTHONPATH=src python benchmarks/redraw.py [--samples 100] [--repeats 50]
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from app.utils.constants import PLOT_PLACE_FROM_CANVAS
+from app.utils.plot_option import PlotOption
+from app.utils.renderers import COLLECTION_RENDERERS, RENDERERS, autoscale
+
+PLOT_FUNCTIONS = {
+    PlotOption.PLOT: "plot",
+    PlotOption.SCATTER: "scatter",
+    PlotOption.BAR: "bar",
+    PlotOption.STEM: "stem",
+    PlotOption.STEP: "step",
+}
+
+
+def redraw_rebuild(figure: Figure, draw_option: PlotOption, x_data: np.ndarray, y_data: np.ndarray) -> None:
+    """Clear the figure and recreate the axes and artists, then draw the canvas."""
+    figure.clear()
+    ax = figure.add_subplot(PLOT_PLACE_FROM_CANVAS)
+    getattr(ax, PLOT_FUNCTIONS[draw_option])(x_data, y_data)
+    figure.canvas.draw()
+
+
+def redraw_incremental(renderer, x_data: np.ndarray, y_data: np.ndarray) -> None:
+    """Update the persistent artists in place, then draw the canvas."""
+    renderer.update(x_data, y_data)
+    autoscale(renderer.ax, x_data, y_data)
+    renderer.ax.figure.canvas.draw()
+
+
+def time_redraws(redraw, datasets, repeats: int) -> float:
+    """Return the median time of a redraw in milliseconds, alternating between the datasets."""
+    timings = []
+    for i in range(repeats):
+        x_data, y_data = datasets[i % len(datasets)]
+        start = time.perf_counter()
+        redraw(x_data, y_data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100, help="number of x samples per draw")
+    parser.add_argument("--repeats", type=int, default=50, help="number of redraws per measurement")
+    args = parser.parse_args()
+
+    x_data = np.linspace(-10, 10, args.samples + 1)
+    datasets = [(x_data, np.sin(x_data)), (x_data, np.cos(x_data))]
+
+    print(f"{'plot type':<24}{'rebuild (ms)':>15}{'incremental (ms)':>19}{'speedup':>10}")
+    for draw_option in PlotOption:
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        rebuild = time_redraws(lambda x, y: redraw_rebuild(figure, draw_option, x, y), datasets, args.repeats)
+
+        renderers = [(draw_option.name, RENDERERS[draw_option])]
+        if draw_option in COLLECTION_RENDERERS:
+            renderers.append((f"{draw_option.name} (collection)", COLLECTION_RENDERERS[draw_option]))
+        for name, renderer_class in renderers:
+            figure = Figure()
+            FigureCanvasAgg(figure)
+            renderer = renderer_class(figure.add_subplot(PLOT_PLACE_FROM_CANVAS))
+            incremental = time_redraws(lambda x, y: redraw_incremental(renderer, x, y), datasets, args.repeats)
+            print(f"{name:<24}{rebuild:>15.2f}{incremental:>19.2f}{rebuild / incremental:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
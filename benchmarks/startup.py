@@ -0,0 +1,112 @@
+"""
+Benchmark the startup time of the Plotter window.
+
+Measures, in fresh interpreters, the import time of app.plotter as reported by -X importtime,
+the time until the window is shown and the time until the canvas is ready. Exits with status 1
+if the median import time or time to show the window exceeds its budget, so the benchmark can
+guard against startup regressions.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen PYTHONPATH=src python benchmarks/startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+IMPORT_BUDGET_MS = 600.0
+SHOW_BUDGET_MS = 900.0
+
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+from app.plotter import Plotter
+imported = time.perf_counter()
+app = QApplication([])
+timings = {}
+create_canvas = Plotter.create_canvas
+def timed_create_canvas(self):
+    timings["show"] = time.perf_counter()
+    create_canvas(self)
+Plotter.create_canvas = timed_create_canvas
+plotter = Plotter()
+ready = time.perf_counter()
+print(json.dumps({"import": (imported - start) * 1000, "show": (timings["show"] - start) * 1000,
+                  "ready": (ready - start) * 1000}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, str, float]]:
+    """
+    Parse the output of -X importtime into the cumulative import time of each module.
+
+    Args:
+        stderr (str): The standard error of an interpreter run with -X importtime.
+
+    Returns:
+        list: The nesting depth, name and cumulative import time in milliseconds of each module,
+            where depth 0 are the modules imported at the top level of the interpreter.
+
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((depth, name.strip(), int(cumulative) / 1000))
+    return modules
+
+
+def measure_imports() -> Tuple[float, List[Tuple[str, float]]]:
+    """Return the cumulative import time of app.plotter and the slowest modules it imports directly."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.plotter"],
+                            capture_output=True, text=True, check=True)
+    modules = parse_importtime(result.stderr)
+    total = next(cumulative for depth, name, cumulative in modules if depth == 0 and name == "app.plotter")
+    direct = [(name, cumulative) for depth, name, cumulative in modules if depth == 1]
+    return total, sorted(direct, key=lambda module: -module[1])[:10]
+
+
+def measure_startup() -> Dict[str, float]:
+    """Return the times to import, show the window and create the canvas in milliseconds."""
+    environment = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, text=True, check=True,
+                            env=environment)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters to measure")
+    args = parser.parse_args()
+
+    import_times = []
+    for _ in range(args.runs):
+        total, slowest = measure_imports()
+        import_times.append(total)
+    startups = [measure_startup() for _ in range(args.runs)]
+
+    import_time = statistics.median(import_times)
+    show_time = statistics.median(startup["show"] for startup in startups)
+    ready_time = statistics.median(startup["ready"] for startup in startups)
+
+    print("Slowest imports of app.plotter (ms):")
+    for name, cumulative in slowest:
+        print(f"  {cumulative:>8.1f}  {name}")
+    print(f"import app.plotter: {import_time:8.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    print(f"window shown:       {show_time:8.1f} ms (budget {SHOW_BUDGET_MS:.0f} ms)")
+    print(f"canvas ready:       {ready_time:8.1f} ms")
+
+    if import_time > IMPORT_BUDGET_MS or show_time > SHOW_BUDGET_MS:
+        print("Startup is over budget.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
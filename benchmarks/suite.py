@@ -0,0 +1,214 @@
+"""
+Benchmark the parse, evaluate, render and zoom paths of the plotter.
+
+Runs headless on the offscreen Qt platform over a matrix of expressions, from simple polynomials
+to nested trigonometric and exponential functions, and sample counts from 10 to 10^6. Each stage
+is timed (median of the repeats) and its peak memory is traced with tracemalloc. The results can
+be saved as JSON and compared with a previous run, failing when a stage got slower than the
+allowed ratio.
+
+Stages:
+    parse     parsing the expression and compiling its NumPy kernel, without the expression cache
+    evaluate  vectorized evaluation of the compiled expression over the samples
+    render    decimation, artist update and a full canvas draw in Plotter, per plot type
+    zoom      Plotter.zoom, including resampling the visible window and redrawing the canvas
+
+Usage:
+    PYTHONPATH=src python benchmarks/suite.py [--quick] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import matplotlib  # noqa: E402
+import numpy as np  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from app.plotter import Plotter  # noqa: E402
+from app.utils.constants import ZOOM_IN, ZOOM_OUT  # noqa: E402
+from app.utils.decimation import minmax_decimate  # noqa: E402
+from app.utils.evaluation import compile_function, linear_grid  # noqa: E402
+from app.utils.plot_option import PlotOption  # noqa: E402
+from app.utils.sampling_mode import SamplingMode  # noqa: E402
+from app.utils.tiles import tile_cache  # noqa: E402
+
+EXPRESSIONS = [
+    "x^2 + 3*x + 1",
+    "x^5 - 4*x^3 + 2*x - 7",
+    "(x^2 + 1)/(x^2 - 2*x + 5)",
+    "sin(x)*cos(2*x)",
+    "exp(-x^2/10)*sin(5*x)",
+    "sin(cos(x)^2 + exp(sin(x/3)))*sqrt(x^2 + 1)",
+]
+SAMPLE_COUNTS = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+QUICK_SAMPLE_COUNTS = [10, 1_000, 100_000]
+X_RANGE = (-10.0, 10.0)
+REGRESSION_RATIO = 1.25
+
+
+def measure(stage: Callable[[], None], repeats: int) -> Dict[str, float]:
+    """
+    Time a stage and trace its peak memory.
+
+    The stage runs once untraced to warm up, then repeats times timed, then once more under tracemalloc,
+    so tracing does not slow down the timed runs.
+
+    Args:
+        stage (Callable): The stage to measure.
+        repeats (int): The number of timed runs.
+
+    Returns:
+        dict: The median seconds and the peak traced bytes of the stage.
+
+    """
+    stage()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        stage()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": statistics.median(timings), "peak_bytes": peak}
+
+
+def wait_for_worker(app: QApplication, plotter: Plotter) -> None:
+    """Process events until the worker delivered the result of the latest job."""
+    while plotter.worker.is_busy():
+        app.processEvents()
+
+
+def run_suite(expressions: List[str], sample_counts: List[int], repeats: int) -> List[Dict]:
+    """
+    Run every stage over the matrix of expressions and sample counts.
+
+    Args:
+        expressions (list): The function strings to benchmark.
+        sample_counts (list): The sample counts to benchmark.
+        repeats (int): The number of timed runs of each stage.
+
+    Returns:
+        list: One record per stage, expression, sample count and plot type.
+
+    """
+    app = QApplication.instance() or QApplication([])
+    plotter = Plotter()
+    results = []
+
+    def record(stage: str, expression: str, samples: Optional[int], measurement: Dict[str, float],
+               plot: Optional[str] = None) -> None:
+        results.append(dict(stage=stage, expression=expression, samples=samples, plot=plot, **measurement))
+        label = f"{stage:<9}{plot or '':<8}{samples or '':>9}  {expression}"
+        print(f"{label:<80}{measurement['seconds'] * 1000:>10.2f} ms{measurement['peak_bytes'] / 2 ** 20:>10.2f} MiB",
+              flush=True)
+
+    for expression in expressions:
+        record("parse", expression, None, measure(lambda: compile_function(expression), repeats))
+        function = compile_function(expression)
+
+        for samples in sample_counts:
+            x_data = linear_grid(X_RANGE, samples)
+            record("evaluate", expression, samples, measure(lambda: function(x_data), repeats))
+            y_data = function(x_data)
+
+            for draw_option in PlotOption:
+                def render() -> None:
+                    data = minmax_decimate(x_data, y_data, plotter.pixel_width())
+                    plotter.show_data(draw_option, (expression, samples, SamplingMode.UNIFORM), *data)
+                    plotter.canvas.draw()
+                record("render", expression, samples, measure(render, repeats), draw_option.name)
+
+            def zoom() -> None:
+                tile_cache.clear()
+                plotter.zoom(ZOOM_IN)
+                wait_for_worker(app, plotter)
+                plotter.zoom(ZOOM_OUT)
+                wait_for_worker(app, plotter)
+                plotter.canvas.draw()
+            plotter.draw_option = PlotOption.PLOT
+            plotter.show_data(PlotOption.PLOT, (expression, samples, SamplingMode.UNIFORM),
+                              *minmax_decimate(x_data, y_data, plotter.pixel_width()))
+            record("zoom", expression, samples, measure(zoom, repeats), PlotOption.PLOT.name)
+
+    plotter.close()
+    return results
+
+
+def compare(results: List[Dict], baseline: List[Dict], ratio: float) -> List[str]:
+    """
+    Find the stages that got slower than a baseline run by more than the allowed ratio.
+
+    Args:
+        results (list): The records of this run.
+        baseline (list): The records of the baseline run.
+        ratio (float): The allowed ratio of the time of this run to the time of the baseline.
+
+    Returns:
+        list: A description of each regression.
+
+    """
+    def key(record: Dict) -> tuple:
+        return record["stage"], record["expression"], record["samples"], record["plot"]
+
+    baseline_seconds = {key(record): record["seconds"] for record in baseline}
+    regressions = []
+    for record in results:
+        before = baseline_seconds.get(key(record))
+        if before and record["seconds"] > before * ratio:
+            stage, expression, samples, plot = key(record)
+            regressions.append(f"{stage} {plot or ''} {samples or ''} {expression}: "
+                               f"{before * 1000:.2f} ms -> {record['seconds'] * 1000:.2f} ms")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="run a reduced matrix")
+    parser.add_argument("--repeats", type=int, default=3, help="number of timed runs of each stage")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results of a previous run saved as JSON")
+    parser.add_argument("--ratio", type=float, default=REGRESSION_RATIO,
+                        help="slowdown ratio reported as a regression when comparing")
+    args = parser.parse_args()
+
+    expressions = EXPRESSIONS[::2] if args.quick else EXPRESSIONS
+    sample_counts = QUICK_SAMPLE_COUNTS if args.quick else SAMPLE_COUNTS
+    results = run_suite(expressions, sample_counts, args.repeats)
+
+    if args.output:
+        report = {
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "numpy": np.__version__,
+                "matplotlib": matplotlib.__version__,
+                "repeats": args.repeats,
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file)["results"], args.ratio)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.utils.cache import expression_cache
+from app.utils.checks import check_2d_function, check_3d_function
+from app.utils.constants import SLIDER_STARTING_VALUE
+from app.utils.decimation import minmax_decimate
+from app.utils.evaluation import split_functions
+from app.utils.parameters import bind_parameters
+from app.utils.plot_option import PlotOption
+from app.utils.renderers import FigureRenderer
+from app.utils.sampling import sample_function
+from app.utils.sampling_mode import SamplingMode
+from app.utils.surface import grid_samples, sample_surface
+from app.utils.surface_option import SurfaceOption
+
+IMAGE_FORMATS = ("png", "svg")
+
+
+class PlotSpec(NamedTuple):
+    """
+    The description of one plot to render in batch.
+
+    Attributes:
+        index (int): The position of the spec in the spec file, starting at 1.
+        function (str): The function of x, or of x and y for a SurfaceOption, to plot.
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        samples (int): The number of x samples.
+        draw_option (PlotOption or SurfaceOption): The type of plot to draw.
+        sampling_mode (SamplingMode): The way of choosing the x samples.
+        output (str): The path of the image to write.
+        y_range (tuple): The range of y as a tuple (ymin, ymax), for a SurfaceOption only.
+
+    """
+    index: int
+    function: str
+    x_range: Tuple[float, float]
+    samples: int
+    draw_option: Union[PlotOption, SurfaceOption]
+    sampling_mode: SamplingMode
+    output: str
+    y_range: Optional[Tuple[float, float]] = None
+
+
+class PlotResult(NamedTuple):
+    """
+    The outcome of rendering one PlotSpec.
+
+    Attributes:
+        spec (PlotSpec): The rendered spec.
+        seconds (float): The time spent evaluating and rendering the plot.
+        error (str): The error that stopped the plot from being rendered, None on success.
+
+    """
+    spec: PlotSpec
+    seconds: float
+    error: Optional[str] = None
+
+
+def read_specs(path: str, output_dir: str, image_format: str) -> Iterator[PlotSpec]:
+    """
+    Read plot specs from a JSON lines file.
+
+    Each non-empty line is a JSON object with the keys "function", "xmin" and "xmax", and optionally
+    "samples" (defaults to the slider's starting value), "plot" (a PlotOption or SurfaceOption name,
+    defaults to PLOT), "sampling" (a SamplingMode name, defaults to UNIFORM) and "output" (a file name
+    inside output_dir, defaults to a numbered name in image_format), and the values of the parameters
+    of the function, such as "a": 2, which default to their starting values in the window. Specs plotting
+    a SurfaceOption also need the keys "ymin" and "ymax".
+
+    Args:
+        path (str): The path of the spec file.
+        output_dir (str): The directory the images are written to.
+        image_format (str): The image format of outputs without an explicit file name.
+
+    Yields:
+        PlotSpec: The specs in the order of the file.
+
+    Raises:
+        ValueError: If a line is not a valid spec.
+
+    """
+    with open(path, encoding="utf-8") as spec_file:
+        for line_number, line in enumerate(spec_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                fields = json.loads(line)
+                output = fields.get("output") or f"plot_{line_number:05d}.{image_format}"
+                yield read_spec(fields, line_number, os.path.join(output_dir, output))
+            except (ValueError, KeyError, TypeError) as error:
+                raise ValueError(f"{path}:{line_number}: invalid plot spec: {error!r}") from error
+
+
+def read_spec(fields: Dict[str, Any], index: int, output: str) -> PlotSpec:
+    """
+    Build a plot spec from its fields, see read_specs() for the keys and their defaults.
+
+    The parameters of the function, such as a in 'a*sin(x)', are replaced with the field of the same name,
+    or with their starting value as in the window, see app.utils.parameters.bind_parameters().
+
+    Args:
+        fields (dict): The fields of the spec, as numbers or as strings.
+        index (int): The position of the spec.
+        output (str): The path of the image to write.
+
+    Returns:
+        PlotSpec: The plot spec.
+
+    Raises:
+        ValueError: If a field has an invalid value.
+        KeyError: If a required field is missing, or a plot type or sampling mode is unknown.
+
+    """
+    draw_option = read_plot_option(str(fields.get("plot", PlotOption.PLOT.name)))
+    y_range = None
+    if isinstance(draw_option, SurfaceOption):
+        y_range = float(fields["ymin"]), float(fields["ymax"])
+    return PlotSpec(
+        index=index,
+        function=bind_parameters(str(fields["function"]), fields),
+        x_range=(float(fields["xmin"]), float(fields["xmax"])),
+        samples=int(fields.get("samples", SLIDER_STARTING_VALUE)),
+        draw_option=draw_option,
+        sampling_mode=SamplingMode[str(fields.get("sampling", SamplingMode.UNIFORM.name)).upper()],
+        output=output,
+        y_range=y_range,
+    )
+
+
+def read_plot_option(name: str) -> Union[PlotOption, SurfaceOption]:
+    """
+    Look up the type of plot of a spec by its name.
+
+    Args:
+        name (str): The name of a PlotOption or a SurfaceOption, in any case.
+
+    Returns:
+        PlotOption or SurfaceOption: The type of plot.
+
+    Raises:
+        KeyError: If no type of plot has the name.
+
+    """
+    name = name.upper()
+    if name in SurfaceOption.__members__:
+        return SurfaceOption[name]
+    return PlotOption[name]
+
+
+figure_renderer: Optional[FigureRenderer] = None
+
+
+def sample_spec(spec: PlotSpec) -> Tuple[np.ndarray, ...]:
+    """
+    Evaluate the function of a plot spec at all its samples.
+
+    Parameters left in the function of a spec built without read_spec() take their starting value.
+
+    Args:
+        spec (PlotSpec): The plot to evaluate.
+
+    Returns:
+        tuple: The x data and y data of a function of x, with one row of y data per function, or the
+            x values, y values and z values of the grid of a function of x and y.
+
+    Raises:
+        ValueError: If the function is not valid, checked the same way as in the plotter.
+
+    """
+    surface = isinstance(spec.draw_option, SurfaceOption)
+    if not (check_3d_function(spec.function) if surface else check_2d_function(spec.function)):
+        raise ValueError(f"invalid function of {'x and y' if surface else 'x'}: {spec.function!r}")
+    if surface:
+        surface = expression_cache.get_surface(spec.function)
+        intervals = grid_samples(spec.samples, spec.sampling_mode)
+        return sample_surface(surface, spec.x_range, spec.y_range, intervals, intervals)
+    function = expression_cache.get_function(bind_parameters(spec.function))
+    return sample_function(function, spec.x_range, spec.samples, spec.sampling_mode)
+
+
+def draw_spec(renderer: FigureRenderer, spec: PlotSpec) -> None:
+    """
+    Evaluate a plot spec and draw it on a figure renderer, without saving it.
+
+    Functions of x and y are drawn from the full grid, without the decimation of the interactive view.
+
+    Args:
+        renderer (FigureRenderer): The renderer to draw on.
+        spec (PlotSpec): The plot to draw.
+
+    """
+    if isinstance(spec.draw_option, SurfaceOption):
+        x_data, y_data, z_data = sample_spec(spec)
+        renderer.plot_surface(spec.draw_option, x_data, y_data, z_data, title=f"f(x, y) = {spec.function}")
+    else:
+        x_data, y_data = minmax_decimate(*sample_spec(spec), renderer.pixel_width())
+        renderer.plot(spec.draw_option, x_data, y_data, title=f"f(x) = {spec.function}", labels=split_functions(spec.function))
+
+
+def render_spec(spec: PlotSpec) -> PlotResult:
+    """
+    Evaluate and render one plot spec to its output file.
+
+    Runs in the worker processes. Each process keeps one FigureRenderer and reuses it for all the
+    specs it renders, see draw_spec().
+
+    Args:
+        spec (PlotSpec): The plot to render.
+
+    Returns:
+        PlotResult: The outcome of rendering the spec.
+
+    """
+    global figure_renderer
+    start = time.perf_counter()
+    try:
+        if figure_renderer is None:
+            figure_renderer = FigureRenderer()
+        draw_spec(figure_renderer, spec)
+        figure_renderer.save(spec.output)
+    except Exception as error:
+        return PlotResult(spec, time.perf_counter() - start, f"{type(error).__name__}: {error}")
+    return PlotResult(spec, time.perf_counter() - start)
+
+
+def run_batch(specs: Sequence[PlotSpec], workers: Optional[int] = None) -> Iterator[PlotResult]:
+    """
+    Render plot specs on a process pool.
+
+    Args:
+        specs (Sequence[PlotSpec]): The plots to render.
+        workers (int): The number of worker processes, the number of CPUs if None.
+
+    Yields:
+        PlotResult: The outcome of each spec, as soon as it is rendered.
+
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(render_spec, spec) for spec in specs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Render the plots of a spec file headlessly.
+
+    Prints one line per plot as it finishes, then the throughput of the batch.
+
+    Args:
+        argv (list): The command line arguments, sys.argv[1:] if None.
+
+    Returns:
+        int: The exit status, 1 if any plot failed, 0 otherwise.
+
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.batch",
+                                     description="Render function plots described in a JSON lines file to images.")
+    parser.add_argument("specs", help="JSON lines file with one plot spec per line")
+    parser.add_argument("-o", "--output-dir", default=".", help="directory the images are written to")
+    parser.add_argument("-f", "--format", default="png", choices=IMAGE_FORMATS,
+                        help="image format of specs without an output file name")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = list(read_specs(args.specs, args.output_dir, args.format))
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    failures = 0
+    for result in run_batch(specs, args.workers):
+        if result.error is None:
+            print(f"ok     {result.spec.index:>5}  {result.spec.output}  ({result.seconds * 1000:.1f} ms)", flush=True)
+        else:
+            failures += 1
+            print(f"failed {result.spec.index:>5}  {result.spec.function!r}: {result.error}", flush=True)
+    elapsed = time.perf_counter() - start
+
+    rendered = len(specs) - failures
+    rate = rendered / elapsed if elapsed > 0 else 0.0
+    print(f"Rendered {rendered} of {len(specs)} plots in {elapsed:.2f} s ({rate:.1f} plots/s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
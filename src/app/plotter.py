@@ -1,15 +1,37 @@
-from PySide6.QtCore import Qt
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
+    QApplication,
     QMainWindow,
     QLabel,
     QVBoxLayout,
-    QWidget, QLineEdit, QHBoxLayout, QPushButton, QSlider
+    QWidget, QLineEdit, QHBoxLayout, QPushButton, QSlider, QComboBox, QProgressBar, QCheckBox,
+    QMessageBox, QListWidget, QSplitter, QGridLayout, QFileDialog
 )
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
+from app.utils.analysis import Feature, analyze, describe, function_labels
+from app.utils.animation import FrameTimer
+from app.utils.cache import expression_cache
+from app.utils.datasets import Dataset, load_dataset
+from app.utils.decimation import minmax_decimate, sample_decimated
+from app.utils.evaluation import linear_grid, split_functions
+from app.utils.instrumentation import Trace, instrumentation
+from app.utils.parameters import default_value, find_parameters, slider_position, slider_value, substitute_parameters
 from app.utils.plot_option import PlotOption
-from app.utils.validation import *
+from app.utils.preview import preview_inputs, preview_key
+from app.utils.progressive import is_progressive, sample_progressive
+from app.utils.sampling_mode import SamplingMode
+from app.utils.surface_option import SurfaceOption
+from app.utils.tiles import tile_cache
+from app.utils.worker import EvaluationWorker
+from app.utils.validation import validate_range, validate_2d_function, validate_3d_function, parse_2d_function, \
+    parse_3d_function
+from app.utils.checks import check_range, check_2d_function, function_error, is_complete_function
 from app.utils.constants import *
 
 
@@ -19,36 +41,77 @@ class Plotter(QMainWindow):
         Constructs a Plotter instance.
 
         Initializes the Plotter by creating widgets, layouts, UI, and connecting signals.
+        The window is shown before matplotlib, the module that takes long to import, is loaded
+        when the canvas is created. Plotting does not import sympy, which is only loaded for
+        derivatives, so nothing is preloaded on the worker.
 
         """
         self.draw_option = None
         self.function_processor = None
+        self.plotted_function = None
+        self.pan_start = None
+        self.renderers = {}
+        self.surface_renderer = None
+        self.pending_trace = None
+        self.previewed = None
+        self.feature_markers = None
+        self.parameter_sliders = {}
+        self.animator = None
+        self.animation_grid = None
+        self.animation_time = 0.0
+        self.animation_clock = 0.0
+        self.preview_generation = None
+        self.datasets = []
+        self.dataset_generation = None
         super().__init__()
         self.create_widgets()
         self.create_layouts()
         self.create_ui()
         self.connect_signals()
         self.show()
+        QApplication.processEvents()
+        self.create_canvas()
 
     def create_widgets(self) -> None:
         """
         Create objects of the widgets needed for the src.
 
-        This method initializes the widgets used by the Plotter, including labels, input fields, buttons,
-        sliders, and the matplotlib canvas.
+        This method initializes the widgets used by the Plotter, including labels, input fields, buttons
+        and sliders. The matplotlib canvas is created later by create_canvas().
 
         """
         self.function_label = QLabel("\tEnter a f(x):")
         self.function_input = QLineEdit()
+        self.function_input.setPlaceholderText("x^2; 2*x + 1")
 
         self.xmin_label = QLabel("Range of x between:")
         self.xmin_input = QLineEdit()
         self.xmax_label = QLabel("&")
         self.xmax_input = QLineEdit()
+        self.ymin_label = QLabel("y between:")
+        self.ymin_input = QLineEdit()
+        self.ymax_label = QLabel("&")
+        self.ymax_input = QLineEdit()
 
         self.plot_button = QPushButton("Plot")
         self.zoom_in_button = QPushButton("Zoom +")
         self.zoom_out_button = QPushButton("Zoom -")
+        self.analyze_button = QPushButton("Analyze")
+        self.load_data_button = QPushButton("Load data")
+        self.play_button = QPushButton("Play")
+        self.play_button.setCheckable(True)
+        self.play_button.setEnabled(False)
+        self.animation_timer = QTimer(self)
+        self.animation_timer.setInterval(ANIMATION_INTERVAL_MS)
+        self.frame_timer = FrameTimer()
+        self.live_preview_checkbox = QCheckBox("Live preview")
+        self.live_preview_checkbox.setChecked(True)
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(PREVIEW_SETTLE_MS)
 
         self.samples_label = QLabel("Number of X samples:")
         self.samples_slider = QSlider(Qt.Orientation.Horizontal)
@@ -57,13 +120,33 @@ class Plotter(QMainWindow):
         self.samples_slider.setSingleStep(SLIDER_STEP)
         self.samples_slider.setValue(SLIDER_STARTING_VALUE)
 
+        self.sampling_label = QLabel("Sampling:")
+        self.sampling_combo = QComboBox()
+        self.sampling_combo.addItem("Uniform", SamplingMode.UNIFORM)
+        self.sampling_combo.addItem("Adaptive", SamplingMode.ADAPTIVE)
+        self.sampling_combo.addItem("High resolution", SamplingMode.HIGH_RESOLUTION)
+        self.progressive_checkbox = QCheckBox("Progressive")
+        self.progressive_checkbox.setChecked(True)
+
         self.scatter_button = QPushButton("Scatter")
         self.bar_button = QPushButton("Bar")
         self.stem_button = QPushButton("Stem")
         self.step_button = QPushButton("Step")
+        self.surface_button = QPushButton("Surface")
+        self.wireframe_button = QPushButton("Wireframe")
+        self.contour_button = QPushButton("Contour")
 
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
+        self.parameters_widget = QWidget()
+        self.parameters_widget.setVisible(False)
+
+        self.analysis_list = QListWidget()
+        self.analysis_list.setVisible(False)
+
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setMaximumWidth(BUSY_INDICATOR_WIDTH)
+        self.busy_indicator.setVisible(False)
+        self.worker = EvaluationWorker(parent=self)
 
     def create_layouts(self) -> None:
         """
@@ -85,21 +168,38 @@ class Plotter(QMainWindow):
         self.range_x_layout.addWidget(self.xmin_input)
         self.range_x_layout.addWidget(self.xmax_label)
         self.range_x_layout.addWidget(self.xmax_input)
+        self.range_x_layout.addWidget(self.ymin_label)
+        self.range_x_layout.addWidget(self.ymin_input)
+        self.range_x_layout.addWidget(self.ymax_label)
+        self.range_x_layout.addWidget(self.ymax_input)
 
         self.buttons_layout = QHBoxLayout()
         self.buttons_layout.addWidget(self.plot_button)
         self.buttons_layout.addWidget(self.zoom_in_button)
         self.buttons_layout.addWidget(self.zoom_out_button)
+        self.buttons_layout.addWidget(self.analyze_button)
+        self.buttons_layout.addWidget(self.load_data_button)
+        self.buttons_layout.addWidget(self.play_button)
+        self.buttons_layout.addWidget(self.live_preview_checkbox)
 
         self.samples_layout = QHBoxLayout()
         self.samples_layout.addWidget(self.samples_label)
         self.samples_layout.addWidget(self.samples_slider)
+        self.samples_layout.addWidget(self.sampling_label)
+        self.samples_layout.addWidget(self.sampling_combo)
+        self.samples_layout.addWidget(self.progressive_checkbox)
 
         self.plotting_options_layout = QHBoxLayout()
         self.plotting_options_layout.addWidget(self.scatter_button)
         self.plotting_options_layout.addWidget(self.bar_button)
         self.plotting_options_layout.addWidget(self.stem_button)
         self.plotting_options_layout.addWidget(self.step_button)
+        self.plotting_options_layout.addWidget(self.surface_button)
+        self.plotting_options_layout.addWidget(self.wireframe_button)
+        self.plotting_options_layout.addWidget(self.contour_button)
+
+        self.parameters_layout = QGridLayout()
+        self.parameters_widget.setLayout(self.parameters_layout)
 
     def create_ui(self) -> None:
         """
@@ -115,9 +215,10 @@ class Plotter(QMainWindow):
         self.layout.addLayout(self.buttons_layout)
         self.layout.addLayout(self.samples_layout)
         self.layout.addLayout(self.plotting_options_layout)
-        self.layout.addWidget(self.canvas)
+        self.layout.addWidget(self.parameters_widget)
         widget.setLayout(self.layout)
         self.setCentralWidget(widget)
+        self.statusBar().addPermanentWidget(self.busy_indicator)
         self.setGeometry(WINDOW_X_START, WINDOW_Y_START, WINDOW_WIDTH, WINDOW_HEIGHT)
 
     def connect_signals(self) -> None:
@@ -133,64 +234,665 @@ class Plotter(QMainWindow):
         self.bar_button.clicked.connect(lambda: self.draw(PlotOption.BAR))
         self.stem_button.clicked.connect(lambda: self.draw(PlotOption.STEM))
         self.step_button.clicked.connect(lambda: self.draw(PlotOption.STEP))
+        self.surface_button.clicked.connect(lambda: self.draw(SurfaceOption.SURFACE))
+        self.wireframe_button.clicked.connect(lambda: self.draw(SurfaceOption.WIREFRAME))
+        self.contour_button.clicked.connect(lambda: self.draw(SurfaceOption.CONTOUR))
         self.samples_slider.sliderReleased.connect(lambda: self.draw(self.draw_option))
+        self.sampling_combo.currentIndexChanged.connect(self.sampling_mode_changed)
         self.zoom_in_button.clicked.connect(self.zoom_in)
         self.zoom_out_button.clicked.connect(self.zoom_out)
+        self.analyze_button.clicked.connect(self.find_features)
+        self.load_data_button.clicked.connect(self.load_data)
+        self.play_button.toggled.connect(self.play_toggled)
+        self.animation_timer.timeout.connect(self.advance_time)
+        self.function_input.textEdited.connect(self.input_changed)
+        self.xmin_input.textEdited.connect(self.input_changed)
+        self.xmax_input.textEdited.connect(self.input_changed)
+        self.preview_timer.timeout.connect(self.preview)
+        self.settle_timer.timeout.connect(self.settle_preview)
+        self.worker.busy_changed.connect(self.busy_indicator.setVisible)
+        self.worker.failed.connect(self.evaluation_failed)
+
+    def create_canvas(self) -> None:
+        """
+        Create the matplotlib figure and canvas, and add the canvas below the other widgets.
+
+        The canvas shares a splitter with the panel listing the results of the analysis, which is shown
+        once the function has been analyzed. matplotlib is imported here rather than with this module,
+        so the rest of the window can be shown before it is loaded.
 
-    def prepare_to_draw(self) -> Tuple[List[float], List[float]]:
         """
-        Prepare necessary variables for drawing.
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
-        This method is called when the draw() method is called from the UI.
-        It extracts the values of xmin, xmax, function_string, and samples from the UI widgets,
-        performs validation checks, and returns the x_data and y_data needed for plotting.
+        self.figure = Figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.splitter.addWidget(self.canvas)
+        self.splitter.addWidget(self.analysis_list)
+        self.splitter.setStretchFactor(0, 1)
+        self.layout.addWidget(self.splitter)
+        self.canvas.mpl_connect('button_press_event', self.pan_press)
+        self.canvas.mpl_connect('motion_notify_event', self.pan_move)
+        self.canvas.mpl_connect('button_release_event', self.pan_release)
+        self.canvas.mpl_connect('scroll_event', self.wheel_zoom)
+        self.canvas.mpl_connect('draw_event', self.canvas_drawn)
+
+    def read_inputs(self, silent: bool = False) -> None | Tuple[str, Tuple[float, float], int, SamplingMode]:
+        """
+        Read and validate the inputs of the plot from the UI widgets.
+
+        It extracts the values of xmin, xmax, function_string, samples and sampling_mode from the UI widgets
+        and performs validation checks, which warn the user about invalid inputs unless silent is set.
+
+        Args:
+            silent (bool): Whether to reject invalid inputs without warning the user, used by the live preview.
+
+        The parameters of the function are replaced with the values of their sliders, so the function_string
+        returned is a plain function of x, see app.utils.parameters.
 
         Returns:
-            tuple: A tuple containing x_data and y_data for plotting.
+            tuple: The function_string, x_range, samples and sampling_mode if the inputs are valid, None otherwise.
 
         """
+        self.update_parameters()
         xmin = self.xmin_input.text()
         xmax = self.xmax_input.text()
         function_string = self.function_input.text()
         samples = self.samples_slider.value()
+        sampling_mode = self.sampling_combo.currentData()
 
-        x_range = validate_range(self, xmin, xmax)
-        validate_2d_function(self, function_string)
-        x_data, y_data = parse_2d_function(function_string, x_range, samples)
-        self.figure.clear()
-        self.ax = self.figure.add_subplot(PLOT_PLACE_FROM_CANVAS)
-        return x_data, y_data
+        if silent:
+            x_range = check_range(xmin, xmax)
+            if x_range is None or not check_2d_function(function_string):
+                return None
+        else:
+            x_range = validate_range(self, xmin, xmax)
+            if x_range is None:
+                return None
+            if not validate_2d_function(self, function_string):
+                self.show_function_error(function_string)
+                return None
+        if self.parameter_sliders:
+            function_string = substitute_parameters(function_string, self.parameter_values())
+        return function_string, x_range, samples, sampling_mode
+
+    def read_surface_inputs(self) -> None | Tuple[str, Tuple[float, float], Tuple[float, float], int, SamplingMode]:
+        """
+        Read and validate the inputs of a plot of a function of x and y from the UI widgets.
+
+        Returns:
+            tuple: The function_string, x_range, y_range, samples and sampling_mode if the inputs are valid, None otherwise.
 
-    def draw(self, draw_option: PlotOption) -> None:
+        """
+        function_string = self.function_input.text()
+        x_range = validate_range(self, self.xmin_input.text(), self.xmax_input.text())
+        if x_range is None:
+            return None
+        y_range = validate_range(self, self.ymin_input.text(), self.ymax_input.text(), "y")
+        if y_range is None or not validate_3d_function(self, function_string):
+            return None
+        return function_string, x_range, y_range, self.samples_slider.value(), self.sampling_combo.currentData()
+
+    def prepare_to_draw(self) -> None | Tuple[np.ndarray, np.ndarray]:
+        """
+        Prepare necessary variables for drawing.
+
+        This method reads and validates the inputs from the UI widgets with read_inputs(),
+        and evaluates the function on the calling thread, returning the x_data and y_data needed for plotting.
+        draw() runs the same evaluation on the worker instead, so the window stays responsive.
+
+        Returns:
+            tuple: A tuple containing x_data and y_data for plotting, or None if the inputs are invalid.
+
+        """
+        inputs = self.read_inputs()
+        if inputs is None:
+            return None
+        self.plotted_function = inputs[0], inputs[2], inputs[3]
+        return parse_2d_function(*inputs)
+
+    def draw(self, draw_option: PlotOption | SurfaceOption) -> None:
         """
         Choose the drawing option and plot on the canvas.
 
         This method takes a draw_option parameter, which represents the type of plot to be drawn.
-        It calls prepare_to_draw() to retrieve x_data and y_data for plotting and uses the matplotlib
-        functions to create the specified plot on the canvas.
+        It reads the inputs with read_inputs() and submits the evaluation of the function to the worker,
+        superseding any evaluation still in progress. The worker reduces the samples to a min/max envelope
+        about as wide as the canvas, so drawing time is bounded by the screen size and not by the number of
+        samples. When the x_data and y_data are ready, show_data() plots them on the GUI thread.
+
+        Each stage of the draw is timed in a trace, whose breakdown is shown in the status bar once the
+        canvas has been redrawn.
+
+        Large uniform grids are drawn progressively when the progressive box is checked: a coarse pass is shown
+        within milliseconds, then refinement passes update the same artists until the full grid is drawn,
+        see app.utils.progressive. Editing the inputs abandons the remaining passes.
+
+        Functions with parameters are drawn for the values of their sliders, and a draw ends the animation
+        frames of animate_frame().
+
+        A SurfaceOption plots the function as a function of x and y instead, see draw_surface().
 
         Args:
-            draw_option (PlotOption): The option for the type of plot to be drawn.
+            draw_option (PlotOption or SurfaceOption): The option for the type of plot to be drawn.
+
+        """
+        if isinstance(draw_option, SurfaceOption):
+            self.draw_surface(draw_option)
+            return
+        if self.animator is not None:
+            self.animator.stop()
+            self.animator = None
+        trace = instrumentation.begin("draw")
+        with instrumentation.activate(trace), instrumentation.stage("validate"):
+            inputs = self.read_inputs()
+        if inputs is None:
+            return
+        self.draw_option = draw_option
+        self.clear_features()
+        plotted_function = inputs[0], inputs[2], inputs[3]
+        if self.progressive_checkbox.isChecked() and is_progressive(inputs[2], inputs[3]):
+            self.worker.submit_progressive(
+                lambda data: self.show_data(draw_option, plotted_function, data[0], data[1], trace=trace if data[2] else None),
+                instrumentation.iterate, trace, sample_progressive, self.pixel_width(), *inputs)
+            return
+        self.worker.submit(lambda data: self.show_data(draw_option, plotted_function, *data, trace=trace),
+                           instrumentation.call, trace, sample_decimated, parse_2d_function, self.pixel_width(), *inputs)
+
+    def draw_surface(self, option: SurfaceOption) -> None:
+        """
+        Plot the function of x and y over the ranges of x and y as a surface, a wireframe or a contour plot.
+
+        The grid is evaluated on the worker a chunk of rows at a time, with at most SURFACE_VIEW_GRID points
+        along each axis for the interactive view; exports through app.batch evaluate the full grid.
+
+        Args:
+            option (SurfaceOption): The view of the function to be drawn.
+
+        """
+        trace = instrumentation.begin("surface")
+        with instrumentation.activate(trace), instrumentation.stage("validate"):
+            inputs = self.read_surface_inputs()
+        if inputs is None:
+            return
+        self.draw_option = option
+        title = f"f(x, y) = {inputs[0]}"
+        self.worker.submit(lambda data: self.show_surface(option, *data, title=title, trace=trace),
+                           instrumentation.call, trace, parse_3d_function, *inputs, SURFACE_VIEW_GRID)
+
+    def show_surface(self, option: SurfaceOption, x_data: np.ndarray, y_data: np.ndarray, z_data: np.ndarray,
+                     title: str = "", trace: Optional[Trace] = None) -> None:
+        """
+        Plot an evaluated grid of a function of x and y on the canvas, hiding the plots of x.
+
+        Args:
+            option (SurfaceOption): The view of the function to be drawn.
+            x_data (np.ndarray): The x values of the grid.
+            y_data (np.ndarray): The y values of the grid.
+            z_data (np.ndarray): The z values, with one row per y value.
+            title (str): The title of the plot.
+            trace (Trace): The trace of the draw, None if it is not traced.
+
+        """
+        from app.utils.renderers import SurfaceRenderer
 
+        if self.surface_renderer is None:
+            self.surface_renderer = SurfaceRenderer(self.figure)
+        if hasattr(self, 'ax'):
+            self.ax.set_visible(False)
+        with instrumentation.activate(trace), instrumentation.stage("artists"):
+            self.surface_renderer.plot(option, x_data, y_data, z_data, title=title)
+        self.redraw(trace)
+
+    def find_features(self) -> None:
+        """
+        Find the roots, extrema and intersections of the functions over the range of x, see app.utils.analysis.
+
+        The analysis runs on the worker, superseding any evaluation in progress, and its results are marked
+        on the axes and listed in the side panel by show_features().
+
+        """
+        inputs = self.read_inputs()
+        if inputs is None:
+            return
+        labels = function_labels(inputs[0])
+        trace = instrumentation.begin("analysis")
+        self.worker.submit(lambda features: self.show_features(features, labels, trace=trace),
+                           instrumentation.call, trace, analyze, inputs[0], inputs[1])
+
+    def show_features(self, features: List[Feature], labels: List[str], trace: Optional[Trace] = None) -> None:
         """
+        Mark the features found by the analysis on the axes and list them in the side panel.
+
+        Args:
+            features (list): The features found, sorted by x.
+            labels (list): The name of each function.
+            trace (Trace): The trace of the analysis, None if it is not traced.
+
+        """
+        from app.utils.renderers import FeatureMarkers
 
         if not hasattr(self, 'ax'):
             self.ax = self.figure.add_subplot(PLOT_PLACE_FROM_CANVAS)
+        if self.feature_markers is None:
+            self.feature_markers = FeatureMarkers(self.ax)
+        with instrumentation.activate(trace), instrumentation.stage("artists"):
+            self.feature_markers.update(features)
+        self.analysis_list.clear()
+        self.analysis_list.addItems([describe(feature, labels) for feature in features] or ["No roots or extrema found"])
+        self.analysis_list.setVisible(True)
+        self.redraw(trace)
+
+    def clear_features(self) -> None:
+        """Hide the markers and the side panel of the analysis, whose results no longer match the plot."""
+        if self.feature_markers is not None:
+            self.feature_markers.set_visible(False)
+        self.analysis_list.clear()
+        self.analysis_list.setVisible(False)
+
+    def load_data(self) -> None:
+        """
+        Load a dataset chosen in a file dialog and draw it over the plotted functions, see app.utils.datasets.
+
+        The file is loaded on the worker, superseding any evaluation in progress: binary and NPY files are
+        memory-mapped, CSV files parsed a chunk at a time, and the min/max pyramid of the dataset is built
+        once, so show_dataset() and the later zooms and pans only read the samples they show.
+
+        """
+        path, _ = QFileDialog.getOpenFileName(self, "Load data", "", DATASET_FILE_FILTER)
+        if not path:
+            return
+        trace = instrumentation.begin("dataset")
+        self.dataset_generation = self.worker.submit(lambda dataset: self.show_dataset(dataset, trace=trace),
+                                                     instrumentation.call, trace, load_dataset, path)
+
+    def show_dataset(self, dataset: Dataset, trace: Optional[Trace] = None) -> None:
+        """
+        Draw a loaded dataset as a line over the plotted functions and fit the view to it.
+
+        Args:
+            dataset (Dataset): The loaded dataset.
+            trace (Trace): The trace of the loading, None if it is not traced.
+
+        """
+        from app.utils.renderers import autoscale
+
+        if not hasattr(self, 'ax'):
+            self.ax = self.figure.add_subplot(PLOT_PLACE_FROM_CANVAS)
+        if self.surface_renderer is not None:
+            self.surface_renderer.set_visible(False)
+            self.ax.set_visible(True)
+        with instrumentation.activate(trace), instrumentation.stage("artists"):
+            x_data, y_data = dataset.view(dataset.x_range, self.pixel_width())
+            line, = self.ax.plot(x_data, y_data, label=dataset.name)
+            self.datasets.append((dataset, line))
+            autoscale(self.ax, x_data, y_data)
+            self.update_datasets()
+        self.redraw(trace)
+
+    def update_datasets(self) -> None:
+        """Update the lines of the loaded datasets with their samples over the visible window of x."""
+        x_range = self.ax.get_xlim() if self.datasets else None
+        for dataset, line in self.datasets:
+            line.set_data(*dataset.view(x_range, self.pixel_width()))
+
+    def dataset_extents(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Return the min/max envelope of each loaded dataset over its whole range of x, read from its pyramid."""
+        return [dataset.view(dataset.x_range, self.pixel_width()) for dataset, _ in self.datasets]
+
+    def show_function_error(self, function_string: str) -> None:
+        """
+        Show the first error of an invalid function of x in the status bar and move the cursor of the input to it.
+
+        Args:
+            function_string (str): The input function string.
+
+        """
+        error = function_error(function_string)
+        if error is None:
+            return
+        self.function_input.setCursorPosition(error.position)
+        self.statusBar().showMessage(f"Invalid function of x: {error}")
+
+    def update_parameters(self) -> None:
+        """
+        Give each free parameter of the function a slider, keeping the values of the parameters that remain.
+
+        The sliders are rebuilt only when the set of parameters changes, so this is cheap enough to run on
+        every keystroke. The play button is enabled when the function depends on the time parameter t.
+
+        """
+        names = find_parameters(self.function_input.text())
+        if names == list(self.parameter_sliders):
+            return
+        values = self.parameter_values()
+        if self.play_button.isChecked() and TIME_PARAMETER not in names:
+            self.play_button.setChecked(False)
+        for row in self.parameter_sliders.values():
+            for widget in row:
+                self.parameters_layout.removeWidget(widget)
+                widget.deleteLater()
+        self.parameter_sliders = {}
+        for row, name in enumerate(names):
+            slider = QSlider(Qt.Orientation.Horizontal)
+            slider.setRange(0, PARAMETER_STEPS)
+            slider.setValue(slider_position(values.get(name, default_value(name))))
+            value_label = QLabel(f"{slider_value(slider.value()):.2f}")
+            slider.valueChanged.connect(lambda position, name=name: self.parameter_changed(name))
+            slider.sliderReleased.connect(self.parameter_released)
+            self.parameter_sliders[name] = QLabel(f"{name} ="), slider, value_label
+            for column, widget in enumerate(self.parameter_sliders[name]):
+                self.parameters_layout.addWidget(widget, row, column)
+        self.parameters_widget.setVisible(bool(names))
+        self.play_button.setEnabled(TIME_PARAMETER in names)
+
+    def parameter_values(self) -> Dict[str, float]:
+        """Return the value of each parameter, read from its slider."""
+        return {name: slider_value(row[1].value()) for name, row in self.parameter_sliders.items()}
+
+    def parameter_changed(self, name: str) -> None:
+        """
+        Slot activated when the value of a parameter changes.
+
+        While a slider is dragged or t is played, each change is drawn as an animation frame, see animate_frame().
+        Other changes, such as from the keyboard, redraw the plot through draw().
+
+        Args:
+            name (str): The name of the parameter.
+
+        """
+        label, slider, value_label = self.parameter_sliders[name]
+        value_label.setText(f"{slider_value(slider.value()):.2f}")
+        if slider.isSliderDown() or self.play_button.isChecked():
+            self.animate_frame()
+        elif isinstance(self.draw_option, PlotOption):
+            self.draw(self.draw_option)
+
+    def parameter_released(self) -> None:
+        """Slot activated when a parameter slider is released, ends the animation with a full draw."""
+        if not self.play_button.isChecked():
+            self.stop_animation()
+
+    def play_toggled(self, playing: bool) -> None:
+        """
+        Slot activated when the play button is toggled, starts or stops animating the time parameter t.
+
+        Args:
+            playing (bool): Whether t is played.
+
+        """
+        if playing:
+            self.animation_time = self.parameter_values().get(TIME_PARAMETER, 0.0)
+            self.animation_clock = time.perf_counter()
+            self.frame_timer.reset()
+            self.animation_timer.start()
         else:
-            self.ax.clear()
-        x_data, y_data = self.prepare_to_draw()
-        if draw_option == PlotOption.PLOT:
-            self.ax.plot(x_data, y_data)
-        elif draw_option == PlotOption.SCATTER:
-            self.ax.scatter(x_data, y_data)
-        elif draw_option == PlotOption.BAR:
-            self.ax.bar(x_data, y_data)
-        elif draw_option == PlotOption.STEM:
-            self.ax.stem(x_data, y_data)
-        elif draw_option == PlotOption.STEP:
-            self.ax.step(x_data, y_data)
+            self.animation_timer.stop()
+            self.stop_animation()
+
+    def advance_time(self) -> None:
+        """Slot activated by the animation timer, advances t by the time elapsed since the last tick."""
+        now = time.perf_counter()
+        self.animation_time += (now - self.animation_clock) * ANIMATION_SPEED
+        self.animation_clock = now
+        if self.animation_time > PARAMETER_MAX:
+            self.animation_time = PARAMETER_MIN + (self.animation_time - PARAMETER_MAX) % (PARAMETER_MAX - PARAMETER_MIN)
+        if TIME_PARAMETER in self.parameter_sliders:
+            self.parameter_sliders[TIME_PARAMETER][1].setValue(slider_position(self.animation_time))
+
+    def animate_frame(self) -> None:
+        """
+        Draw the plotted functions for the current parameter values as an animation frame.
+
+        A frame does not go through draw(): the functions are compiled once with their parameters as arguments,
+        see ParametricFunction, and each frame evaluates that kernel over a cached uniform grid of at most
+        ANIMATION_MAX_SAMPLES intervals, updates the existing curves in place and blits them over the saved
+        background of the axes, see BlitAnimator. The frame time and rate are shown in the status bar.
+
+        """
+        from app.utils.animation import BlitAnimator
+
+        if not isinstance(self.draw_option, PlotOption) or self.draw_option not in self.renderers:
+            return
+        function_string = self.function_input.text()
+        x_range = check_range(self.xmin_input.text(), self.xmax_input.text())
+        if x_range is None or not check_2d_function(function_string) or not is_complete_function(function_string):
+            return
+        self.frame_timer.begin()
+        grid = x_range, preview_inputs(("", x_range, self.samples_slider.value(), self.sampling_combo.currentData()),
+                                       ANIMATION_MAX_SAMPLES)[2]
+        if self.animation_grid is None or self.animation_grid[0] != grid:
+            self.animation_grid = grid, linear_grid(*grid)
+        x_data = self.animation_grid[1]
+        y_data = expression_cache.get_parametric(function_string)(x_data, self.parameter_values())
+        curves = self.renderers[self.draw_option]
+        curves.update(*minmax_decimate(x_data, y_data, self.pixel_width()))
+        if self.animator is None or self.animator.artists != curves.artists:
+            if self.animator is not None:
+                self.animator.stop()
+            self.animator = BlitAnimator(self.ax, curves.artists)
+        self.animator.frame()
+        self.frame_timer.end()
+        self.statusBar().showMessage(self.frame_timer.summary())
+
+    def stop_animation(self) -> None:
+        """End the animation frames, drawing the plot for the final parameter values through draw()."""
+        if self.animator is not None:
+            self.draw(self.draw_option)
+
+    def pixel_width(self) -> int:
+        """Return the width of the canvas in pixels, the number of bins the samples are decimated to."""
+        return max(self.canvas.width(), 1)
+
+    def show_data(self, draw_option: PlotOption, plotted_function: Tuple[str, int, SamplingMode],
+                  x_data: np.ndarray, y_data: np.ndarray, trace: Optional[Trace] = None) -> None:
+        """
+        Plot evaluated data on the canvas.
+
+        This method updates the artists of the specified plot type in place, fits the view to the new data and
+        the loaded datasets, and schedules a redraw of the canvas. Several functions are drawn as one curve each,
+        labeled in a legend.
+
+        Args:
+            draw_option (PlotOption): The option for the type of plot to be drawn.
+            plotted_function (tuple): The function_string, samples and sampling_mode the data was evaluated with.
+            x_data (np.ndarray): The x data to plot.
+            y_data (np.ndarray): The y data to plot, or one row of y data per function.
+            trace (Trace): The trace of the draw, None if it is not traced.
+
+        """
+        from app.utils.renderers import autoscale, update_legend
+
+        if not hasattr(self, 'ax'):
+            self.ax = self.figure.add_subplot(PLOT_PLACE_FROM_CANVAS)
+        if self.surface_renderer is not None:
+            self.surface_renderer.set_visible(False)
+            self.ax.set_visible(True)
+        self.plotted_function = plotted_function
+        with instrumentation.activate(trace), instrumentation.stage("artists"):
+            self.plot_data(draw_option, x_data, y_data)
+            if draw_option in self.renderers:
+                update_legend(self.ax, self.renderers[draw_option], split_functions(plotted_function[0]))
+            autoscale(self.ax, x_data, y_data, self.dataset_extents())
+            self.update_datasets()
+        self.redraw(trace)
+
+    def redraw(self, trace: Optional[Trace] = None) -> None:
+        """
+        Schedule a redraw of the canvas, timing it as the last stage of a trace.
+
+        The canvas is redrawn when the event loop is next idle, so the canvas stage of the trace runs from
+        the request until matplotlib reports the drawing done with a draw_event, see canvas_drawn().
+
+        Args:
+            trace (Trace): The trace of the operation the redraw belongs to, None if it is not traced.
+
+        """
+        if trace is not None:
+            trace.mark("canvas")
+            self.pending_trace = trace
+        self.canvas.draw_idle()
+
+    def canvas_drawn(self, event) -> None:
+        """
+        Slot activated when the canvas has been drawn, finishes the pending trace and shows its breakdown.
+
+        Args:
+            event: The matplotlib draw event.
+
+        """
+        if self.animator is not None:
+            self.animator.capture()
+        trace = self.pending_trace
+        if trace is None:
+            return
+        self.pending_trace = None
+        trace.end("canvas")
+        instrumentation.finish(trace)
+        self.statusBar().showMessage(trace.summary())
+
+    def evaluation_failed(self, generation: int, message: str) -> None:
+        """
+        Slot activated when the worker could not evaluate the function.
+
+        Args:
+            generation (int): The generation number of the failed job.
+            message (str): The error raised by the job.
+
+        """
+        if generation == self.preview_generation:
+            self.settle_timer.stop()
+            self.statusBar().showMessage("Invalid function of x.")
+            return
+        if generation == self.dataset_generation:
+            QMessageBox.warning(self, "Invalid data", f"Could not load the data: {message}")
+            return
+        QMessageBox.warning(self, "Invalid input", "Enter a valid function of x.")
+
+    def plot_data(self, draw_option: PlotOption, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        """
+        Show the data on the axes with the renderer of the drawing option.
+
+        The axes and the artists of each plot type are kept between draws. The curves of the
+        drawing option update their artists with the new data, creating them on first use, and the
+        artists of the other plot types are hidden.
+
+        Args:
+            draw_option (PlotOption): The option for the type of plot to be drawn.
+            x_data (np.ndarray): The x data to plot.
+            y_data (np.ndarray): The y data to plot, or one row of y data per function.
+
+        """
+        from app.utils.renderers import CurveSet
+
+        for option, curves in self.renderers.items():
+            if option != draw_option:
+                curves.set_visible(False)
+        if draw_option is None:
+            return
+        if draw_option not in self.renderers:
+            self.renderers[draw_option] = CurveSet(self.ax, draw_option)
+        self.renderers[draw_option].update(x_data, y_data)
+
+    def resample_view(self) -> None:
+        """
+        Re-evaluate the plotted function over the visible window of x.
+
+        This method is called after the view limits change. It samples the visible window at the
+        current number of samples through the tile cache on the worker, so only the stretches of x that
+        were not computed before are evaluated, and updates the plotted data without changing the view limits.
+        The lines of the loaded datasets are updated at once from their pyramids, see update_datasets().
+
+        """
+        self.update_datasets()
+        if self.plotted_function is None or not isinstance(self.draw_option, PlotOption):
+            return
+        draw_option = self.draw_option
+        function_string, samples, sampling_mode = self.plotted_function
+        trace = instrumentation.begin("resample")
+        self.worker.submit(lambda data: self.show_view_data(draw_option, *data, trace=trace),
+                           instrumentation.call, trace, sample_decimated, tile_cache.sample_window,
+                           self.pixel_width(), function_string, self.ax.get_xlim(), samples, sampling_mode)
+
+    def show_view_data(self, draw_option: PlotOption, x_data: np.ndarray, y_data: np.ndarray,
+                       trace: Optional[Trace] = None) -> None:
+        """
+        Plot data resampled over the visible window without changing the view limits.
+
+        Args:
+            draw_option (PlotOption): The option for the type of plot to be drawn.
+            x_data (np.ndarray): The x data to plot.
+            y_data (np.ndarray): The y data to plot.
+            trace (Trace): The trace of the resampling, None if it is not traced.
+
+        """
+        with instrumentation.activate(trace), instrumentation.stage("artists"):
+            self.plot_data(draw_option, x_data, y_data)
+        self.redraw(trace)
+
+    def input_changed(self) -> None:
+        """
+        Slot activated when the user edits the function or the range.
+
+        Abandons the remaining passes of a progressive draw and, in live preview mode, restarts the debounce
+        timer of the preview, so a burst of keystrokes leads to a single preview once the typing pauses.
+
+        """
+        if self.worker.progressive:
+            self.worker.cancel()
+        self.settle_timer.stop()
+        self.update_parameters()
+        if self.live_preview_checkbox.isChecked():
+            self.preview_timer.start()
+
+    def preview(self) -> None:
+        """
+        Slot activated when the typing pauses in live preview mode, plots the inputs at a reduced sample count.
+
+        The inputs are validated silently and cheaply, and inputs that are invalid, look unfinished, such as
+        'x^' or '(x + 1', or plot the same thing as the last preview are skipped without evaluating anything.
+        The preview samples a uniform grid of at most PREVIEW_MAX_SAMPLES intervals, see app.utils.preview,
+        and invalid functions that look finished only show their error in the status bar. If the full plot takes more
+        samples, it is drawn by settle_preview() once the inputs have been left alone for PREVIEW_SETTLE_MS.
+        Functions of x and y are not previewed.
+
+        """
+        if isinstance(self.draw_option, SurfaceOption):
+            return
+        inputs = self.read_inputs(silent=True)
+        if inputs is None:
+            if is_complete_function(self.function_input.text()):
+                self.show_function_error(self.function_input.text())
+            return
+        if not is_complete_function(inputs[0]):
+            return
+        key = preview_key(inputs)
+        if key == self.previewed:
+            return
+        self.previewed = key
+        self.clear_features()
+        draw_option = self.draw_option or PlotOption.PLOT
         self.draw_option = draw_option
-        self.canvas.draw()
+        reduced = preview_inputs(inputs)
+        plotted_function = reduced[0], reduced[2], reduced[3]
+        trace = instrumentation.begin("preview")
+        self.preview_generation = self.worker.submit(
+            lambda data: self.show_data(draw_option, plotted_function, *data, trace=trace),
+            instrumentation.call, trace, sample_decimated, parse_2d_function, self.pixel_width(), *reduced)
+        if reduced != inputs:
+            self.settle_timer.start()
+
+    def settle_preview(self) -> None:
+        """Slot activated when the inputs of a preview have settled, draws them at full resolution."""
+        inputs = self.read_inputs(silent=True)
+        if inputs is not None and preview_key(inputs) == self.previewed:
+            self.draw(self.draw_option)
+
+    def sampling_mode_changed(self) -> None:
+        """Slot activated when the sampling mode is changed, redraws the current plot if there is one."""
+        if self.draw_option is not None:
+            self.draw(self.draw_option)
 
     def zoom(self, percent: float) -> None:
         if not hasattr(self, 'ax'):
@@ -199,7 +901,8 @@ class Plotter(QMainWindow):
         General zoom function for zooming in and out.
 
         This method takes a percentage value and adjusts the x and y limits of the plot accordingly,
-        resulting in zooming in or out effect. It then redraws the canvas.
+        resulting in zooming in or out effect. It then resamples the function over the new view
+        and schedules a redraw of the canvas for when the event loop is next idle.
 
         Args:
             percent (float): The zoom factor, represented as a percentage.
@@ -209,7 +912,78 @@ class Plotter(QMainWindow):
         ylim = self.ax.get_ylim()
         self.ax.set_xlim(xlim[0] * percent, xlim[1] * percent)
         self.ax.set_ylim(ylim[0] * percent, ylim[1] * percent)
-        self.canvas.draw()
+        self.resample_view()
+        self.canvas.draw_idle()
+
+    def wheel_zoom(self, event) -> None:
+        """
+        Slot activated when the mouse wheel is scrolled over the canvas.
+
+        Zooms in when scrolling up and out when scrolling down, keeping the point under the
+        cursor in place, then resamples the function over the new view.
+
+        Args:
+            event: The matplotlib scroll event.
+
+        """
+        if event.inaxes is not self.ax:
+            return
+        percent = ZOOM_IN if event.button == 'up' else ZOOM_OUT
+        xlim = self.ax.get_xlim()
+        ylim = self.ax.get_ylim()
+        self.ax.set_xlim(event.xdata + (xlim[0] - event.xdata) * percent, event.xdata + (xlim[1] - event.xdata) * percent)
+        self.ax.set_ylim(event.ydata + (ylim[0] - event.ydata) * percent, event.ydata + (ylim[1] - event.ydata) * percent)
+        self.resample_view()
+        self.canvas.draw_idle()
+
+    def pan_press(self, event) -> None:
+        """
+        Slot activated when a mouse button is pressed on the canvas, starts panning with the left button.
+
+        Args:
+            event: The matplotlib mouse event.
+
+        """
+        if event.inaxes is not self.ax or event.button != 1:
+            return
+        self.pan_start = event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim()
+
+    def pan_move(self, event) -> None:
+        """
+        Slot activated when the mouse moves over the canvas, drags the view while panning.
+
+        The view is shifted by the distance the mouse moved since the button was pressed, and the
+        function is resampled over the new view, reusing the cached tiles that are still visible.
+
+        Args:
+            event: The matplotlib mouse event.
+
+        """
+        if self.pan_start is None:
+            return
+        x_start, y_start, xlim, ylim = self.pan_start
+        bbox = self.ax.bbox
+        dx = (event.x - x_start) * (xlim[1] - xlim[0]) / bbox.width
+        dy = (event.y - y_start) * (ylim[1] - ylim[0]) / bbox.height
+        self.ax.set_xlim(xlim[0] - dx, xlim[1] - dx)
+        self.ax.set_ylim(ylim[0] - dy, ylim[1] - dy)
+        self.resample_view()
+        self.canvas.draw_idle()
+
+    def pan_release(self, event) -> None:
+        """
+        Slot activated when a mouse button is released on the canvas, stops panning.
+
+        Args:
+            event: The matplotlib mouse event.
+
+        """
+        self.pan_start = None
+
+    def closeEvent(self, event) -> None:
+        """Stop the worker when the window is closed."""
+        self.worker.shutdown()
+        super().closeEvent(event)
 
     def zoom_in(self) -> None:
         """Slot activated when the zoom in button is pressed."""
@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from app.batch import IMAGE_FORMATS, PlotSpec, draw_spec, read_spec, sample_spec
+from app.utils.cache import LRUCache
+from app.utils.checks import check_2d_function, check_3d_function
+from app.utils.constants import MAX_SLIDER_VALUE, MIN_SLIDER_VALUE, SERVER_CACHE_MAX_OUTPUT_BYTES, SERVER_CACHE_SIZE, \
+    SERVER_HOST, SERVER_MAX_BODY_BYTES, SERVER_METRICS_WINDOW, SERVER_PORT
+from app.utils.expression_parser import ExpressionError
+from app.utils.renderers import FigureRenderer
+from app.utils.surface_option import SurfaceOption
+
+DATA_FORMATS = ("json", "bin")
+OUTPUT_FORMATS = IMAGE_FORMATS + DATA_FORMATS
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+    "bin": "application/octet-stream",
+}
+INVALID_FORMAT = "invalid"
+PERCENTILES = (50, 90, 99)
+
+
+class PlotRequest(NamedTuple):
+    """
+    One request for a plot or for its samples.
+
+    Requests are hashable, and equal requests have the same output, so they are the keys of the cache
+    of rendered outputs.
+
+    Attributes:
+        spec (PlotSpec): The plot to evaluate, with its parameters replaced by their values.
+        output_format (str): One of OUTPUT_FORMATS.
+
+    """
+    spec: PlotSpec
+    output_format: str
+
+
+def read_request(fields: Dict[str, Any]) -> PlotRequest:
+    """
+    Build a plot request from the fields of a query string or a JSON body.
+
+    The fields are those of a batch spec, see app.batch.read_specs(), plus "format", one of OUTPUT_FORMATS
+    and 'png' by default, and the values of the parameters of the function, such as "a": 2. Parameters
+    without a value take their default value, as in the window, see app.batch.read_spec().
+
+    Args:
+        fields (dict): The fields of the request.
+
+    Returns:
+        PlotRequest: The request.
+
+    Raises:
+        ValueError: If a field is missing or invalid, or the function is not valid.
+
+    """
+    output_format = str(fields.get("format", "png")).lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"unknown format {output_format!r}, expected one of {', '.join(OUTPUT_FORMATS)}")
+    try:
+        spec = read_spec(fields, 0, "")
+    except KeyError as error:
+        raise ValueError(f"missing or unknown value {error}") from error
+    except TypeError as error:
+        raise ValueError(f"invalid value: {error}") from error
+    surface = isinstance(spec.draw_option, SurfaceOption)
+    if not (check_3d_function(spec.function) if surface else check_2d_function(spec.function)):
+        raise ValueError(f"invalid function of {'x and y' if surface else 'x'}: {spec.function!r}")
+    if not MIN_SLIDER_VALUE <= spec.samples <= MAX_SLIDER_VALUE:
+        raise ValueError(f"samples must be between {MIN_SLIDER_VALUE} and {MAX_SLIDER_VALUE}")
+    return PlotRequest(spec, output_format)
+
+
+figure_renderer: Optional[FigureRenderer] = None
+
+
+def render_request(request: PlotRequest) -> bytes:
+    """
+    Render a plot request to the bytes of its output.
+
+    Runs in the worker processes. Each process keeps one FigureRenderer on an Agg canvas and reuses its
+    figure for all the images it renders, see app.batch.render_spec(). Sample data is not decimated: JSON
+    outputs hold the lists "x" and "y", with one list of y values per function, plus "z" for functions of
+    x and y, and binary outputs hold the same arrays in an uncompressed NumPy .npz archive.
+
+    Args:
+        request (PlotRequest): The request to render.
+
+    Returns:
+        bytes: The output.
+
+    """
+    global figure_renderer
+    output = io.BytesIO()
+    if request.output_format in IMAGE_FORMATS:
+        if figure_renderer is None:
+            figure_renderer = FigureRenderer()
+        draw_spec(figure_renderer, request.spec)
+        figure_renderer.save(output, request.output_format)
+        return output.getvalue()
+    arrays = dict(zip("xyz", sample_spec(request.spec)))
+    if request.output_format == "json":
+        return json.dumps({name: np.where(np.isfinite(data), data, None).tolist() for name, data in arrays.items()},
+                          allow_nan=False).encode()
+    np.savez(output, **arrays)
+    return output.getvalue()
+
+
+class ServerMetrics:
+    """
+    The latencies and outcomes of the requests of a plot server.
+
+    Latencies are kept for the last requests of each output format only, so the percentiles follow
+    the recent load and memory stays bounded. Requests for an unknown format are all recorded under
+    INVALID_FORMAT, so clients cannot add keys.
+
+    Attributes:
+        window (int): The number of latencies kept for each output format.
+        latencies (dict): The seconds taken by the last requests of each output format.
+        requests (int): The number of plot requests answered.
+        errors (int): The number of plot requests that failed.
+        started (float): The wall clock time the server started at.
+
+    """
+
+    def __init__(self, window: int = SERVER_METRICS_WINDOW) -> None:
+        self.window = window
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.requests = 0
+        self.errors = 0
+        self.started = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, output_format: str, seconds: float, error: bool = False) -> None:
+        """
+        Record a plot request.
+
+        Args:
+            output_format (str): The output format of the request.
+            seconds (float): The time taken to answer it.
+            error (bool): Whether it failed.
+
+        """
+        with self.lock:
+            self.requests += 1
+            self.errors += error
+            self.latencies.setdefault(output_format, deque(maxlen=self.window)).append(seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Return the metrics as a JSON serializable dict, with the latency percentiles in milliseconds.
+
+        Returns:
+            dict: The uptime, the request and error counts, and the count and the 50th, 90th and 99th
+                percentile latencies of each output format and of all of them.
+
+        """
+        with self.lock:
+            latencies = {output_format: list(seconds) for output_format, seconds in self.latencies.items()}
+            requests, errors = self.requests, self.errors
+        latencies["all"] = [seconds for values in latencies.values() for seconds in values]
+        return {
+            "uptime_s": time.time() - self.started,
+            "requests": requests,
+            "errors": errors,
+            "latency_ms": {output_format: latency_percentiles(seconds) for output_format, seconds in latencies.items()},
+        }
+
+
+def latency_percentiles(seconds: List[float]) -> Dict[str, float]:
+    """
+    Summarize latencies with their count and percentiles.
+
+    Args:
+        seconds (list): The latencies in seconds.
+
+    Returns:
+        dict: The count, then the percentiles of PERCENTILES in milliseconds, such as 'p50', or only the count
+            when there are no latencies.
+
+    """
+    summary: Dict[str, float] = {"count": len(seconds)}
+    if seconds:
+        values = np.percentile(np.array(seconds) * 1000, PERCENTILES)
+        summary.update({f"p{percentile}": float(value) for percentile, value in zip(PERCENTILES, values)})
+    return summary
+
+
+class PlotServer(ThreadingHTTPServer):
+    """
+    An HTTP server rendering function plots to images or sample data.
+
+    Each connection is handled on its own thread, and the evaluation and rendering run on a pool of worker
+    processes, see render_request(). Outputs are kept in an LRU cache keyed by the request, so identical
+    requests are answered without rendering. The cache holds the futures of the outputs, so identical
+    requests arriving while the first one renders wait for it instead of rendering again. Failed requests
+    and outputs larger than SERVER_CACHE_MAX_OUTPUT_BYTES are not kept.
+
+    Attributes:
+        executor (ProcessPoolExecutor): The pool of rendering workers.
+        cache (LRUCache): The futures of the outputs of the last requests.
+        metrics (ServerMetrics): The latencies and outcomes of the requests.
+        max_output_bytes (int): The size of the largest output kept in the cache.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], workers: Optional[int] = None, cache_size: int = SERVER_CACHE_SIZE,
+                 max_output_bytes: int = SERVER_CACHE_MAX_OUTPUT_BYTES, verbose: bool = False) -> None:
+        super().__init__(address, PlotRequestHandler)
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.cache = LRUCache(cache_size)
+        self.metrics = ServerMetrics()
+        self.max_output_bytes = max_output_bytes
+        self.verbose = verbose
+
+    def render(self, request: PlotRequest) -> Tuple[bytes, bool]:
+        """
+        Return the output of a request, from the cache or from the workers.
+
+        Args:
+            request (PlotRequest): The request.
+
+        Returns:
+            tuple: The output, and whether it was found in the cache.
+
+        Raises:
+            Exception: Any error raised while evaluating or rendering the request.
+
+        """
+        with self.cache.lock:
+            future: Optional[Future] = self.cache.get(request)
+            hit = future is not None
+            if future is None:
+                future = self.executor.submit(render_request, request)
+                self.cache.put(request, future)
+        try:
+            output = future.result()
+        except Exception:
+            self.discard(request, future)
+            raise
+        if len(output) > self.max_output_bytes:
+            self.discard(request, future)
+        return output, hit
+
+    def discard(self, request: PlotRequest, future: Future) -> None:
+        """Drop the output of a request from the cache, unless a newer future replaced it."""
+        with self.cache.lock:
+            if self.cache.entries.get(request) is future:
+                del self.cache.entries[request]
+
+    def report(self) -> Dict[str, Any]:
+        """Return the metrics of the server and the statistics of its cache, with the hit rate."""
+        cache = self.cache.stats()
+        lookups = cache["hits"] + cache["misses"]
+        cache["hit_rate"] = cache["hits"] / lookups if lookups else 0.0
+        return dict(self.metrics.as_dict(), cache=cache)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown()
+
+
+class PlotRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests of a PlotServer.
+
+    GET /plot takes the fields of the request in its query string, such as
+    /plot?function=sin(x)&xmin=0&xmax=10&format=svg, and POST /plot takes them as a JSON object.
+    GET /metrics returns the metrics of the server as JSON. Invalid requests are answered with
+    status 400 and a JSON object holding the error, and failures while evaluating or rendering a
+    valid request with status 500.
+    """
+
+    server: PlotServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/plot":
+            self.plot({name: values[-1] for name, values in parse_qs(url.query).items()})
+        elif url.path == "/metrics":
+            self.send(200, CONTENT_TYPES["json"], json.dumps(self.server.report()).encode())
+        else:
+            self.send_json_error(404, f"no such endpoint {url.path!r}")
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path != "/plot":
+            self.send_json_error(404, f"no such endpoint {self.path!r}")
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > SERVER_MAX_BODY_BYTES:
+            self.send_json_error(413, "request body too large")
+            return
+        try:
+            fields = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as error:
+            self.send_json_error(400, f"invalid JSON body: {error}")
+            return
+        if not isinstance(fields, dict):
+            self.send_json_error(400, "the JSON body must be an object")
+            return
+        self.plot(fields)
+
+    def plot(self, fields: Dict[str, Any]) -> None:
+        """
+        Answer a plot request with its output, recording its latency.
+
+        Args:
+            fields (dict): The fields of the request.
+
+        """
+        start = time.perf_counter()
+        output_format = str(fields.get("format", "png")).lower()
+        if output_format not in OUTPUT_FORMATS:
+            output_format = INVALID_FORMAT
+        request = None
+        try:
+            request = read_request(fields)
+            output, hit = self.server.render(request)
+        except Exception as error:
+            invalid = isinstance(error, ExpressionError) or (request is None and isinstance(error, ValueError))
+            self.send_json_error(400 if invalid else 500, f"{type(error).__name__}: {error}")
+            self.server.metrics.record(output_format, time.perf_counter() - start, error=True)
+            return
+        self.send(200, CONTENT_TYPES[output_format], output, {"X-Cache": "hit" if hit else "miss"})
+        self.server.metrics.record(output_format, time.perf_counter() - start)
+
+    def send(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        """Send a complete response."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json_error(self, status: int, message: str) -> None:
+        """Send an error response holding the message as JSON."""
+        self.send(status, CONTENT_TYPES["json"], json.dumps({"error": message}).encode())
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Serve function plots over HTTP until interrupted.
+
+    Args:
+        argv (list): The command line arguments, sys.argv[1:] if None.
+
+    Returns:
+        int: The exit status.
+
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.server",
+                                     description="Serve function plots as images or sample data over HTTP.")
+    parser.add_argument("--host", default=SERVER_HOST, help="address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=SERVER_PORT, help="port to listen on")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of rendering processes")
+    parser.add_argument("--cache-size", type=int, default=SERVER_CACHE_SIZE, help="number of outputs kept in the cache")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = PlotServer((args.host, args.port), args.workers, args.cache_size, verbose=args.verbose)
+    print(f"Serving plots on http://{server.server_address[0]}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
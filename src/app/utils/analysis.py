@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Callable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.cache import expression_cache
+from app.utils.constants import ANALYSIS_MAX_ITERATIONS, ANALYSIS_SAMPLES, ANALYSIS_TOLERANCE
+from app.utils.evaluation import linear_grid, split_functions
+from app.utils.instrumentation import instrumentation
+
+Function = Callable[[np.ndarray], np.ndarray]
+
+ROOT = "root"
+MINIMUM = "minimum"
+MAXIMUM = "maximum"
+INTERSECTION = "intersection"
+FEATURE_KINDS = (ROOT, MINIMUM, MAXIMUM, INTERSECTION)
+
+
+class Feature(NamedTuple):
+    """
+    A point of interest of the plotted functions.
+
+    Attributes:
+        kind (str): One of ROOT, MINIMUM, MAXIMUM and INTERSECTION.
+        x (float): The x value of the point.
+        y (float): The y value of the point.
+        curves (tuple): The indices of the functions the point belongs to, two for an intersection.
+
+    """
+    kind: str
+    x: float
+    y: float
+    curves: Tuple[int, ...]
+
+
+def bracket_sign_changes(x_data: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find where sampled values cross zero, with one vectorized scan.
+
+    Intervals whose ends have opposite signs bracket a crossing. Samples that are exactly zero
+    between samples of opposite signs are crossings themselves. Non-finite values never bracket.
+
+    Args:
+        x_data (np.ndarray): The x values, sorted.
+        values (np.ndarray): The values sampled at x_data.
+
+    Returns:
+        tuple: The left and right ends of the brackets, the x values of the exact crossings, and the
+            direction of each bracket then of each exact crossing, 1 where the values rise through zero
+            and -1 where they fall.
+
+    """
+    with np.errstate(invalid="ignore"):
+        signs = np.sign(values)
+    brackets = np.flatnonzero(signs[:-1] * signs[1:] < 0)
+    exact = np.flatnonzero((signs[1:-1] == 0) & (signs[:-2] * signs[2:] < 0)) + 1
+    directions = np.concatenate((signs[brackets + 1], signs[exact + 1]))
+    return x_data[brackets], x_data[brackets + 1], x_data[exact], directions
+
+
+def refine_roots(function: Function, derivative: Function, left: np.ndarray, right: np.ndarray,
+                 tolerance: float = ANALYSIS_TOLERANCE, max_iterations: int = ANALYSIS_MAX_ITERATIONS) -> np.ndarray:
+    """
+    Refine bracketed roots of a function with safeguarded Newton steps, all brackets at once.
+
+    Each iteration evaluates the function and its derivative at every estimate in one vectorized call,
+    shrinks each bracket to the half holding the sign change, and takes the Newton step where it stays
+    inside the bracket, bisecting otherwise. The estimates converge quadratically near simple roots and
+    can never leave their bracket, even where the derivative vanishes.
+
+    Args:
+        function (Callable): The vectorized function.
+        derivative (Callable): The vectorized derivative of the function.
+        left (np.ndarray): The left ends of the brackets.
+        right (np.ndarray): The right ends of the brackets, where the function has the opposite sign.
+        tolerance (float): The relative change of the estimates at which the iterations stop.
+        max_iterations (int): The maximum number of iterations.
+
+    Returns:
+        np.ndarray: The estimate of the root in each bracket.
+
+    """
+    left = np.array(left, dtype=np.float64)
+    right = np.array(right, dtype=np.float64)
+    if left.size == 0:
+        return left
+    left_signs = np.sign(function(left))
+    x = (left + right) / 2
+    for _ in range(max_iterations):
+        with np.errstate(all="ignore"):
+            values = function(x)
+            step = x - values / derivative(x)
+        signs = np.sign(values)
+        exact = signs == 0
+        keep_left = signs == left_signs
+        left = np.where(exact | keep_left, x, left)
+        right = np.where(exact | ~keep_left, x, right)
+        inside = np.isfinite(step) & (step > left) & (step < right)
+        estimates = np.where(exact, x, np.where(inside, step, (left + right) / 2))
+        converged = np.abs(estimates - x) <= tolerance * np.maximum(np.abs(x), 1)
+        x = estimates
+        if converged.all():
+            break
+    return x
+
+
+def find_crossings(function: Function, derivative: Function, x_data: np.ndarray,
+                   values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the points where a function crosses zero, scanning its samples and refining the brackets.
+
+    Brackets around poles, such as x = 0 for 1/x, also hold a sign change. They are told apart after
+    refinement: the function shrinks towards a root but grows towards a pole, so a crossing is kept only
+    if the function is no larger there than at the ends of its bracket.
+
+    Args:
+        function (Callable): The vectorized function.
+        derivative (Callable): The vectorized derivative of the function.
+        x_data (np.ndarray): The x values the function was sampled at, sorted.
+        values (np.ndarray): The values of the function at x_data.
+
+    Returns:
+        tuple: The x values of the crossings, sorted, and the direction of each crossing, 1 where the
+            function rises through zero and -1 where it falls.
+
+    """
+    left, right, exact, directions = bracket_sign_changes(x_data, values)
+    roots = refine_roots(function, derivative, left, right)
+    with np.errstate(all="ignore"):
+        residuals = np.abs(function(roots))
+        bounds = np.minimum(np.abs(function(left)), np.abs(function(right)))
+    valid = np.concatenate((np.isfinite(residuals) & (residuals <= bounds), np.ones(exact.size, dtype=bool)))
+    crossings = np.concatenate((roots, exact))[valid]
+    directions = directions[valid]
+    order = np.argsort(crossings, kind="stable")
+    return crossings[order], directions[order]
+
+
+def analyze(function_string: str, x_range: Tuple[float, float], x_samples: int = ANALYSIS_SAMPLES) -> List[Feature]:
+    """
+    Find the roots, the local minima and maxima, and the intersections of the functions over a range of x.
+
+    The functions are sampled on a uniform grid. Roots are found from the sign changes of each function,
+    local extrema from the sign changes of its derivative, and intersections from the sign changes of the
+    difference of each pair of functions, each refined with Newton steps on compiled derivatives, see
+    refine_roots(). Nothing is solved symbolically, so the analysis takes a few milliseconds. Features
+    narrower than the grid spacing, such as a root and an extremum closer than it, can be missed, and a
+    root where a function touches zero without crossing it, such as x^2 at 0, is found as an extremum.
+
+    Args:
+        function_string (str): The input function string, holding one function or several.
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        x_samples (int): The number of intervals of the grid that is scanned.
+
+    Returns:
+        list: The features found, sorted by x.
+
+    """
+    with instrumentation.stage("analyze"):
+        parts = split_functions(function_string)
+        functions = [expression_cache.get_function(part) for part in parts]
+        derivatives = [expression_cache.get_derivative(part) for part in parts]
+        x_data = linear_grid(x_range, x_samples)
+        y_rows = [function(x_data) for function in functions]
+        features: List[Feature] = []
+
+        for index, (function, derivative, y_data) in enumerate(zip(functions, derivatives, y_rows)):
+            roots, _ = find_crossings(function, derivative, x_data, y_data)
+            features += [Feature(ROOT, x, 0.0, (index,)) for x in roots.tolist()]
+
+            second_derivative = expression_cache.get_derivative(parts[index], 2)
+            extrema, directions = find_crossings(derivative, second_derivative, x_data, derivative(x_data))
+            y_extrema = function(extrema)
+            features += [Feature(MINIMUM if direction > 0 else MAXIMUM, x, y, (index,))
+                         for x, y, direction in zip(extrema.tolist(), y_extrema.tolist(), directions.tolist())]
+
+        for first, second in combinations(range(len(functions)), 2):
+            def difference(x: np.ndarray, first: int = first, second: int = second) -> np.ndarray:
+                return functions[first](x) - functions[second](x)
+
+            def difference_derivative(x: np.ndarray, first: int = first, second: int = second) -> np.ndarray:
+                return derivatives[first](x) - derivatives[second](x)
+
+            intersections, _ = find_crossings(difference, difference_derivative, x_data, y_rows[first] - y_rows[second])
+            y_intersections = functions[first](intersections)
+            features += [Feature(INTERSECTION, x, y, (first, second))
+                         for x, y in zip(intersections.tolist(), y_intersections.tolist())]
+
+    instrumentation.count("features", len(features))
+    return sorted(features, key=lambda feature: feature.x)
+
+
+def describe(feature: Feature, labels: Sequence[str]) -> str:
+    """
+    Describe a feature in one line, such as 'root of f at x = 1.41421'.
+
+    Args:
+        feature (Feature): The feature to describe.
+        labels (Sequence[str]): The name of each function.
+
+    Returns:
+        str: The description of the feature.
+
+    """
+    names = " and ".join(labels[curve] for curve in feature.curves)
+    if feature.kind == ROOT:
+        return f"{feature.kind} of {names} at x = {feature.x:.6g}"
+    return f"{feature.kind} of {names} at x = {feature.x:.6g}, y = {feature.y:.6g}"
+
+
+def function_labels(function_string: str) -> List[str]:
+    """
+    Name the functions of an input, 'f' for a single function and 'f1', 'f2', ... for several.
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        list: The name of each function.
+
+    """
+    count = len(split_functions(function_string))
+    return ["f"] if count == 1 else [f"f{index}" for index in range(1, count + 1)]
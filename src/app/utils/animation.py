@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Optional, Sequence
+
+from app.utils.constants import FRAME_TIMER_WINDOW
+
+if TYPE_CHECKING:
+    from matplotlib.artist import Artist
+    from matplotlib.axes import Axes
+
+
+class BlitAnimator:
+    """
+    Redraws a few artists of an axes with blitting, for animation frames.
+
+    While the animator runs, its artists are marked as animated, so full draws of the canvas leave
+    them out, and the rendered axes without them is kept as the background. A frame restores the
+    background, draws only the artists over it and blits the axes to the screen, instead of drawing
+    the whole figure again.
+
+    Attributes:
+        ax (Axes): The axes the artists are drawn on.
+        artists (list): The animated artists.
+        background: The saved rendering of the axes without the artists, None until captured.
+
+    """
+
+    def __init__(self, ax: Axes, artists: Sequence[Artist]) -> None:
+        self.ax = ax
+        self.artists = list(artists)
+        self.background = None
+
+    @property
+    def canvas(self):
+        """The canvas of the figure of the axes."""
+        return self.ax.figure.canvas
+
+    def start(self) -> None:
+        """Mark the artists as animated and draw the canvas once, capturing the background."""
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.canvas.draw()
+        self.capture()
+
+    def capture(self) -> None:
+        """Save the rendering of the axes as the background, called after every full draw of the canvas."""
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def frame(self) -> None:
+        """Draw the artists over the background and blit the axes."""
+        if self.background is None:
+            self.start()
+        self.canvas.restore_region(self.background)
+        for artist in self.artists:
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
+    def stop(self) -> None:
+        """Return the artists to normal drawing."""
+        for artist in self.artists:
+            artist.set_animated(False)
+        self.background = None
+
+
+class FrameTimer:
+    """
+    Measures the time spent on the last frames of an animation and the rate they are shown at.
+
+    Attributes:
+        window (int): The number of frames the averages are taken over.
+        durations (deque): The seconds spent on each of the last frames.
+        starts (deque): The clock time each of the last frames started at.
+
+    """
+
+    def __init__(self, window: int = FRAME_TIMER_WINDOW) -> None:
+        self.window = window
+        self.durations: Deque[float] = deque(maxlen=window)
+        self.starts: Deque[float] = deque(maxlen=window)
+        self.started: Optional[float] = None
+
+    def begin(self) -> None:
+        """Mark the start of a frame."""
+        self.started = time.perf_counter()
+        self.starts.append(self.started)
+
+    def end(self) -> None:
+        """Mark the end of the frame started with begin()."""
+        if self.started is not None:
+            self.durations.append(time.perf_counter() - self.started)
+            self.started = None
+
+    def frame_time(self) -> float:
+        """Return the average seconds spent on a frame."""
+        return sum(self.durations) / len(self.durations) if self.durations else 0.0
+
+    def frame_rate(self) -> float:
+        """Return the average number of frames started per second, 0 before two frames."""
+        if len(self.starts) < 2 or self.starts[-1] == self.starts[0]:
+            return 0.0
+        return (len(self.starts) - 1) / (self.starts[-1] - self.starts[0])
+
+    def summary(self) -> str:
+        """Describe the frame time and rate in one line, such as 'frame 2.1 ms | 60 fps'."""
+        return f"frame {self.frame_time() * 1000:.1f} ms | {self.frame_rate():.0f} fps"
+
+    def reset(self) -> None:
+        """Forget the frames measured so far."""
+        self.durations.clear()
+        self.starts.clear()
+        self.started = None
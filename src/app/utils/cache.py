@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Union
+
+from app.utils.constants import EXPRESSION_CACHE_SIZE
+from app.utils.evaluation import CompiledFunction, CompiledSurface, FunctionGroup, compile_function, compile_surface, \
+    differentiate, split_functions
+from app.utils.expression_parser import ExpressionError, tokenize
+from app.utils.instrumentation import instrumentation
+from app.utils.parameters import ParametricFunction, compile_parametric
+
+
+OPERAND_KINDS = ("number", "name")
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entry when full.
+
+    Every lookup is counted as a hit or a miss and every entry dropped to make room is counted
+    as an eviction, so the effectiveness of the cache can be inspected at runtime. The cache can be
+    shared between the GUI thread and the evaluation workers.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept in the cache.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that did not find an entry.
+        evictions (int): The number of entries dropped because the cache was full.
+
+    """
+
+    def __init__(self, max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up an entry and mark it as the most recently used.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            The cached value, or None if the key is not in the cache.
+
+        """
+        with self.lock:
+            try:
+                value = self.entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used ones if the cache is full.
+
+        Args:
+            key (Hashable): The key of the entry.
+            value: The value to store.
+
+        """
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report the size of the cache and its counters.
+
+        Returns:
+            dict: The size, max_size, hits, misses and evictions of the cache.
+
+        """
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def normalize_function_string(function_string: str) -> str:
+    """
+    Canonicalize a function string so equivalent spellings share a cache entry.
+
+    Whitespace between tokens is stripped and '^' is replaced with '**'. Whitespace between two numbers or
+    names, as in '1 2*x', is kept as a single space, so the normalized string is still invalid rather than
+    another function such as '12*x'. Parts that cannot be tokenized only have their whitespace runs
+    collapsed, and fail when compiled. An input holding several functions, one per line or separated by
+    ';', is normalized to the normalized functions joined by ';'.
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        str: The normalized function string.
+
+    """
+    return ";".join(normalize_part(part) for part in split_functions(function_string))
+
+
+def normalize_part(part: str) -> str:
+    """Normalize one function of a function string, see normalize_function_string()."""
+    try:
+        tokens = tokenize(part)[:-1]
+    except ExpressionError:
+        return re.sub(r"\s+", " ", part.strip())
+    pieces = []
+    for previous, token in zip([None] + tokens, tokens):
+        if previous is not None and previous.kind in OPERAND_KINDS and token.kind in OPERAND_KINDS:
+            pieces.append(" ")
+        pieces.append("**" if token.kind == "^" else token.text)
+    return "".join(pieces)
+
+
+class ExpressionCache(LRUCache):
+    """
+    An LRU cache of parsed and compiled functions keyed by their normalized function string.
+
+    Redrawing the same function, for example after changing the plot type or the number of
+    samples, reuses the compiled function instead of parsing the string again. An input holding
+    several functions is compiled into a FunctionGroup built from the cached function of each part,
+    so adding a function to an overlay only parses the new function. Derivatives, functions with
+    free parameters and functions of x and y are cached under their own keys, see get_derivative(),
+    get_parametric() and get_surface().
+
+    """
+
+    def get_function(self, function_string: str) -> Union[CompiledFunction, FunctionGroup]:
+        """
+        Return the compiled function for a function string, compiling it on a cache miss.
+
+        Args:
+            function_string (str): The input function string, holding one function or several
+                functions one per line or separated by ';'.
+
+        Returns:
+            CompiledFunction: The compiled function of x, or a FunctionGroup of several functions.
+
+        Raises:
+            ValueError: If the function string holds no function.
+
+        """
+        key = normalize_function_string(function_string)
+        function = self.get(key)
+        if function is None:
+            parts = key.split(";") if key else []
+            if not parts:
+                raise ValueError("The function string holds no function.")
+            if len(parts) == 1:
+                with instrumentation.stage("parse"):
+                    function = compile_function(key)
+            else:
+                functions = [self.get_function(part) for part in parts]
+                with instrumentation.stage("parse"):
+                    function = FunctionGroup(functions)
+            self.put(key, function)
+        return function
+
+    def get_derivative(self, function_string: str, order: int = 1) -> CompiledFunction:
+        """
+        Return the compiled derivative of a function of x, differentiating it on a cache miss.
+
+        Args:
+            function_string (str): The input function string, holding one function.
+            order (int): The order of the derivative.
+
+        Returns:
+            CompiledFunction: The compiled derivative of the function.
+
+        """
+        key = ("derivative", normalize_function_string(function_string), order)
+        derivative = self.get(key)
+        if derivative is None:
+            function = self.get_function(function_string)
+            with instrumentation.stage("parse"):
+                derivative = differentiate(function, order)
+            self.put(key, derivative)
+        return derivative
+
+    def get_parametric(self, function_string: str) -> ParametricFunction:
+        """
+        Return the compiled functions of x and of free parameters for a function string, compiling them on a cache miss.
+
+        Args:
+            function_string (str): The input function string, holding one function or several.
+
+        Returns:
+            ParametricFunction: The compiled functions.
+
+        """
+        key = ("parametric", normalize_function_string(function_string))
+        function = self.get(key)
+        if function is None:
+            with instrumentation.stage("parse"):
+                function = compile_parametric(key[1])
+            self.put(key, function)
+        return function
+
+    def get_surface(self, function_string: str) -> CompiledSurface:
+        """
+        Return the compiled function of x and y for a function string, compiling it on a cache miss.
+
+        Args:
+            function_string (str): The input function string.
+
+        Returns:
+            CompiledSurface: The compiled function of x and y.
+
+        """
+        key = ("surface", normalize_function_string(function_string))
+        surface = self.get(key)
+        if surface is None:
+            with instrumentation.stage("parse"):
+                surface = compile_surface(key[1])
+            self.put(key, surface)
+        return surface
+
+
+expression_cache = ExpressionCache(EXPRESSION_CACHE_SIZE)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import re
+from typing import Optional, Tuple
+
+from app.utils.constants import PARAMETER_NAMES
+from app.utils.evaluation import split_functions
+from app.utils.expression_parser import ExpressionError, parse_expression, parse_functions
+
+FUNCTION_2D_VARIABLES = ("x",) + PARAMETER_NAMES
+FUNCTION_3D_VARIABLES = ("x", "y")
+INCOMPLETE_END_PATTERN = re.compile(r"[+\-*/^(.]\s*$")
+
+
+def check_range(xmin: str, xmax: str) -> None | Tuple[float, float]:
+    """
+    Convert the range of a variable without reporting errors, see validate_range().
+
+    Args:
+        xmin (str): The minimum value.
+        xmax (str): The maximum value.
+
+    Returns:
+        tuple: The range as a tuple (xmin, xmax) if the input is valid, None otherwise.
+
+    """
+    try:
+        return float(xmin), float(xmax)
+    except ValueError:
+        return None
+
+
+def check_2d_function(function_string: str) -> bool:
+    """
+    Check a function string for 2D plotting without reporting errors, see validate_2d_function().
+
+    Besides x, the only names allowed are the parameters of PARAMETER_NAMES and the functions and
+    constants of app.utils.expression_parser.
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        bool: True if the function string is valid, False otherwise.
+
+    """
+    return function_error(function_string) is None
+
+
+def function_error(function_string: str, variables: Tuple[str, ...] = FUNCTION_2D_VARIABLES) -> Optional[ExpressionError]:
+    """
+    Find the first error of a function string, with its position for the UI.
+
+    Args:
+        function_string (str): The input function string, holding one function or several.
+        variables (tuple): The names allowed as variables.
+
+    Returns:
+        ExpressionError: The first error of the function string, None if it is valid.
+
+    """
+    try:
+        parse_functions(function_string, variables)
+    except ExpressionError as error:
+        return error
+    return None
+
+
+def check_3d_function(function_string: str) -> bool:
+    """
+    Check a function string for plotting a function of x and y without reporting errors, see validate_3d_function().
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        bool: True if the function string is valid, False otherwise.
+
+    """
+    try:
+        parse_expression(function_string, FUNCTION_3D_VARIABLES)
+    except ExpressionError:
+        return False
+    return True
+
+
+def is_complete_function(function_string: str) -> bool:
+    """
+    Tell whether a function string that passed check_2d_function() looks finished.
+
+    A cheap check run on every keystroke of the live preview, so strings still being typed, such as
+    'x^' or '(x + 1', are neither previewed nor reported as errors in the status bar. Each function must
+    have balanced parentheses and must not end with an operator, an opening parenthesis or a decimal point.
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        bool: True if every function of the string looks finished.
+
+    """
+    for part in split_functions(function_string):
+        depth = 0
+        for character in part:
+            depth += (character == "(") - (character == ")")
+            if depth < 0:
+                return False
+        if depth != 0 or INCOMPLETE_END_PATTERN.search(part) or "()" in part.replace(" ", ""):
+            return False
+    return True
@@ -11,4 +11,88 @@ WINDOW_HEIGHT: int = 700
 PLOT_PLACE_FROM_CANVAS: int = 111
 
 ZOOM_IN: float = 0.8
-ZOOM_OUT: float = 1 / ZOOM_IN
\ No newline at end of file
+ZOOM_OUT: float = 1 / ZOOM_IN
+EXPRESSION_CACHE_SIZE: int = 128
+
+ADAPTIVE_POINT_BUDGET: int = 1000
+ADAPTIVE_MIN_INITIAL_SAMPLES: int = 16
+ADAPTIVE_MAX_DEPTH: int = 12
+ADAPTIVE_TOLERANCE: float = 1e-3
+
+DISCONTINUITY_JUMP_FACTOR: float = 10.0
+DISCONTINUITY_BISECTIONS: int = 24
+DISCONTINUITY_CONFIRM_RATIO: float = 0.5
+VISIBLE_PERCENTILES: tuple = (5.0, 95.0)
+VISIBLE_MARGIN: float = 0.5
+
+TILE_CACHE_SIZE: int = 256
+TILE_CACHE_MAX_BYTES: int = 256 * 2 ** 20
+TILES_PER_VIEW: int = 4
+
+EVALUATION_WORKERS: int = 2
+BUSY_INDICATOR_WIDTH: int = 120
+
+HIGH_RESOLUTION_FACTOR: int = 10_000
+DECIMATION_POINTS_PER_PIXEL: int = 4
+
+EXPORT_WIDTH: float = 8.0
+EXPORT_HEIGHT: float = 6.0
+EXPORT_DPI: int = 100
+
+INSTRUMENTATION_ENV: str = "FUNCTION_PLOTTER_INSTRUMENTATION"
+TRACE_LOG_ENV: str = "FUNCTION_PLOTTER_TRACE_LOG"
+
+SURFACE_CHUNK_ELEMENTS: int = 1 << 18
+SURFACE_VIEW_GRID: int = 100
+SURFACE_HIGH_RESOLUTION_FACTOR: int = 20
+
+PROGRESSIVE_MIN_SAMPLES: int = 20_000
+PROGRESSIVE_COARSE_SAMPLES: int = 256
+
+BAR_WIDTH: float = 0.8
+COLLECTION_RENDERER_THRESHOLD: int = 1000
+
+PREVIEW_DEBOUNCE_MS: int = 150
+PREVIEW_SETTLE_MS: int = 600
+PREVIEW_MAX_SAMPLES: int = 1000
+
+OPTIMIZATION_TIME_BUDGET: float = 0.05
+
+EVALUATION_THREADS_ENV: str = "FUNCTION_PLOTTER_EVALUATION_THREADS"
+PARALLEL_CHUNK_SAMPLES: int = 1 << 17
+PARALLEL_MIN_SAMPLES: int = 1 << 19
+
+ENGINE_VERSION: str = "2"
+DISK_CACHE_ENV: str = "FUNCTION_PLOTTER_DISK_CACHE"
+DISK_CACHE_SIZE_ENV: str = "FUNCTION_PLOTTER_DISK_CACHE_MB"
+DISK_CACHE_MAX_BYTES: int = 512 * 2 ** 20
+DISK_CACHE_MIN_SAMPLES: int = 10_000
+
+ANALYSIS_SAMPLES: int = 10_000
+ANALYSIS_MAX_ITERATIONS: int = 50
+ANALYSIS_TOLERANCE: float = 1e-12
+
+PARAMETER_NAMES: tuple = ("a", "b", "c", "d", "k", "t")
+TIME_PARAMETER: str = "t"
+PARAMETER_MIN: float = -10.0
+PARAMETER_MAX: float = 10.0
+PARAMETER_DEFAULT: float = 1.0
+PARAMETER_STEPS: int = 2000
+ANIMATION_INTERVAL_MS: int = 16
+ANIMATION_SPEED: float = 1.0
+ANIMATION_MAX_SAMPLES: int = 10_000
+FRAME_TIMER_WINDOW: int = 60
+
+SERVER_HOST: str = "127.0.0.1"
+SERVER_PORT: int = 8765
+SERVER_CACHE_SIZE: int = 256
+SERVER_CACHE_MAX_OUTPUT_BYTES: int = 8 * 2 ** 20
+SERVER_METRICS_WINDOW: int = 1000
+SERVER_MAX_BODY_BYTES: int = 2 ** 16
+
+DATASET_PYRAMID_BLOCK: int = 64
+DATASET_PYRAMID_FACTOR: int = 8
+DATASET_CHUNK_SAMPLES: int = 1 << 20
+DATASET_CSV_CHUNK_BYTES: int = 16 * 2 ** 20
+DATASET_BINARY_DTYPE: str = "float64"
+DATASET_FILE_FILTER: str = "Data files (*.csv *.txt *.npy *.bin *.raw);;All files (*)"
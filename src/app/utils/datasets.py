@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.utils.constants import DATASET_BINARY_DTYPE, DATASET_CHUNK_SAMPLES, DATASET_CSV_CHUNK_BYTES, \
+    DATASET_PYRAMID_BLOCK, DATASET_PYRAMID_FACTOR, DECIMATION_POINTS_PER_PIXEL
+from app.utils.decimation import minmax_decimate
+from app.utils.instrumentation import instrumentation
+
+NPY_EXTENSIONS = (".npy",)
+CSV_EXTENSIONS = (".csv", ".txt")
+
+
+class PyramidLevel(NamedTuple):
+    """
+    A level of the min/max pyramid of a dataset.
+
+    Attributes:
+        block (int): The number of samples of each block of the level.
+        indices (np.ndarray): The indices of the samples holding the smallest and the largest value of each
+            block, in their original order, with one row per block.
+        values (np.ndarray): The values of those samples, with one row per block.
+
+    """
+    block: int
+    indices: np.ndarray
+    values: np.ndarray
+
+
+def block_extremes(values: np.ndarray, block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the samples holding the smallest and the largest finite value of each block of values.
+
+    Blocks without finite values keep their first sample twice, so lines still break across them.
+
+    Args:
+        values (np.ndarray): The values, split into consecutive blocks of block samples, the last one shorter.
+        block (int): The number of samples of each block.
+
+    Returns:
+        tuple: The indices of the extremes of each block in their original order, with one row per block,
+            and the values at those indices.
+
+    """
+    n_blocks = -(-values.size // block)
+    padded = np.full(n_blocks * block, np.nan)
+    padded[:values.size] = values
+    blocks = padded.reshape(n_blocks, block)
+    finite = np.isfinite(blocks)
+    offsets = np.arange(n_blocks) * block
+    minimum = offsets + np.argmin(np.where(finite, blocks, np.inf), axis=1)
+    maximum = offsets + np.argmax(np.where(finite, blocks, -np.inf), axis=1)
+    indices = np.sort(np.column_stack((minimum, maximum)), axis=1)
+    return indices, padded[indices]
+
+
+def build_pyramid(y_data: np.ndarray, block: int = DATASET_PYRAMID_BLOCK, factor: int = DATASET_PYRAMID_FACTOR,
+                  chunk_samples: int = DATASET_CHUNK_SAMPLES) -> List[PyramidLevel]:
+    """
+    Build the min/max pyramid of a dataset, the index its views are read from.
+
+    The first level keeps the smallest and the largest sample of each block of block samples, and each
+    following level those of factor blocks of the level below, until a level has fewer than factor blocks.
+    The first level is built reading the values a chunk at a time, so a memory-mapped file is streamed
+    through once instead of being loaded. Each block keeps two indices and two values, 32 bytes, so with
+    blocks of 64 samples the pyramid takes about a sixteenth of the memory of float64 values.
+
+    Args:
+        y_data (np.ndarray): The values, possibly memory-mapped.
+        block (int): The number of samples of each block of the first level.
+        factor (int): The number of blocks of a level merged into each block of the next one.
+        chunk_samples (int): The number of values read at a time, rounded down to whole blocks.
+
+    Returns:
+        list: The levels, from the finest to the coarsest, empty for fewer than block values.
+
+    """
+    if y_data.size < block:
+        return []
+    chunk = max(chunk_samples // block, 1) * block
+    parts = []
+    for start in range(0, y_data.size, chunk):
+        indices, values = block_extremes(np.asarray(y_data[start:start + chunk], dtype=np.float64), block)
+        parts.append((indices + start, values))
+    levels = [PyramidLevel(block, np.concatenate([part[0] for part in parts]),
+                           np.concatenate([part[1] for part in parts]))]
+    while levels[-1].indices.shape[0] >= factor:
+        below = levels[-1]
+        local, values = block_extremes(below.values.ravel(), 2 * factor)
+        levels.append(PyramidLevel(below.block * factor, below.indices.ravel()[local], values))
+    return levels
+
+
+def search_sorted(x_data: np.ndarray, value: float) -> int:
+    """
+    Find the index of the first sample of sorted x data not below a value, by bisection.
+
+    Unlike np.searchsorted, this reads only the samples it compares, about log2(n) of them, also when the
+    x data is a strided column of a memory-mapped file.
+
+    Args:
+        x_data (np.ndarray): The x data, sorted.
+        value (float): The value to search for.
+
+    Returns:
+        int: The index where value would be inserted to keep x_data sorted.
+
+    """
+    low, high = 0, x_data.shape[0]
+    while low < high:
+        middle = (low + high) // 2
+        if x_data[middle] < value:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def is_sorted(x_data: np.ndarray, chunk_samples: int = DATASET_CHUNK_SAMPLES) -> bool:
+    """
+    Tell whether x data is sorted in increasing order, reading it a chunk at a time.
+
+    Args:
+        x_data (np.ndarray): The x data, possibly memory-mapped.
+        chunk_samples (int): The number of values read at a time.
+
+    Returns:
+        bool: True if every value is at least the one before it, False otherwise or for undefined values.
+
+    """
+    for start in range(0, x_data.size, chunk_samples):
+        values = np.asarray(x_data[max(start - 1, 0):start + chunk_samples], dtype=np.float64)
+        if not np.all(values[1:] >= values[:-1]) or np.isnan(values).any():
+            return False
+    return True
+
+
+class Dataset:
+    """
+    A measured curve loaded from a file, drawn over the plotted functions.
+
+    The values are kept as they were loaded, memory-mapped for binary and NPY files, and a min/max pyramid
+    is built once when loading, see build_pyramid(). A view of the dataset reads only the blocks of the
+    coarsest level that still has a block for each pixel across the visible range of x, so zooming and
+    panning touch a few thousand samples however large the file is.
+
+    Attributes:
+        name (str): The name of the dataset, the name of its file.
+        x_data (np.ndarray): The sorted x values, None for values indexed by their position.
+        y_data (np.ndarray): The values.
+        levels (list): The levels of the pyramid, from the finest to the coarsest.
+
+    """
+
+    def __init__(self, name: str, y_data: np.ndarray, x_data: Optional[np.ndarray] = None) -> None:
+        if y_data.ndim != 1 or (x_data is not None and x_data.shape != y_data.shape):
+            raise ValueError("a dataset needs one column of values, or one column of x and one of y")
+        if y_data.size == 0:
+            raise ValueError("the dataset is empty")
+        if x_data is not None and not is_sorted(x_data):
+            raise ValueError("the x values of the dataset are not sorted")
+        self.name = name
+        self.x_data = x_data
+        self.y_data = y_data
+        with instrumentation.stage("pyramid"):
+            self.levels = build_pyramid(y_data)
+
+    @property
+    def size(self) -> int:
+        """The number of samples of the dataset."""
+        return self.y_data.size
+
+    @property
+    def x_range(self) -> Tuple[float, float]:
+        """The range of x of the dataset as a tuple (xmin, xmax)."""
+        if self.x_data is None:
+            return 0.0, float(self.size - 1)
+        return float(self.x_data[0]), float(self.x_data[-1])
+
+    def x_values(self, indices: np.ndarray) -> np.ndarray:
+        """Return the x values of the samples at the given sorted indices."""
+        if self.x_data is None:
+            return indices.astype(np.float64)
+        return np.asarray(self.x_data[indices], dtype=np.float64)
+
+    def visible_slice(self, x_range: Tuple[float, float]) -> Tuple[int, int]:
+        """
+        Find the samples within a range of x, with one more sample on each side so lines leave the view.
+
+        Args:
+            x_range (tuple): The range of x as a tuple (xmin, xmax).
+
+        Returns:
+            tuple: The index of the first sample and one past the index of the last sample.
+
+        """
+        if self.x_data is None:
+            start, stop = int(np.ceil(x_range[0])), int(np.floor(x_range[1])) + 1
+        else:
+            start, stop = search_sorted(self.x_data, x_range[0]), search_sorted(self.x_data, np.nextafter(x_range[1], np.inf))
+        return min(max(start - 1, 0), self.size), min(max(stop + 1, 0), self.size)
+
+    def view(self, x_range: Tuple[float, float], n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the samples to draw for a range of x, reduced to a min/max envelope of about n_bins bins.
+
+        Up to DECIMATION_POINTS_PER_PIXEL samples per bin are returned as they are. Larger ranges are read
+        from the coarsest pyramid level with at least n_bins blocks in the range, or from the samples when
+        even the finest level has fewer blocks, and reduced with minmax_decimate.
+
+        Args:
+            x_range (tuple): The range of x as a tuple (xmin, xmax).
+            n_bins (int): The number of bins, usually the width of the canvas in pixels.
+
+        Returns:
+            tuple: The x data and y data as arrays.
+
+        """
+        start, stop = self.visible_slice(x_range)
+        count = stop - start
+        n_bins = max(int(n_bins), 1)
+        levels = [level for level in self.levels if count // level.block >= n_bins]
+        if count <= DECIMATION_POINTS_PER_PIXEL * n_bins or not levels:
+            indices = np.arange(start, stop)
+            return minmax_decimate(self.x_values(indices), np.asarray(self.y_data[start:stop], dtype=np.float64), n_bins)
+        level = levels[-1]
+        first, last = start // level.block, -(-stop // level.block)
+        indices = level.indices[first:last].ravel()
+        return minmax_decimate(self.x_values(indices), level.values[first:last].ravel(), n_bins)
+
+
+def split_columns(data: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Split loaded data into its y values and its x values.
+
+    Args:
+        data (np.ndarray): One column of y values, or two columns, or two rows, of x and y values.
+
+    Returns:
+        tuple: The y values and the x values, None for one column.
+
+    Raises:
+        ValueError: If the data has another shape.
+
+    """
+    if data.ndim == 1:
+        return data, None
+    if data.ndim == 2 and data.shape[1] == 1:
+        return data[:, 0], None
+    if data.ndim == 2 and data.shape[1] == 2:
+        return data[:, 1], data[:, 0]
+    if data.ndim == 2 and data.shape[0] == 2:
+        return data[1], data[0]
+    raise ValueError(f"expected one or two columns of values, found an array of shape {data.shape}")
+
+
+def load_npy(path: str) -> Dataset:
+    """
+    Load a dataset from an NPY file, memory-mapped rather than read into memory.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Dataset: The dataset.
+
+    """
+    y_data, x_data = split_columns(np.load(path, mmap_mode="r"))
+    return Dataset(os.path.basename(path), y_data, x_data)
+
+
+def load_binary(path: str, dtype: str = DATASET_BINARY_DTYPE, columns: int = 1) -> Dataset:
+    """
+    Load a dataset from a raw binary file of floats, memory-mapped rather than read into memory.
+
+    Args:
+        path (str): The path of the file.
+        dtype (str): The type of the values, such as 'float64' or '<f4'.
+        columns (int): 1 for y values only, 2 for interleaved pairs of x and y values.
+
+    Returns:
+        Dataset: The dataset.
+
+    Raises:
+        ValueError: If the size of the file is not a whole number of rows.
+
+    """
+    row_bytes = np.dtype(dtype).itemsize * columns
+    size = os.path.getsize(path)
+    if size == 0 or size % row_bytes:
+        raise ValueError(f"the file does not hold whole rows of {columns} {np.dtype(dtype).name} values")
+    data = np.memmap(path, dtype=dtype, mode="r")
+    y_data, x_data = split_columns(data if columns == 1 else data.reshape(-1, columns))
+    return Dataset(os.path.basename(path), y_data, x_data)
+
+
+def parse_csv_chunk(text: str, delimiter: Optional[str], columns: int) -> np.ndarray:
+    """
+    Parse complete lines of a CSV file into rows of floats.
+
+    Args:
+        text (str): The lines.
+        delimiter (str): The delimiter of the fields, None for whitespace.
+        columns (int): The number of fields of each line.
+
+    Returns:
+        np.ndarray: The values, with one row per line.
+
+    Raises:
+        ValueError: If a field is not a number or a line has another number of fields.
+
+    """
+    if delimiter is not None:
+        text = text.replace(delimiter, " ")
+    values = np.array(text.split(), dtype=np.float64)
+    if values.size % columns:
+        raise ValueError(f"every line should have {columns} fields")
+    return values.reshape(-1, columns)
+
+
+def is_numeric_line(line: str) -> bool:
+    """Tell whether a line of a CSV file holds numbers, rather than a header."""
+    try:
+        [float(field) for field in line.replace(",", " ").replace(";", " ").split()]
+    except ValueError:
+        return False
+    return True
+
+
+def load_csv(path: str, chunk_bytes: int = DATASET_CSV_CHUNK_BYTES) -> Dataset:
+    """
+    Load a dataset from a CSV file, parsing it a chunk of lines at a time.
+
+    The fields may be separated by commas, semicolons or whitespace, and a first line that is not numeric
+    is skipped as a header. One column holds y values, and two columns hold x and y values, sorted by x
+    if they are not already.
+
+    Args:
+        path (str): The path of the file.
+        chunk_bytes (int): The number of characters read at a time.
+
+    Returns:
+        Dataset: The dataset.
+
+    Raises:
+        ValueError: If the file is not made of numeric lines of one or two fields.
+
+    """
+    chunks = []
+    with open(path, encoding="utf-8") as file:
+        first = file.readline()
+        if not is_numeric_line(first):
+            first = file.readline()
+        delimiter = next((candidate for candidate in (",", ";", "\t") if candidate in first), None)
+        columns = len(first.split(delimiter)) if first.strip() else 1
+        if columns not in (1, 2):
+            raise ValueError(f"expected one or two columns of values, found {columns}")
+        remainder = first
+        while True:
+            text = file.read(chunk_bytes)
+            if not text:
+                break
+            text = remainder + text
+            end = text.rfind("\n") + 1
+            chunks.append(parse_csv_chunk(text[:end], delimiter, columns))
+            remainder = text[end:]
+        chunks.append(parse_csv_chunk(remainder, delimiter, columns))
+    data = np.concatenate(chunks)
+    if columns == 1:
+        return Dataset(os.path.basename(path), data[:, 0])
+    if not is_sorted(data[:, 0]):
+        data = data[np.argsort(data[:, 0], kind="stable")]
+    return Dataset(os.path.basename(path), np.ascontiguousarray(data[:, 1]), np.ascontiguousarray(data[:, 0]))
+
+
+def load_dataset(path: str) -> Dataset:
+    """
+    Load a dataset from a file, choosing the loader from the extension of the file.
+
+    NPY files are loaded with load_npy(), CSV and text files with load_csv(), and any other file as raw
+    binary floats of DATASET_BINARY_DTYPE with load_binary().
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Dataset: The dataset.
+
+    Raises:
+        ValueError: If the file cannot be read as a dataset.
+        OSError: If the file cannot be opened.
+
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with instrumentation.stage("load"):
+        if extension in NPY_EXTENSIONS:
+            dataset = load_npy(path)
+        elif extension in CSV_EXTENSIONS:
+            dataset = load_csv(path)
+        else:
+            dataset = load_binary(path)
+    instrumentation.count("samples", dataset.size)
+    return dataset
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Tuple
+
+import numpy as np
+
+from app.utils.constants import DECIMATION_POINTS_PER_PIXEL
+from app.utils.instrumentation import instrumentation
+
+
+def minmax_decimate(x_data: np.ndarray, y_data: np.ndarray, n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce sampled data to a min/max envelope of about n_bins bins before rendering.
+
+    The samples are split into n_bins consecutive blocks of equal size, which for evenly spaced
+    samples are bins of equal width in x, so one block maps to about one pixel column when n_bins
+    is the width of the canvas. Each block keeps the samples holding its smallest and its largest
+    finite value, in their original order, so every peak and trough of the curve is drawn. A block
+    that contains undefined values also keeps its first one, so lines still break at poles. The first
+    and last samples are always kept.
+
+    Data with no more than DECIMATION_POINTS_PER_PIXEL samples per bin is returned unchanged.
+
+    Several curves sampled on a shared x grid, given as one row of y data per curve, keep the union
+    of the samples kept for each curve, so they still share the decimated x data.
+
+    Args:
+        x_data (np.ndarray): The x data, sorted.
+        y_data (np.ndarray): The y data, or one row of y data per curve.
+        n_bins (int): The number of bins, usually the width of the canvas in pixels.
+
+    Returns:
+        tuple: The decimated x data and y data as arrays.
+
+    """
+    x_data = np.asarray(x_data, dtype=np.float64)
+    y_data = np.asarray(y_data, dtype=np.float64)
+    n_bins = max(int(n_bins), 1)
+    if x_data.size <= DECIMATION_POINTS_PER_PIXEL * n_bins:
+        return x_data, y_data
+
+    rows = np.atleast_2d(y_data)
+    block = -(-x_data.size // n_bins)
+    n_blocks = -(-x_data.size // block)
+    padded = np.full((rows.shape[0], n_blocks * block), np.nan)
+    padded[:, :x_data.size] = rows
+    blocks = padded.reshape(rows.shape[0], n_blocks, block)
+    finite = np.isfinite(blocks)
+    undefined = ~finite
+    undefined[:, -1, x_data.size - (n_blocks - 1) * block:] = False
+
+    offsets = np.arange(n_blocks) * block
+    minimum = offsets + np.argmin(np.where(finite, blocks, np.inf), axis=2)
+    maximum = offsets + np.argmax(np.where(finite, blocks, -np.inf), axis=2)
+    has_undefined = undefined.any(axis=2)
+    first_undefined = (offsets + np.argmax(undefined, axis=2))[has_undefined]
+
+    keep = np.unique(np.concatenate(([0, x_data.size - 1], minimum.ravel(), maximum.ravel(), first_undefined)))
+    keep = keep[keep < x_data.size]
+    return x_data[keep], y_data[..., keep]
+
+
+def sample_decimated(sample: Callable[..., Tuple[np.ndarray, np.ndarray]], n_bins: int, *args: Any) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run a sampling function and reduce its result with minmax_decimate.
+
+    Args:
+        sample (Callable): The sampling function, returning the x data and y data.
+        n_bins (int): The number of bins, usually the width of the canvas in pixels.
+        *args: The arguments of the sampling function.
+
+    Returns:
+        tuple: The decimated x data and y data as arrays.
+
+    """
+    x_data, y_data = sample(*args)
+    with instrumentation.stage("decimate"):
+        return minmax_decimate(x_data, y_data, n_bins)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from app.utils.constants import DISCONTINUITY_BISECTIONS, DISCONTINUITY_CONFIRM_RATIO, DISCONTINUITY_JUMP_FACTOR, \
+    VISIBLE_MARGIN, VISIBLE_PERCENTILES
+from app.utils.instrumentation import instrumentation
+
+Function = Callable[[np.ndarray], np.ndarray]
+
+
+def evaluate_rows(function: Function, x_data: np.ndarray) -> np.ndarray:
+    """
+    Evaluate a function as one row of values per curve, also where it returns a single row or a constant.
+
+    Args:
+        function (Callable): The vectorized function.
+        x_data (np.ndarray): The x values.
+
+    Returns:
+        np.ndarray: The values, with one row per curve and one column per x value.
+
+    """
+    values = np.atleast_2d(function(x_data))
+    return np.broadcast_to(values, (values.shape[0], x_data.size))
+
+
+def jump_candidates(y_data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the intervals of sampled curves that may hold a discontinuity, with one vectorized scan.
+
+    An interval between two finite samples is a candidate if the curve changes sign over it, as it does
+    across the pole of 1/x, or if it rises or falls more than DISCONTINUITY_JUMP_FACTOR times as much as
+    over both neighboring intervals, as it does across a jump. Roots of continuous curves are candidates
+    too, and are told apart by confirm_jumps().
+
+    Args:
+        y_data (np.ndarray): The sampled values, or one row of values per curve.
+
+    Returns:
+        tuple: The row and the index of the left sample of each candidate interval.
+
+    """
+    rows = np.atleast_2d(y_data)
+    with np.errstate(all="ignore"):
+        finite = np.isfinite(rows[:, :-1]) & np.isfinite(rows[:, 1:])
+        steps = np.abs(np.diff(rows, axis=1))
+        neighbors = np.full(steps.shape, np.inf)
+        if steps.shape[1] > 1:
+            neighbors[:, 0] = steps[:, 1]
+            neighbors[:, -1] = steps[:, -2]
+            neighbors[:, 1:-1] = np.fmax(steps[:, :-2], steps[:, 2:])
+        sign_change = np.sign(rows[:, :-1]) * np.sign(rows[:, 1:]) < 0
+        jump = steps > DISCONTINUITY_JUMP_FACTOR * neighbors
+    return np.nonzero(finite & (sign_change | jump))
+
+
+def confirm_jumps(function: Function, x_left: np.ndarray, x_right: np.ndarray, y_left: np.ndarray,
+                  y_right: np.ndarray, rows: np.ndarray, bisections: int = DISCONTINUITY_BISECTIONS) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Confirm candidate discontinuities by bisecting their intervals, all candidates at once.
+
+    Each bisection evaluates the midpoints of the intervals in one vectorized call and keeps the half
+    over which the curve changes the most. Over a continuous stretch the change shrinks with the interval,
+    so a candidate is dropped as soon as its change falls below DISCONTINUITY_CONFIRM_RATIO times the
+    change over the sampled interval, usually after a couple of bisections. Across a jump the change stays
+    the same, and towards a pole it grows, so the candidates that survive every bisection are
+    discontinuities, located within the last interval. A candidate whose midpoint is undefined is a
+    discontinuity located at that midpoint.
+
+    Args:
+        function (Callable): The vectorized function, returning one row of values per curve for several curves.
+        x_left (np.ndarray): The left ends of the candidate intervals.
+        x_right (np.ndarray): The right ends of the candidate intervals.
+        y_left (np.ndarray): The values at the left ends.
+        y_right (np.ndarray): The values at the right ends.
+        rows (np.ndarray): The curve of each candidate.
+        bisections (int): The number of bisections.
+
+    Returns:
+        tuple: Whether each candidate is a discontinuity, and the x value of each discontinuity found.
+
+    """
+    x_left, x_right = x_left.astype(np.float64), x_right.astype(np.float64)
+    y_left, y_right = y_left.astype(np.float64), y_right.astype(np.float64)
+    threshold = DISCONTINUITY_CONFIRM_RATIO * np.abs(y_right - y_left)
+    alive = np.ones(x_left.size, dtype=bool)
+    undefined = np.zeros(x_left.size, dtype=bool)
+    for _ in range(bisections):
+        pending = np.flatnonzero(alive & ~undefined)
+        if pending.size == 0:
+            break
+        x_mid = (x_left[pending] + x_right[pending]) / 2
+        with np.errstate(all="ignore"):
+            y_mid = evaluate_rows(function, x_mid)[rows[pending], np.arange(pending.size)]
+            left_change = np.abs(y_mid - y_left[pending])
+            right_change = np.abs(y_right[pending] - y_mid)
+        undefined[pending] = ~np.isfinite(y_mid)
+        take_left = (left_change >= right_change) | undefined[pending]
+        x_right[pending] = np.where(take_left, x_mid, x_right[pending])
+        y_right[pending] = np.where(take_left, y_mid, y_right[pending])
+        x_left[pending] = np.where(take_left & ~undefined[pending], x_left[pending], x_mid)
+        y_left[pending] = np.where(take_left, y_left[pending], y_mid)
+        alive[pending] = undefined[pending] | (np.fmax(left_change, right_change) >= threshold[pending])
+    return alive, (x_left + x_right) / 2
+
+
+def find_discontinuities(function: Function, x_data: np.ndarray, y_data: np.ndarray) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the discontinuities and asymptotes of sampled curves.
+
+    Candidates are found with jump_candidates() and confirmed with confirm_jumps().
+
+    Args:
+        function (Callable): The vectorized function, returning one row of values per curve for several curves.
+        x_data (np.ndarray): The x data, sorted.
+        y_data (np.ndarray): The y data, or one row of y data per curve.
+
+    Returns:
+        tuple: The row, the index of the left sample of the interval and the x value of each discontinuity.
+
+    """
+    rows, intervals = jump_candidates(y_data)
+    if intervals.size == 0:
+        return rows, intervals, x_data[intervals].astype(np.float64)
+    y_rows = np.atleast_2d(y_data)
+    confirmed, x_breaks = confirm_jumps(function, x_data[intervals], x_data[intervals + 1],
+                                        y_rows[rows, intervals], y_rows[rows, intervals + 1], rows)
+    return rows[confirmed], intervals[confirmed], x_breaks[confirmed]
+
+
+def break_discontinuities(function: Function, x_data: np.ndarray, y_data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Break sampled curves at their discontinuities and asymptotes, so no segment is drawn across them.
+
+    A sample is inserted at each discontinuity found by find_discontinuities(), NaN for the curves that
+    break there and the value of the function for the others. Infinite values, such as 1/x at exactly 0,
+    are replaced with NaN too.
+
+    Args:
+        function (Callable): The vectorized function, returning one row of values per curve for several curves.
+        x_data (np.ndarray): The x data, sorted.
+        y_data (np.ndarray): The y data, or one row of y data per curve.
+
+    Returns:
+        tuple: The x data and y data with the breaks inserted.
+
+    """
+    with instrumentation.stage("discontinuities"):
+        y_data = np.where(np.isinf(y_data), np.nan, y_data)
+        rows, intervals, x_breaks = find_discontinuities(function, x_data, y_data)
+        if intervals.size == 0:
+            return x_data, y_data
+        unique, first, inverse = np.unique(intervals, return_index=True, return_inverse=True)
+        x_breaks = x_breaks[first]
+        with np.errstate(all="ignore"):
+            y_breaks = np.array(evaluate_rows(function, x_breaks))
+        y_breaks[rows, inverse] = np.nan
+        x_data = np.insert(x_data, unique + 1, x_breaks)
+        y_data = np.insert(y_data, unique + 1, y_breaks if y_data.ndim > 1 else y_breaks[0], axis=-1)
+    instrumentation.count("discontinuities", unique.size)
+    return x_data, y_data
+
+
+def has_breaks(y_data: np.ndarray) -> bool:
+    """
+    Tell whether sampled curves were broken at a discontinuity, see break_discontinuities().
+
+    A break is a single undefined sample between two finite ones. Undefined stretches, such as the
+    negative x of sqrt(x), span several samples.
+
+    Args:
+        y_data (np.ndarray): The y data, or one row of y data per curve.
+
+    Returns:
+        bool: True if any curve has a break.
+
+    """
+    rows = np.atleast_2d(y_data)
+    if rows.shape[1] < 3:
+        return False
+    finite = np.isfinite(rows)
+    return bool((~finite[:, 1:-1] & finite[:, :-2] & finite[:, 2:]).any())
+
+
+def visible_range(y_data: np.ndarray) -> Optional[Tuple[float, float]]:
+    """
+    Estimate the range of y values worth showing for curves that blow up near asymptotes.
+
+    The range spans the VISIBLE_PERCENTILES of the finite values, widened by VISIBLE_MARGIN times its
+    height on each side, so the few samples close to an asymptote, at values like 1e16, do not squash
+    the rest of the curve.
+
+    Args:
+        y_data (np.ndarray): The y data, or one row of y data per curve.
+
+    Returns:
+        tuple: The range as a tuple (ymin, ymax), None if there are no finite values.
+
+    """
+    finite = np.asarray(y_data)[np.isfinite(y_data)]
+    if finite.size == 0:
+        return None
+    low, high = np.percentile(finite, VISIBLE_PERCENTILES)
+    margin = VISIBLE_MARGIN * (high - low) or 1.0
+    return max(float(finite.min()), low - margin), min(float(finite.max()), high + margin)
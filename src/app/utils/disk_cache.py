@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.utils.cache import normalize_function_string
+from app.utils.constants import DISK_CACHE_ENV, DISK_CACHE_MAX_BYTES, DISK_CACHE_MIN_SAMPLES, DISK_CACHE_SIZE_ENV, \
+    ENGINE_VERSION
+from app.utils.instrumentation import instrumentation
+from app.utils.sampling_mode import SamplingMode
+
+ARRAY_NAMES = ("x", "y")
+
+
+class DiskCache:
+    """
+    A size-capped cache of sampled data on disk, kept across sessions.
+
+    Each entry holds the x data and y data of one function sampled over one range, as two .npy files
+    named after a hash of the normalized function string, the range, the number of samples, the sampling
+    mode and ENGINE_VERSION, so bumping the engine version invalidates every entry. Hits are loaded with
+    np.load(mmap_mode='r'), mapping the files instead of reading them, so the arrays are read-only.
+
+    Entries are written to temporary files and renamed into place, so several processes can share the
+    directory. When the files exceed max_bytes, the least recently used entries, by modification time,
+    which every hit refreshes, are deleted. Samplings of fewer than min_samples samples are faster to
+    evaluate again than to load and are not cached.
+
+    Attributes:
+        directory (str): The directory of the cache files, None to disable the cache.
+        max_bytes (int): The maximum total size of the cache files.
+        min_samples (int): The smallest number of samples of a cached entry.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that did not find an entry.
+        evictions (int): The number of entries deleted because the cache was full.
+
+    """
+
+    def __init__(self, directory: Optional[str], max_bytes: int = DISK_CACHE_MAX_BYTES,
+                 min_samples: int = DISK_CACHE_MIN_SAMPLES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_samples = min_samples
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(function_string: str, x_range: Tuple[float, float], x_samples: int, sampling_mode: SamplingMode) -> str:
+        """
+        Hash the inputs of a sampling into the name of its cache entry.
+
+        Args:
+            function_string (str): The input function string.
+            x_range (tuple): The range of x as a tuple (xmin, xmax).
+            x_samples (int): The number of x samples.
+            sampling_mode (SamplingMode): The way of choosing the x samples.
+
+        Returns:
+            str: The hex digest naming the entry.
+
+        """
+        inputs = [normalize_function_string(function_string), float(x_range[0]).hex(), float(x_range[1]).hex(),
+                  int(x_samples), sampling_mode.name, ENGINE_VERSION]
+        return hashlib.sha256(json.dumps(inputs).encode("utf-8")).hexdigest()
+
+    def path(self, key: str, name: str) -> str:
+        """Return the path of one array of an entry."""
+        return os.path.join(self.directory, f"{key}.{name}.npy")
+
+    def load(self, function_string: str, x_range: Tuple[float, float], x_samples: int,
+             sampling_mode: SamplingMode = SamplingMode.UNIFORM) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Look up the samples of a function, memory-mapping them from disk.
+
+        Args:
+            function_string (str): The input function string.
+            x_range (tuple): The range of x as a tuple (xmin, xmax).
+            x_samples (int): The number of x samples.
+            sampling_mode (SamplingMode): The way of choosing the x samples.
+
+        Returns:
+            tuple: The read-only x data and y data, or None if they are not cached.
+
+        """
+        if self.directory is None:
+            return None
+        key = self.key(function_string, x_range, x_samples, sampling_mode)
+        try:
+            arrays = tuple(np.load(self.path(key, name), mmap_mode="r") for name in ARRAY_NAMES)
+            for name in ARRAY_NAMES:
+                os.utime(self.path(key, name))
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        instrumentation.count("disk cache hits")
+        return arrays
+
+    def store(self, function_string: str, x_range: Tuple[float, float], x_samples: int, sampling_mode: SamplingMode,
+              x_data: np.ndarray, y_data: np.ndarray) -> None:
+        """
+        Write the samples of a function to disk, then evict entries until the cache fits in max_bytes.
+
+        Args:
+            function_string (str): The input function string.
+            x_range (tuple): The range of x as a tuple (xmin, xmax).
+            x_samples (int): The number of x samples.
+            sampling_mode (SamplingMode): The way of choosing the x samples.
+            x_data (np.ndarray): The x data.
+            y_data (np.ndarray): The y data.
+
+        """
+        if self.directory is None or x_data.size < self.min_samples or x_data.nbytes + y_data.nbytes > self.max_bytes:
+            return
+        key = self.key(function_string, x_range, x_samples, sampling_mode)
+        try:
+            for name, data in zip(ARRAY_NAMES, (x_data, y_data)):
+                self.write(self.path(key, name), data)
+        except OSError:
+            return
+        self.evict()
+
+    def write(self, path: str, data: np.ndarray) -> None:
+        """
+        Write an array to a temporary file in the cache directory and rename it into place.
+
+        The temporary file is deleted if writing or renaming it fails, so no partial file is left behind.
+
+        Args:
+            path (str): The path of the .npy file.
+            data (np.ndarray): The array.
+
+        Raises:
+            OSError: If the file could not be written.
+
+        """
+        temporary = tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False)
+        try:
+            with temporary:
+                np.save(temporary, np.asarray(data))
+            os.replace(temporary.name, path)
+        finally:
+            # After a successful rename the temporary file no longer exists.
+            if os.path.exists(temporary.name):
+                os.remove(temporary.name)
+
+    def entries(self) -> Dict[str, Tuple[float, int]]:
+        """
+        List the entries of the cache.
+
+        Returns:
+            dict: The last use time and the total size in bytes of each entry, by key.
+
+        """
+        entries: Dict[str, Tuple[float, int]] = {}
+        with os.scandir(self.directory) as files:
+            for file in files:
+                if not file.name.endswith(".npy"):
+                    continue
+                try:
+                    stat = file.stat()
+                except OSError:
+                    continue
+                key = file.name.split(".", 1)[0]
+                used, size = entries.get(key, (0.0, 0))
+                entries[key] = max(used, stat.st_mtime), size + stat.st_size
+        return entries
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the cache files fit in max_bytes."""
+        with self.lock:
+            entries = self.entries()
+            total = sum(size for _, size in entries.values())
+            for key in sorted(entries, key=lambda entry: entries[entry][0]):
+                if total <= self.max_bytes:
+                    break
+                for name in ARRAY_NAMES:
+                    try:
+                        os.remove(self.path(key, name))
+                    except OSError:
+                        pass
+                total -= entries[key][1]
+                self.evictions += 1
+
+    def size(self) -> int:
+        """Return the total size of the cache files in bytes."""
+        if self.directory is None:
+            return 0
+        return sum(size for _, size in self.entries().values())
+
+    def clear(self) -> None:
+        """Delete every entry and reset the counters."""
+        if self.directory is not None:
+            for key in self.entries():
+                for name in ARRAY_NAMES:
+                    try:
+                        os.remove(self.path(key, name))
+                    except OSError:
+                        pass
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+disk_cache = DiskCache(os.environ.get(DISK_CACHE_ENV) or None,
+                       int(float(os.environ.get(DISK_CACHE_SIZE_ENV) or 0) * 2 ** 20) or DISK_CACHE_MAX_BYTES)
@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.expression_parser import Kernel, Node, parse_expression
+from app.utils.optimization import optimize_expression, optimize_tree
+
+if TYPE_CHECKING:
+    import sympy
+
+
+def x_symbol() -> sympy.Symbol:
+    """
+    Return the sympy symbol of the variable x.
+
+    sympy is imported on first use rather than with this module, since it takes longer to import
+    than the rest of the application.
+
+    Returns:
+        sympy.Symbol: The symbol x.
+
+    """
+    import sympy
+    return sympy.Symbol('x')
+
+
+def y_symbol() -> sympy.Symbol:
+    """
+    Return the sympy symbol of the variable y, used by functions of x and y.
+
+    Returns:
+        sympy.Symbol: The symbol y.
+
+    """
+    import sympy
+    return sympy.Symbol('y')
+
+
+class CompiledFunction:
+    """
+    A sympy expression of x compiled into a vectorized NumPy kernel, used for derivatives.
+
+    The sympy expression is turned into a NumPy function once with sympy.lambdify, so a whole
+    grid of x values is evaluated in a single call instead of one sympy substitution per sample.
+    The kernel is generated with common subexpression elimination, so a subterm repeated in the
+    expression is computed once per call.
+    Expressions that the kernel cannot handle (functions without a NumPy counterpart, results
+    that do not broadcast to the grid) fall back to the symbolic path, which substitutes each
+    sample into the expression and evaluates it numerically.
+
+    Attributes:
+        expression (sympy.Expr): The parsed expression of x.
+        kernel (Callable): The NumPy kernel generated from the expression.
+        vectorized (bool): False once the kernel has failed and the symbolic path is used instead.
+
+    """
+
+    def __init__(self, expression: sympy.Expr) -> None:
+        import sympy
+        self.expression = expression
+        self.kernel = sympy.lambdify(x_symbol(), expression, modules="numpy", cse=True)
+        self.vectorized = True
+
+    def __call__(self, x_data: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the function over an array of x values.
+
+        Args:
+            x_data (np.ndarray): The x values to evaluate the function at.
+
+        Returns:
+            np.ndarray: The y values as a float64 array with the same shape as x_data.
+                Points where the function is undefined or not real are NaN.
+
+        """
+        x_data = np.asarray(x_data, dtype=np.float64)
+        if self.vectorized:
+            try:
+                return self.evaluate_vectorized(x_data)
+            except (TypeError, ValueError, NameError, AttributeError, ZeroDivisionError):
+                self.vectorized = False
+        return self.evaluate_symbolic(x_data)
+
+    def evaluate_vectorized(self, x_data: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the function with the compiled NumPy kernel.
+
+        Args:
+            x_data (np.ndarray): The x values as a float64 array.
+
+        Returns:
+            np.ndarray: The y values as a float64 array.
+
+        """
+        with np.errstate(all="ignore"):
+            y_data = self.kernel(x_data)
+        return real_values(y_data, x_data.shape)
+
+    def evaluate_symbolic(self, x_data: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the function by substituting each x value into the sympy expression.
+
+        This is the slow path, used only when the compiled kernel cannot evaluate the expression.
+
+        Args:
+            x_data (np.ndarray): The x values as a float64 array.
+
+        Returns:
+            np.ndarray: The y values as a float64 array.
+
+        """
+        x = x_symbol()
+        y_data = np.empty(x_data.shape, dtype=np.float64)
+        for index, xi in np.ndenumerate(x_data):
+            try:
+                y_data[index] = float(self.expression.subs(x, xi).evalf())
+            except (TypeError, ValueError):
+                y_data[index] = np.nan
+        return y_data
+
+
+class ParsedFunction(CompiledFunction):
+    """
+    A function of x parsed by app.utils.expression_parser and compiled into a chain of NumPy ufuncs.
+
+    Parsing and compiling do not need sympy. The sympy expression is only parsed when a symbolic
+    feature asks for it, such as differentiate() or the symbolic path of evaluation.
+
+    Attributes:
+        source (str): The function string.
+        tree (Node): The parsed expression tree.
+        kernel (Kernel): The NumPy kernel compiled from the tree.
+        vectorized (bool): False once the kernel has failed and the symbolic path is used instead.
+
+    """
+
+    def __init__(self, source: str, tree: Node) -> None:
+        self.source = source
+        self.tree = tree
+        self.kernel = Kernel(tree, ("x",))
+        self.vectorized = True
+        self.symbolic_expression: Optional[sympy.Expr] = None
+
+    @property
+    def expression(self) -> sympy.Expr:
+        """The sympy expression of the function, parsed on first use."""
+        if self.symbolic_expression is None:
+            self.symbolic_expression = parse_symbolic(self.source)
+        return self.symbolic_expression
+
+
+class FunctionGroup:
+    """
+    Several parsed functions of x compiled into one NumPy kernel evaluated on a shared grid.
+
+    The expression trees are compiled together, and a subexpression shared by several functions,
+    such as sin(x) in sin(x)^2 and sin(x)*x, is computed once per evaluation, see Kernel. Adding a
+    function to the group therefore costs about one more vectorized pass over the grid. If the shared
+    kernel fails, each function is evaluated on its own with its fallbacks.
+
+    Attributes:
+        functions (list): The compiled function of each expression.
+        kernel (Kernel): The NumPy kernel returning the values of all the expressions.
+        vectorized (bool): False once the shared kernel has failed.
+
+    """
+
+    def __init__(self, functions: Sequence[ParsedFunction]) -> None:
+        self.functions = list(functions)
+        self.kernel = Kernel([function.tree for function in self.functions], ("x",))
+        self.vectorized = True
+
+    def __len__(self) -> int:
+        return len(self.functions)
+
+    def __call__(self, x_data: np.ndarray) -> np.ndarray:
+        """
+        Evaluate all the functions over an array of x values.
+
+        Args:
+            x_data (np.ndarray): The x values to evaluate the functions at.
+
+        Returns:
+            np.ndarray: The y values as a float64 array with one row per function and one column per x value.
+                Points where a function is undefined or not real are NaN.
+
+        """
+        x_data = np.asarray(x_data, dtype=np.float64)
+        if self.vectorized:
+            try:
+                with np.errstate(all="ignore"):
+                    rows = self.kernel(x_data)
+                return np.stack([real_values(row, x_data.shape) for row in rows])
+            except (TypeError, ValueError, NameError, AttributeError, ZeroDivisionError):
+                self.vectorized = False
+        return np.stack([function(x_data) for function in self.functions])
+
+
+class CompiledSurface:
+    """
+    A parsed function of x and y compiled into a vectorized NumPy kernel.
+
+    The kernel is evaluated on broadcast arrays of x and y, so a row x_data of shape (1, n) and a
+    column y_data of shape (m, 1) give the values over the whole m by n grid without building the
+    meshgrid first. Expressions that the kernel cannot handle fall back to substituting each point
+    into the expression, like CompiledFunction.
+
+    Attributes:
+        expression (sympy.Expr): The parsed expression of x and y.
+        kernel (Callable): The NumPy kernel generated from the expression.
+        vectorized (bool): False once the kernel has failed and the symbolic path is used instead.
+
+    """
+
+    def __init__(self, expression: sympy.Expr) -> None:
+        import sympy
+        self.expression = expression
+        self.kernel = sympy.lambdify((x_symbol(), y_symbol()), expression, modules="numpy", cse=True)
+        self.vectorized = True
+
+    def __call__(self, x_data: np.ndarray, y_data: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the function over broadcast arrays of x and y values.
+
+        Args:
+            x_data (np.ndarray): The x values.
+            y_data (np.ndarray): The y values, broadcastable with x_data.
+
+        Returns:
+            np.ndarray: The z values as a float64 array with the broadcast shape of x_data and y_data.
+                Points where the function is undefined or not real are NaN.
+
+        """
+        x_data = np.asarray(x_data, dtype=np.float64)
+        y_data = np.asarray(y_data, dtype=np.float64)
+        shape = np.broadcast(x_data, y_data).shape
+        if self.vectorized:
+            try:
+                with np.errstate(all="ignore"):
+                    z_data = self.kernel(x_data, y_data)
+                return real_values(z_data, shape)
+            except (TypeError, ValueError, NameError, AttributeError, ZeroDivisionError):
+                self.vectorized = False
+        x, y = x_symbol(), y_symbol()
+        z_data = np.empty(shape, dtype=np.float64)
+        for index, (xi, yi) in zip(np.ndindex(shape), np.broadcast(x_data, y_data)):
+            try:
+                z_data[index] = float(self.expression.subs({x: xi, y: yi}).evalf())
+            except (TypeError, ValueError):
+                z_data[index] = np.nan
+        return z_data
+
+
+class ParsedSurface(CompiledSurface):
+    """
+    A function of x and y parsed by app.utils.expression_parser and compiled into a chain of NumPy ufuncs.
+
+    Like ParsedFunction, the sympy expression is only parsed when the symbolic path needs it.
+
+    Attributes:
+        source (str): The function string.
+        tree (Node): The parsed expression tree.
+        kernel (Kernel): The NumPy kernel compiled from the tree.
+        vectorized (bool): False once the kernel has failed and the symbolic path is used instead.
+
+    """
+
+    def __init__(self, source: str, tree: Node) -> None:
+        self.source = source
+        self.tree = tree
+        self.kernel = Kernel(tree, ("x", "y"))
+        self.vectorized = True
+        self.symbolic_expression: Optional[sympy.Expr] = None
+
+    @property
+    def expression(self) -> sympy.Expr:
+        """The sympy expression of the function, parsed on first use."""
+        if self.symbolic_expression is None:
+            self.symbolic_expression = parse_symbolic(self.source)
+        return self.symbolic_expression
+
+
+def parse_symbolic(function_string: str) -> sympy.Expr:
+    """
+    Parse a function string with sympy, for the symbolic features.
+
+    Args:
+        function_string (str): The function string, which must have been parsed by app.utils.expression_parser,
+            since sympy.parse_expr evaluates its input.
+
+    Returns:
+        sympy.Expr: The sympy expression.
+
+    """
+    import sympy
+    return sympy.parse_expr(function_string.replace("^", "**"))
+
+
+def real_values(y_data, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Convert the output of a kernel to real float64 values of the given shape.
+
+    Args:
+        y_data: The values returned by the kernel, possibly complex or a scalar for constant expressions.
+        shape (tuple): The shape of the x values the kernel was evaluated at.
+
+    Returns:
+        np.ndarray: The values as a float64 array, NaN where they are not real.
+
+    """
+    y_data = np.asarray(y_data)
+    if np.iscomplexobj(y_data):
+        y_data = np.where(y_data.imag == 0, y_data.real, np.nan)
+    return np.array(np.broadcast_to(y_data, shape), dtype=np.float64)
+
+
+def split_functions(function_string: str) -> List[str]:
+    """
+    Split an input holding several functions, one per line or separated by ';'.
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        list: The stripped function strings, without empty ones.
+
+    """
+    return [part.strip() for part in re.split(r"[;\n]", function_string) if part.strip()]
+
+
+def compile_function(function_string: str) -> ParsedFunction:
+    """
+    Parse a function string and compile it for vectorized evaluation, without sympy.
+
+    The parsed tree is simplified first, see app.utils.optimization.optimize_tree().
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        ParsedFunction: The compiled function of x.
+
+    Raises:
+        ExpressionError: If the function string is not a valid function of x, see app.utils.expression_parser.
+
+    """
+    return ParsedFunction(function_string, optimize_tree(parse_expression(function_string, ("x",)), ("x",)))
+
+
+def differentiate(function: CompiledFunction, order: int = 1) -> CompiledFunction:
+    """
+    Differentiate a compiled function of x symbolically and compile its derivative.
+
+    x is taken to be real while differentiating, so functions such as abs(x) have a derivative
+    that NumPy can evaluate, sign(x), instead of one written with re(x) and im(x).
+
+    Args:
+        function (CompiledFunction): The compiled function of x.
+        order (int): The order of the derivative.
+
+    Returns:
+        CompiledFunction: The compiled derivative.
+
+    """
+    import sympy
+    x, real_x = x_symbol(), sympy.Symbol('x', real=True)
+    derivative = sympy.diff(function.expression.subs(x, real_x), real_x, order).subs(real_x, x)
+    return CompiledFunction(optimize_expression(derivative))
+
+
+def compile_surface(function_string: str) -> ParsedSurface:
+    """
+    Parse a function string of x and y and compile it for vectorized evaluation, without sympy.
+
+    The parsed tree is simplified first, see app.utils.optimization.optimize_tree().
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        ParsedSurface: The compiled function of x and y.
+
+    Raises:
+        ExpressionError: If the function string is not a valid function of x and y.
+
+    """
+    return ParsedSurface(function_string, optimize_tree(parse_expression(function_string, ("x", "y")), ("x", "y")))
+
+
+def linear_grid(x_range: Tuple[float, float], x_samples: int) -> np.ndarray:
+    """
+    Create an evenly spaced grid of x values.
+
+    Args:
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        x_samples (int): The number of intervals; the grid holds x_samples + 1 points.
+
+    Returns:
+        np.ndarray: The x values as a float64 array, including both ends of the range.
+
+    """
+    return np.linspace(x_range[0], x_range[1], x_samples + 1, dtype=np.float64)
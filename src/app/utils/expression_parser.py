@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+NUMBER_PATTERN = re.compile(r"(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+NAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z_0-9]*")
+OPERATORS = ("**", "+", "-", "*", "/", "^", "(", ")")
+FUNCTION_PATTERN = re.compile(r"[^;\n]+")
+
+FUNCTIONS: Dict[str, Callable] = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "exp": np.exp,
+    "log": np.log,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+}
+CONSTANTS: Dict[str, float] = {"pi": np.pi, "E": np.e}
+BINARY_OPERATIONS: Dict[str, Callable] = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.true_divide,
+    "^": np.power,
+}
+
+# Binding powers of the operators: '^' binds tighter than unary '-', so -x^2 is -(x^2), and x^-2 is x^(-2).
+ADDITIVE_POWER = 10
+MULTIPLICATIVE_POWER = 20
+UNARY_POWER = 30
+POWER_POWER = 40
+MAX_DEPTH = 200
+BINDING_POWERS = {"+": ADDITIVE_POWER, "-": ADDITIVE_POWER, "*": MULTIPLICATIVE_POWER, "/": MULTIPLICATIVE_POWER,
+                  "^": POWER_POWER}
+
+
+class ExpressionError(ValueError):
+    """
+    An error in an expression, with the position it was found at.
+
+    Attributes:
+        message (str): The description of the error.
+        position (int): The index of the character of the input string the error was found at, the length
+            of the string for an unexpected end.
+
+    """
+
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(f"{message} at column {position + 1}")
+        self.message = message
+        self.position = position
+
+    def __reduce__(self):
+        # Rebuilt from its own arguments, so the error survives the trip back from a worker process.
+        return type(self), (self.message, self.position)
+
+
+class Token(NamedTuple):
+    """
+    A token of an expression.
+
+    Attributes:
+        kind (str): 'number', 'name', the operator itself, such as '+' or '(', or 'end' after the last token.
+        text (str): The text of the token.
+        position (int): The index of the first character of the token in the input string.
+
+    """
+    kind: str
+    text: str
+    position: int
+
+
+class Number(NamedTuple):
+    """A number in an expression tree."""
+    value: float
+
+
+class Variable(NamedTuple):
+    """A variable in an expression tree, such as x or a parameter."""
+    name: str
+
+
+class Negation(NamedTuple):
+    """The negation of an expression."""
+    operand: Node
+
+
+class Operation(NamedTuple):
+    """A binary operation, one of '+', '-', '*', '/' and '^'."""
+    operator: str
+    left: Node
+    right: Node
+
+
+class Call(NamedTuple):
+    """A call of one of FUNCTIONS."""
+    function: str
+    argument: Node
+
+
+Node = Union[Number, Variable, Negation, Operation, Call]
+NODE_TYPES = (Number, Variable, Negation, Operation, Call)
+
+
+def tokenize(text: str, offset: int = 0) -> List[Token]:
+    """
+    Split an expression into tokens, ending with an 'end' token.
+
+    Args:
+        text (str): The expression.
+        offset (int): The position of the expression in a longer input string, added to the token positions.
+
+    Returns:
+        list: The tokens.
+
+    Raises:
+        ExpressionError: If a character cannot start a token.
+
+    """
+    tokens = []
+    position = 0
+    while position < len(text):
+        character = text[position]
+        if character.isspace():
+            position += 1
+            continue
+        match = NUMBER_PATTERN.match(text, position) or NAME_PATTERN.match(text, position)
+        if match:
+            kind = "number" if match.re is NUMBER_PATTERN else "name"
+            tokens.append(Token(kind, match.group(), offset + position))
+            position = match.end()
+            continue
+        operator = next((operator for operator in OPERATORS if text.startswith(operator, position)), None)
+        if operator is None:
+            raise ExpressionError(f"unexpected character {character!r}", offset + position)
+        tokens.append(Token("^" if operator == "**" else operator, operator, offset + position))
+        position += len(operator)
+    tokens.append(Token("end", "", offset + len(text)))
+    return tokens
+
+
+class Parser:
+    """
+    A Pratt parser of the expression language of the plotter.
+
+    Expressions are made of numbers, variables, the constants of CONSTANTS, the functions of FUNCTIONS applied
+    to one argument in parentheses, parentheses, unary '-' and '+', and the binary operators '+', '-', '*', '/'
+    and '^' (also written '**'), with the usual precedences. '^' is right associative. Each operator has a
+    binding power, and an operand is extended with the operators that bind tighter than the operator before it.
+    Trees deeper than MAX_DEPTH are rejected, so thousands of nested parentheses or chained operators raise an
+    ExpressionError rather than exhausting the stack of the parser, the optimizer or the kernel compiler.
+
+    Attributes:
+        tokens (list): The tokens of the expression.
+        variables (frozenset): The names allowed as variables.
+        index (int): The index of the next token.
+        depth (int): A bound on the depth of the subtree being parsed within the whole tree.
+
+    """
+
+    def __init__(self, text: str, variables: Sequence[str] = ("x",), offset: int = 0) -> None:
+        self.tokens = tokenize(text, offset)
+        self.variables = frozenset(variables)
+        self.index = 0
+        self.depth = 0
+
+    def peek(self) -> Token:
+        """Return the next token without consuming it."""
+        return self.tokens[self.index]
+
+    def advance(self) -> Token:
+        """Consume the next token and return it."""
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, kind: str) -> Token:
+        """Consume the next token, which must be of the given kind."""
+        token = self.peek()
+        if token.kind != kind:
+            raise ExpressionError(f"expected {kind!r} but found {describe(token)}", token.position)
+        return self.advance()
+
+    def parse(self) -> Node:
+        """
+        Parse the whole expression.
+
+        Returns:
+            Node: The expression tree.
+
+        Raises:
+            ExpressionError: If the expression is not valid.
+
+        """
+        tree = self.expression(0)
+        token = self.peek()
+        if token.kind != "end":
+            raise ExpressionError(f"expected an operator but found {describe(token)}", token.position)
+        return tree
+
+    def expression(self, binding_power: int) -> Node:
+        """Parse an operand and the operators that bind tighter than binding_power."""
+        depth = self.depth
+        self.deepen()
+        try:
+            tree = self.operand()
+            while self.peek().kind in BINDING_POWERS and BINDING_POWERS[self.peek().kind] > binding_power:
+                # Each operator adds a level above the operand parsed so far.
+                self.deepen()
+                operator = self.advance().kind
+                power = BINDING_POWERS[operator]
+                # Right associativity: the right operand of '^' takes the following '^' operators too.
+                right = self.expression(power - 1 if operator == "^" else power)
+                tree = Operation(operator, tree, right)
+            return tree
+        finally:
+            self.depth = depth
+
+    def deepen(self) -> None:
+        """Count one more level of the tree being parsed, which must not exceed MAX_DEPTH."""
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise ExpressionError(f"the expression is nested more than {MAX_DEPTH} levels deep", self.peek().position)
+
+    def operand(self) -> Node:
+        """Parse a number, a name, a call, a parenthesized expression or a signed operand."""
+        token = self.advance()
+        if token.kind == "number":
+            return Number(float(token.text))
+        if token.kind == "name":
+            if token.text in FUNCTIONS:
+                self.expect("(")
+                argument = self.expression(0)
+                self.expect(")")
+                return Call(token.text, argument)
+            if token.text in CONSTANTS:
+                return Number(CONSTANTS[token.text])
+            if token.text in self.variables:
+                return Variable(token.text)
+            raise ExpressionError(f"unknown name {token.text!r}", token.position)
+        if token.kind == "(":
+            tree = self.expression(0)
+            self.expect(")")
+            return tree
+        if token.kind in ("-", "+"):
+            operand = self.expression(UNARY_POWER)
+            return Negation(operand) if token.kind == "-" else operand
+        raise ExpressionError(f"expected a number, a name or '(' but found {describe(token)}", token.position)
+
+
+def describe(token: Token) -> str:
+    """Describe a token in an error message, such as "')'" or 'the end'."""
+    return "the end" if token.kind == "end" else repr(token.text)
+
+
+def parse_expression(text: str, variables: Sequence[str] = ("x",), offset: int = 0) -> Node:
+    """
+    Parse an expression into a tree.
+
+    Args:
+        text (str): The expression.
+        variables (Sequence[str]): The names allowed as variables.
+        offset (int): The position of the expression in a longer input string, added to error positions.
+
+    Returns:
+        Node: The expression tree.
+
+    Raises:
+        ExpressionError: If the expression is not valid.
+
+    """
+    return Parser(text, variables, offset).parse()
+
+
+def parse_functions(function_string: str, variables: Sequence[str] = ("x",)) -> List[Node]:
+    """
+    Parse an input holding one function or several, one per line or separated by ';'.
+
+    Args:
+        function_string (str): The input function string.
+        variables (Sequence[str]): The names allowed as variables.
+
+    Returns:
+        list: The tree of each function.
+
+    Raises:
+        ExpressionError: If a function is not valid or there is none, with its position in function_string.
+
+    """
+    trees = [parse_expression(match.group(), variables, match.start())
+             for match in FUNCTION_PATTERN.finditer(function_string) if match.group().strip()]
+    if not trees:
+        raise ExpressionError("expected a function", len(function_string))
+    return trees
+
+
+Instruction = Tuple[Callable, Tuple[int, ...]]
+
+
+class Kernel:
+    """
+    Expression trees compiled into a chain of NumPy ufunc calls.
+
+    Each distinct subtree is computed once per call, also when it is shared by several trees, and subtrees
+    without variables are computed once when compiling. Small integer powers and the power 0.5 are computed
+    with multiplications, np.square and np.sqrt, which are faster than np.power.
+
+    A kernel built from one tree returns one value, and a kernel built from a sequence of trees returns a list
+    of values, like sympy.lambdify. Values that do not depend on the variables are returned as scalars.
+
+    Attributes:
+        variables (tuple): The names of the variables, in the order of the arguments.
+        instructions (list): The ufunc and the registers of the arguments of each step.
+        constants (list): The values of the registers computed when compiling.
+        outputs (list): The register holding the value of each tree.
+
+    """
+
+    def __init__(self, trees: Union[Node, Sequence[Node]], variables: Sequence[str] = ("x",)) -> None:
+        self.single = isinstance(trees, NODE_TYPES)
+        self.variables = tuple(variables)
+        self.constants: List[Optional[float]] = [None] * len(self.variables)
+        self.instructions: List[Instruction] = []
+        self.registers: Dict[Tuple[type, Node], int] = {}
+        with np.errstate(all="ignore"):
+            self.outputs = [self.compile(tree) for tree in ([trees] if self.single else trees)]
+        del self.registers
+
+    def emit(self, function: Callable, *arguments: int) -> int:
+        """Add a step, or compute it right away if its arguments are constants, and return its register."""
+        values = [self.constants[argument] for argument in arguments]
+        self.constants.append(float(function(*values)) if None not in values else None)
+        self.instructions.append((function, arguments))
+        return len(self.constants) - 1
+
+    def constant(self, value: float) -> int:
+        """Return a register holding a constant."""
+        self.constants.append(value)
+        self.instructions.append((float, ()))
+        return len(self.constants) - 1
+
+    def compile(self, tree: Node) -> int:
+        """Compile a tree, reusing the register of an equal tree compiled before, and return its register."""
+        key = type(tree), tree
+        if key not in self.registers:
+            self.registers[key] = self.compile_node(tree)
+        return self.registers[key]
+
+    def compile_node(self, tree: Node) -> int:
+        """Compile the steps computing a tree and return the register of its value."""
+        if isinstance(tree, Number):
+            return self.constant(tree.value)
+        if isinstance(tree, Variable):
+            return self.variables.index(tree.name)
+        if isinstance(tree, Negation):
+            return self.emit(np.negative, self.compile(tree.operand))
+        if isinstance(tree, Call):
+            return self.emit(FUNCTIONS[tree.function], self.compile(tree.argument))
+        if tree.operator == "^" and isinstance(tree.right, Number):
+            return self.compile_power(tree.left, tree.right.value)
+        return self.emit(BINARY_OPERATIONS[tree.operator], self.compile(tree.left), self.compile(tree.right))
+
+    def compile_power(self, base: Node, exponent: float) -> int:
+        """Compile a power with a constant exponent, with multiplications for small integer exponents."""
+        register = self.compile(base)
+        if exponent == 0.5:
+            return self.emit(np.sqrt, register)
+        if exponent == 2:
+            return self.emit(np.square, register)
+        if exponent == 3:
+            return self.emit(np.multiply, self.emit(np.square, register), register)
+        if exponent == 4:
+            return self.emit(np.square, self.emit(np.square, register))
+        return self.emit(np.power, register, self.constant(exponent))
+
+    @property
+    def steps(self) -> int:
+        """The number of ufunc calls of each evaluation, leaving out the values computed when compiling."""
+        return sum(constant is None for constant in self.constants[len(self.variables):])
+
+    def __call__(self, *arguments):
+        """
+        Evaluate the trees for the given values of the variables.
+
+        Args:
+            *arguments: The value of each variable, arrays or scalars.
+
+        Returns:
+            The value of the tree, or the list of the values of the trees.
+
+        """
+        registers: List = list(arguments)
+        constants = self.constants
+        for index in range(len(registers), len(constants)):
+            if constants[index] is not None:
+                registers.append(constants[index])
+            else:
+                function, operands = self.instructions[index - len(arguments)]
+                registers.append(function(*[registers[operand] for operand in operands]))
+        values = [registers[output] for output in self.outputs]
+        return values[0] if self.single else values
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from app.utils.constants import INSTRUMENTATION_ENV, TRACE_LOG_ENV
+
+
+class Trace:
+    """
+    The timings and counters of one operation, such as drawing a plot, across all its stages.
+
+    A trace collects the time spent in each named stage and the value of each named counter.
+    Its stages may run on different threads, for example validation on the GUI thread and
+    sampling on the evaluation worker.
+
+    Attributes:
+        name (str): The name of the operation.
+        started (float): The wall clock time the operation started at.
+        stages (dict): The seconds spent in each stage, in the order the stages first ran.
+        counters (dict): The value of each counter.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.time()
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.marks: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add the seconds spent in a stage."""
+        with self.lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_count(self, counter: str, value: int) -> None:
+        """Add a value to a counter."""
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def mark(self, stage: str) -> None:
+        """Remember the start of a stage that ends in another call, see end()."""
+        self.marks[stage] = time.perf_counter()
+
+    def end(self, stage: str) -> None:
+        """Record the time since the stage was marked with mark()."""
+        start = self.marks.pop(stage, None)
+        if start is not None:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the trace as a JSON serializable dict, with the stage times in milliseconds."""
+        return {
+            "name": self.name,
+            "started": self.started,
+            "stages_ms": {stage: seconds * 1000 for stage, seconds in self.stages.items()},
+            "total_ms": sum(self.stages.values()) * 1000,
+            "counters": dict(self.counters),
+        }
+
+    def summary(self) -> str:
+        """
+        Describe the trace in one line, such as 'draw: parse 3.1 ms | sample 0.4 ms | 101 samples'.
+
+        Returns:
+            str: The summary of the trace.
+
+        """
+        parts = [f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in self.stages.items()]
+        parts += [f"{value} {counter}" for counter, value in self.counters.items()]
+        return f"{self.name}: " + " | ".join(parts)
+
+
+class StageTimer:
+    """Context manager adding the time spent in its block to a stage of a trace."""
+
+    def __init__(self, trace: Trace, stage: str) -> None:
+        self.trace = trace
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self) -> StageTimer:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.trace.add_time(self.stage, time.perf_counter() - self.start)
+
+
+class NullTimer:
+    """Context manager doing nothing, used for stages that run outside of a trace."""
+
+    def __enter__(self) -> NullTimer:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class Instrumentation:
+    """
+    A lightweight instrumentation layer of stage timers and counters.
+
+    An operation starts a trace with begin(). Code that runs on behalf of the operation activates
+    the trace on its thread with activate() or call(), and the stages and counters it reports with
+    stage() and count() are added to the active trace. Outside of an active trace, or when the
+    instrumentation is disabled, stage() returns a shared no-op context manager and count() returns
+    right away, so instrumented code costs next to nothing.
+
+    Finished traces are kept as the last trace and, if a log path is set, appended to it as JSON lines.
+
+    Attributes:
+        enabled (bool): Whether traces are recorded.
+        log_path (str): The JSON lines file finished traces are appended to, None to not log them.
+        last (Trace): The last finished trace.
+
+    """
+
+    def __init__(self, enabled: bool = True, log_path: Optional[str] = None) -> None:
+        self.enabled = enabled
+        self.log_path = log_path
+        self.last: Optional[Trace] = None
+        self.local = threading.local()
+        self.log_lock = threading.Lock()
+
+    def begin(self, name: str) -> Optional[Trace]:
+        """
+        Start the trace of an operation.
+
+        Args:
+            name (str): The name of the operation.
+
+        Returns:
+            Trace: The new trace, or None if the instrumentation is disabled.
+
+        """
+        return Trace(name) if self.enabled else None
+
+    def active(self) -> Optional[Trace]:
+        """Return the trace active on the calling thread, None if there is none."""
+        return getattr(self.local, "trace", None)
+
+    @contextmanager
+    def activate(self, trace: Optional[Trace]) -> Iterator[Optional[Trace]]:
+        """
+        Make a trace the active trace of the calling thread within the block.
+
+        Args:
+            trace (Trace): The trace to activate, None to run the block outside of a trace.
+
+        """
+        previous = self.active()
+        self.local.trace = trace
+        try:
+            yield trace
+        finally:
+            self.local.trace = previous
+
+    def call(self, trace: Optional[Trace], function: Callable, *args: Any) -> Any:
+        """
+        Call a function with a trace active, used to run jobs on the evaluation worker.
+
+        Args:
+            trace (Trace): The trace to activate.
+            function (Callable): The function to call.
+            *args: The arguments of the function.
+
+        Returns:
+            The return value of the function.
+
+        """
+        with self.activate(trace):
+            return function(*args)
+
+    def iterate(self, trace: Optional[Trace], function: Callable[..., Iterator], *args: Any) -> Iterator:
+        """
+        Iterate a generator function with a trace active, used to run progressive jobs on the evaluation worker.
+
+        Args:
+            trace (Trace): The trace to activate.
+            function (Callable): The generator function.
+            *args: The arguments of the function.
+
+        Yields:
+            The values yielded by the function.
+
+        """
+        with self.activate(trace):
+            yield from function(*args)
+
+    def stage(self, stage: str):
+        """
+        Time a block as a stage of the active trace.
+
+        Args:
+            stage (str): The name of the stage.
+
+        Returns:
+            A context manager timing its block.
+
+        """
+        trace = getattr(self.local, "trace", None)
+        if trace is None:
+            return NULL_TIMER
+        return StageTimer(trace, stage)
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """
+        Add a value to a counter of the active trace.
+
+        Args:
+            counter (str): The name of the counter.
+            value (int): The value to add.
+
+        """
+        trace = getattr(self.local, "trace", None)
+        if trace is not None:
+            trace.add_count(counter, value)
+
+    def finish(self, trace: Optional[Trace]) -> None:
+        """
+        Finish a trace, keeping it as the last trace and logging it if a log path is set.
+
+        Args:
+            trace (Trace): The trace to finish.
+
+        """
+        if trace is None:
+            return
+        self.last = trace
+        if self.log_path:
+            line = json.dumps(trace.as_dict())
+            with self.log_lock, open(self.log_path, "a", encoding="utf-8") as log:
+                log.write(line + "\n")
+
+
+instrumentation = Instrumentation(enabled=os.environ.get(INSTRUMENTATION_ENV, "1") != "0",
+                                  log_path=os.environ.get(TRACE_LOG_ENV) or None)
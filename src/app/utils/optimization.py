@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.constants import OPTIMIZATION_TIME_BUDGET
+from app.utils.expression_parser import Call, Kernel, Negation, Node, Number, Operation, Variable
+
+if TYPE_CHECKING:
+    import sympy
+
+logger = logging.getLogger(__name__)
+
+
+def fold_constants(expression: sympy.Expr) -> sympy.Expr:
+    """
+    Replace the subexpressions that do not depend on any variable with their numeric value.
+
+    sympy already combines exact numbers when parsing, so 2*3*x becomes 6*x, but keeps constants such
+    as sqrt(2) or sin(1) symbolic, and the kernel would compute them on every call. Constants that are
+    not real numbers, such as log(-1), are left as they are.
+
+    Args:
+        expression (sympy.Expr): The parsed expression.
+
+    Returns:
+        sympy.Expr: The expression with its constant subexpressions evaluated.
+
+    """
+    def is_foldable(subexpression) -> bool:
+        return not subexpression.is_Atom and not subexpression.free_symbols and subexpression.evalf().is_Number
+
+    # 17 significant digits, so the constant printed into the kernel rounds to the nearest float64.
+    return expression.replace(is_foldable, lambda subexpression: subexpression.evalf(17))
+
+
+def kernel_operations(expressions: Sequence[sympy.Expr]) -> int:
+    """
+    Count the operations a kernel generated with common subexpression elimination performs per evaluation.
+
+    Args:
+        expressions (Sequence): The expressions evaluated by the kernel.
+
+    Returns:
+        int: The operations of the shared subexpressions, counted once, and of the reduced expressions.
+
+    """
+    import sympy
+    replacements, reduced = sympy.cse(list(expressions))
+    return sum(sympy.count_ops(value) for _, value in replacements) + sum(sympy.count_ops(value) for value in reduced)
+
+
+def optimize_expression(expression: sympy.Expr, time_budget: float = OPTIMIZATION_TIME_BUDGET) -> sympy.Expr:
+    """
+    Rewrite a parsed expression into an equivalent one that is cheaper to evaluate.
+
+    Constants are folded first, see fold_constants(), then cheap simplifications are tried in turn, combining
+    powers of the same base and pulling out common factors, and a result is kept only if it has fewer
+    operations. A simplification is not started once time_budget seconds have passed, so long pasted
+    expressions are not held up by sympy; full simplify() is never tried, as it often takes hundreds of
+    milliseconds for no gain. Shared subterms are eliminated later by lambdify(cse=True), so the kernel
+    computes each of them once per evaluation.
+
+    The operation counts before and after, including common subexpression elimination, are logged at the
+    debug level of this module's logger.
+
+    Args:
+        expression (sympy.Expr): The parsed expression.
+        time_budget (float): The seconds after which no further simplification is started.
+
+    Returns:
+        sympy.Expr: The optimized expression.
+
+    """
+    import sympy
+    start = time.perf_counter()
+    optimized = fold_constants(expression)
+    operations = sympy.count_ops(optimized)
+    for simplification in (sympy.powsimp, sympy.factor_terms):
+        if time.perf_counter() - start > time_budget:
+            break
+        candidate = simplification(optimized)
+        candidate_operations = sympy.count_ops(candidate)
+        if candidate_operations < operations:
+            optimized, operations = candidate, candidate_operations
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("optimized %s to %s: %d operations before, %d after, in %.1f ms", expression, optimized,
+                     sympy.count_ops(expression), kernel_operations([optimized]), (time.perf_counter() - start) * 1000)
+    return optimized
+
+
+Terms = Dict[Tuple[type, Node], float]
+
+
+def simplify_tree(tree: Node) -> Node:
+    """
+    Simplify an expression tree with cheap algebraic rewrites, without sympy.
+
+    Sums are flattened into terms, and equal terms are added up, so x + 2*x becomes 3*x. A sum in
+    parentheses is kept whole unless it shares a term with the enclosing sum, so the kernel can still
+    compute it once where it is repeated, as in 1/(x^2+1) + (x^2+1). Products and quotients are
+    flattened into factors, and the integer powers of equal factors are combined, so u*u/u^3 becomes
+    1/u. Numbers are folded along the way. Like sympy, the rewrites cancel terms and factors even where
+    they are undefined, so x/x becomes 1.
+
+    Args:
+        tree (Node): The expression tree.
+
+    Returns:
+        Node: The simplified tree.
+
+    """
+    if isinstance(tree, (Number, Variable)):
+        return tree
+    if isinstance(tree, Call):
+        return Call(tree.function, simplify_tree(tree.argument))
+    if isinstance(tree, Negation) or tree.operator in ("+", "-"):
+        terms: Terms = {}
+        constant = collect_terms(tree, 1.0, terms)
+        return build_sum(terms, constant)
+    if tree.operator == "^" and not is_integer(tree.right):
+        base, exponent = simplify_tree(tree.left), simplify_tree(tree.right)
+        if isinstance(base, Number) and isinstance(exponent, Number):
+            return Number(fold(np.power, base.value, exponent.value))
+        return Operation("^", base, exponent)
+    factors: Terms = {}
+    coefficient = collect_factors(tree, 1, factors)
+    return build_product(factors, coefficient)
+
+
+def is_integer(tree: Node) -> bool:
+    """Tell whether a tree is an integer number."""
+    return isinstance(tree, Number) and float(tree.value).is_integer()
+
+
+def fold(function, *values: float) -> float:
+    """Apply a NumPy function to numbers, giving inf or NaN rather than raising where it is undefined."""
+    with np.errstate(all="ignore"):
+        return float(function(*values))
+
+
+def collect_terms(tree: Node, sign: float, terms: Terms) -> float:
+    """
+    Add the terms of a sum to a mapping of each term to its coefficient.
+
+    Args:
+        tree (Node): The sum, or a term.
+        sign (float): The sign the sum is added with.
+        terms (dict): The coefficient of each term, keyed by the type and the tree of the term.
+
+    Returns:
+        float: The sum of the numbers among the terms, see simplify_tree().
+
+    """
+    if isinstance(tree, Negation):
+        return collect_terms(tree.operand, -sign, terms)
+    if isinstance(tree, Operation) and tree.operator in ("+", "-"):
+        right_sign = sign if tree.operator == "+" else -sign
+        constant = collect_terms(tree.left, sign, terms)
+        if not (isinstance(tree.right, Operation) and tree.right.operator in ("+", "-")):
+            return constant + collect_terms(tree.right, right_sign, terms)
+        inner: Terms = {}
+        inner_constant = collect_terms(tree.right, 1.0, inner)
+        if terms.keys() & inner.keys():
+            for key, coefficient in inner.items():
+                terms[key] = terms.get(key, 0.0) + right_sign * coefficient
+            return constant + right_sign * inner_constant
+        return constant + add_term(build_sum(inner, inner_constant), right_sign, terms)
+    return add_term(tree, sign, terms)
+
+
+def add_term(tree: Node, sign: float, terms: Terms) -> float:
+    """
+    Simplify a term of a sum and add it to a mapping of each term to its coefficient, see collect_terms().
+
+    Args:
+        tree (Node): The term.
+        sign (float): The sign the term is added with.
+        terms (dict): The coefficient of each term, keyed by the type and the tree of the term.
+
+    Returns:
+        float: The value of the term if it is a number, 0 otherwise.
+
+    """
+    term = simplify_tree(tree)
+    if isinstance(term, Number):
+        return sign * term.value
+    coefficient = 1.0
+    if isinstance(term, Operation) and term.operator == "*" and isinstance(term.left, Number):
+        coefficient, term = term.left.value, term.right
+    elif isinstance(term, Negation):
+        coefficient, term = -1.0, term.operand
+    key = type(term), term
+    terms[key] = terms.get(key, 0.0) + sign * coefficient
+    return 0.0
+
+
+def build_sum(terms: Terms, constant: float) -> Node:
+    """Build the tree of a sum from the coefficient of each term and a number, see collect_terms()."""
+    pieces: List[Tuple[float, Node]] = [(coefficient, term) for (_, term), coefficient in terms.items() if coefficient != 0]
+    if constant != 0 or not pieces:
+        pieces.append((constant, Number(abs(constant))))
+    tree = None
+    for coefficient, term in pieces:
+        if not isinstance(term, Number) and abs(coefficient) != 1:
+            term = Operation("*", Number(abs(coefficient)), term)
+        if tree is None:
+            tree = term if coefficient >= 0 else Negation(term)
+        else:
+            tree = Operation("+" if coefficient >= 0 else "-", tree, term)
+    return tree
+
+
+def collect_factors(tree: Node, exponent: int, factors: Terms) -> float:
+    """
+    Add the factors of a product to a mapping of each factor to its integer exponent.
+
+    Args:
+        tree (Node): The product, or a factor.
+        exponent (int): The integer exponent the product is raised to.
+        factors (dict): The exponent of each factor, keyed by the type and the tree of the factor.
+
+    Returns:
+        float: The product of the numbers among the factors, raised to their exponents.
+
+    """
+    if isinstance(tree, Operation) and tree.operator in ("*", "/"):
+        right_exponent = exponent if tree.operator == "*" else -exponent
+        return collect_factors(tree.left, exponent, factors) * collect_factors(tree.right, right_exponent, factors)
+    if isinstance(tree, Operation) and tree.operator == "^" and is_integer(tree.right):
+        return collect_factors(tree.left, exponent * int(tree.right.value), factors)
+    if isinstance(tree, Negation):
+        return (-1.0) ** exponent * collect_factors(tree.operand, exponent, factors)
+    factor = simplify_tree(tree)
+    if isinstance(factor, Number):
+        return fold(np.power, factor.value, float(exponent))
+    if isinstance(factor, Operation) and factor.operator in ("*", "/") or isinstance(factor, Negation):
+        return collect_factors(factor, exponent, factors)
+    key = type(factor), factor
+    factors[key] = factors.get(key, 0) + exponent
+    return 1.0
+
+
+def build_product(factors: Terms, coefficient: float) -> Node:
+    """Build the tree of a product from the exponent of each factor and a number, see collect_factors()."""
+    if coefficient == 0:
+        return Number(0.0)
+    numerator: List[Node] = [Number(abs(coefficient))] if abs(coefficient) != 1 else []
+    denominator: List[Node] = []
+    for (_, factor), exponent in factors.items():
+        if exponent:
+            power = factor if abs(exponent) == 1 else Operation("^", factor, Number(float(abs(exponent))))
+            (numerator if exponent > 0 else denominator).append(power)
+    tree = chain("*", numerator) if numerator else Number(1.0)
+    if denominator:
+        tree = Operation("/", tree, chain("*", denominator))
+    return Negation(tree) if coefficient < 0 else tree
+
+
+def chain(operator: str, operands: Sequence[Node]) -> Node:
+    """Join operands with a binary operator, from left to right."""
+    tree = operands[0]
+    for operand in operands[1:]:
+        tree = Operation(operator, tree, operand)
+    return tree
+
+
+def optimize_tree(tree: Node, variables: Sequence[str] = ("x",)) -> Node:
+    """
+    Simplify an expression tree before it is compiled into a kernel, see simplify_tree().
+
+    The simplified tree is kept only if its kernel takes fewer steps. The pass takes microseconds, so
+    unlike optimize_expression() it needs no time budget and keeps sympy out of plotting. The steps of
+    the kernels before and after are logged at the debug level of this module's logger.
+
+    Args:
+        tree (Node): The parsed expression tree.
+        variables (Sequence[str]): The names of the variables of the tree.
+
+    Returns:
+        Node: The optimized tree.
+
+    """
+    start = time.perf_counter()
+    simplified = simplify_tree(tree)
+    steps, simplified_steps = Kernel(tree, variables).steps, Kernel(simplified, variables).steps
+    optimized = simplified if simplified_steps < steps else tree
+    logger.debug("optimized %s: %d kernel steps before, %d after, in %.1f ms", tree, steps, min(steps, simplified_steps),
+                 (time.perf_counter() - start) * 1000)
+    return optimized
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.utils.constants import EVALUATION_THREADS_ENV, PARALLEL_CHUNK_SAMPLES, PARALLEL_MIN_SAMPLES
+
+Function = Callable[[np.ndarray], np.ndarray]
+
+
+class ParallelEvaluator:
+    """
+    Evaluates a vectorized function over a large array of x values in chunks on a thread pool.
+
+    NumPy releases the GIL inside its ufuncs, so the chunks of a compiled kernel run on several cores
+    at once. Each chunk writes its values straight into its slice of one preallocated output array,
+    so no chunk results are concatenated afterwards. Arrays smaller than min_samples, and every array
+    when a single thread is configured, are evaluated in one call on the calling thread.
+
+    The thread pool is separate from the pool of the evaluation worker, so a job running on the
+    evaluation worker can wait for its chunks without starving the pool it runs on.
+
+    Attributes:
+        threads (int): The number of threads the chunks are evaluated on.
+        chunk_samples (int): The number of x values per chunk.
+        min_samples (int): The smallest number of x values evaluated in parallel.
+
+    """
+
+    def __init__(self, threads: Optional[int] = None, chunk_samples: int = PARALLEL_CHUNK_SAMPLES,
+                 min_samples: int = PARALLEL_MIN_SAMPLES) -> None:
+        self.threads = max(threads or os.cpu_count() or 1, 1)
+        self.chunk_samples = chunk_samples
+        self.min_samples = min_samples
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.lock = threading.Lock()
+
+    def set_threads(self, threads: int) -> None:
+        """
+        Change the number of threads, replacing the thread pool on its next use.
+
+        Args:
+            threads (int): The number of threads, 1 to always evaluate on the calling thread.
+
+        """
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.executor = None
+            self.threads = max(threads, 1)
+
+    def pool(self) -> ThreadPoolExecutor:
+        """Return the thread pool, creating it on first use."""
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="evaluation-chunk")
+            return self.executor
+
+    def __call__(self, function: Function, x_data: np.ndarray) -> np.ndarray:
+        """
+        Evaluate a function over an array of x values, in parallel chunks if the array is large enough.
+
+        Args:
+            function (Callable): The vectorized function of x, returning one value per x value or
+                one row of values per curve, such as a FunctionGroup.
+            x_data (np.ndarray): The x values.
+
+        Returns:
+            np.ndarray: The values of the function, the same as function(x_data).
+
+        """
+        if self.threads < 2 or x_data.size < max(self.min_samples, 2 * self.chunk_samples):
+            return function(x_data)
+
+        starts = range(0, x_data.size, self.chunk_samples)
+        first = function(x_data[:self.chunk_samples])
+        y_data = np.empty(first.shape[:-1] + x_data.shape, dtype=first.dtype)
+        y_data[..., :self.chunk_samples] = first
+
+        def evaluate_chunk(start: int) -> None:
+            stop = start + self.chunk_samples
+            y_data[..., start:stop] = function(x_data[start:stop])
+
+        for _ in self.pool().map(evaluate_chunk, starts[1:]):
+            pass
+        return y_data
+
+
+parallel_evaluator = ParallelEvaluator(int(os.environ.get(EVALUATION_THREADS_ENV) or 0) or None)
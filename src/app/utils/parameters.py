@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.utils.constants import PARAMETER_DEFAULT, PARAMETER_MAX, PARAMETER_MIN, PARAMETER_NAMES, PARAMETER_STEPS, \
+    TIME_PARAMETER
+from app.utils.evaluation import real_values
+from app.utils.expression_parser import NAME_PATTERN, Kernel, Node, parse_functions
+from app.utils.optimization import optimize_tree
+
+
+def find_parameters(function_string: str) -> List[str]:
+    """
+    List the free parameters of a function string, such as a and b in 'a*sin(b*x)'.
+
+    Parameters are the single letter names of PARAMETER_NAMES. The string is only scanned for names,
+    not parsed, so this is cheap enough to run on every keystroke.
+
+    Args:
+        function_string (str): The input function string.
+
+    Returns:
+        list: The parameters of the function string, in the order of PARAMETER_NAMES.
+
+    """
+    names = set(NAME_PATTERN.findall(function_string))
+    return [name for name in PARAMETER_NAMES if name in names]
+
+
+def substitute_parameters(function_string: str, values: Dict[str, float]) -> str:
+    """
+    Replace the parameters of a function string with their values, giving a plain function of x.
+
+    Args:
+        function_string (str): The input function string.
+        values (dict): The value of each parameter.
+
+    Returns:
+        str: The function string with each parameter replaced by its value in parentheses.
+
+    """
+    def value_of(match: re.Match) -> str:
+        name = match.group(0)
+        return f"({values[name]!r})" if name in values else name
+
+    return NAME_PATTERN.sub(value_of, function_string)
+
+
+def default_value(name: str) -> float:
+    """Return the starting value of a parameter, 0 for the time parameter and PARAMETER_DEFAULT for the others."""
+    return 0.0 if name == TIME_PARAMETER else PARAMETER_DEFAULT
+
+
+def bind_parameters(function_string: str, values: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Replace the parameters of a function string with the given values, or their starting values, see default_value().
+
+    Args:
+        function_string (str): The input function string.
+        values (Mapping): The values of some or all of the parameters, as numbers or as strings.
+
+    Returns:
+        str: The function string without parameters.
+
+    Raises:
+        ValueError: If a value is not a number.
+
+    """
+    values = values or {}
+    try:
+        bound = {name: float(values.get(name, default_value(name))) for name in find_parameters(function_string)}
+    except TypeError as error:
+        raise ValueError(f"invalid parameter value: {error}") from error
+    return substitute_parameters(function_string, bound) if bound else function_string
+
+
+def slider_position(value: float) -> int:
+    """Return the position of a parameter slider of PARAMETER_STEPS steps showing a value."""
+    return round((value - PARAMETER_MIN) / (PARAMETER_MAX - PARAMETER_MIN) * PARAMETER_STEPS)
+
+
+def slider_value(position: int) -> float:
+    """Return the value of a parameter shown by a slider position, see slider_position()."""
+    return PARAMETER_MIN + position * (PARAMETER_MAX - PARAMETER_MIN) / PARAMETER_STEPS
+
+
+class ParametricFunction:
+    """
+    Parsed functions of x and free parameters compiled into one NumPy kernel.
+
+    Animating a parameter evaluates the same functions over the same x values with new parameter values
+    on every frame. The kernel takes the parameters as scalar arguments after x, so a frame costs one
+    vectorized pass over the x values, without parsing or compiling anything.
+
+    Attributes:
+        trees (list): The parsed expression tree of each function.
+        parameters (list): The names of the parameters, in the order the kernel takes them.
+        kernel (Kernel): The NumPy kernel returning the values of all the functions.
+
+    """
+
+    def __init__(self, trees: Sequence[Node], parameters: Sequence[str]) -> None:
+        self.trees = list(trees)
+        self.parameters = list(parameters)
+        self.kernel = Kernel(self.trees, ["x"] + self.parameters)
+
+    def __call__(self, x_data: np.ndarray, values: Dict[str, float]) -> np.ndarray:
+        """
+        Evaluate the functions over an array of x values for the given parameter values.
+
+        Args:
+            x_data (np.ndarray): The x values.
+            values (dict): The value of each parameter.
+
+        Returns:
+            np.ndarray: The y values as a float64 array, with one row per function for several functions.
+                Points where a function is undefined or not real are NaN.
+
+        """
+        x_data = np.asarray(x_data, dtype=np.float64)
+        with np.errstate(all="ignore"):
+            rows = self.kernel(x_data, *(values[name] for name in self.parameters))
+        y_data = np.stack([real_values(row, x_data.shape) for row in rows])
+        return y_data[0] if len(self.trees) == 1 else y_data
+
+
+def compile_parametric(function_string: str) -> ParametricFunction:
+    """
+    Parse a function string with free parameters and compile it for animation.
+
+    The parsed trees are simplified first, see app.utils.optimization.optimize_tree().
+
+    Args:
+        function_string (str): The input function string, holding one function or several.
+
+    Returns:
+        ParametricFunction: The compiled functions of x and of the parameters of the string.
+
+    """
+    parameters = find_parameters(function_string)
+    variables = ["x"] + parameters
+    trees = [optimize_tree(tree, variables) for tree in parse_functions(function_string, variables)]
+    return ParametricFunction(trees, parameters)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+from app.utils.cache import normalize_function_string
+from app.utils.constants import PREVIEW_MAX_SAMPLES
+from app.utils.progressive import grid_intervals
+from app.utils.sampling_mode import SamplingMode
+
+Inputs = Tuple[str, Tuple[float, float], int, SamplingMode]
+
+
+def preview_inputs(inputs: Inputs, max_samples: int = PREVIEW_MAX_SAMPLES) -> Inputs:
+    """
+    Reduce the inputs of a plot to a cheap uniform sampling for the live preview.
+
+    The preview samples a uniform grid of at most max_samples intervals, so each keystroke costs about
+    the same however many samples the full plot takes. Adaptive sampling is previewed on the uniform grid
+    of the same number of samples, and high resolution sampling on a grid of max_samples intervals.
+
+    Args:
+        inputs (tuple): The function_string, x_range, samples and sampling_mode of the full plot.
+        max_samples (int): The maximum number of intervals of the preview grid.
+
+    Returns:
+        tuple: The function_string, x_range, samples and sampling_mode of the preview.
+
+    """
+    function_string, x_range, samples, sampling_mode = inputs
+    return function_string, x_range, min(grid_intervals(samples, sampling_mode), max_samples), SamplingMode.UNIFORM
+
+
+def preview_key(inputs: Inputs) -> tuple:
+    """
+    Return a key telling whether two inputs plot the same thing, so edits such as spaces are not previewed again.
+
+    Args:
+        inputs (tuple): The function_string, x_range, samples and sampling_mode of a plot.
+
+    Returns:
+        tuple: The inputs with the function string normalized.
+
+    """
+    return (normalize_function_string(inputs[0]),) + tuple(inputs[1:])
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.cache import expression_cache
+from app.utils.constants import HIGH_RESOLUTION_FACTOR, PROGRESSIVE_COARSE_SAMPLES, PROGRESSIVE_MIN_SAMPLES
+from app.utils.decimation import minmax_decimate
+from app.utils.discontinuities import break_discontinuities
+from app.utils.disk_cache import disk_cache
+from app.utils.evaluation import linear_grid
+from app.utils.instrumentation import instrumentation
+from app.utils.parallel import parallel_evaluator
+from app.utils.sampling_mode import SamplingMode
+
+Pass = Tuple[np.ndarray, np.ndarray, bool]
+
+
+def grid_intervals(x_samples: int, sampling_mode: SamplingMode) -> int:
+    """
+    Return the number of intervals of the uniform grid a sampling mode evaluates.
+
+    Args:
+        x_samples (int): The number of x samples.
+        sampling_mode (SamplingMode): The way of choosing the x samples.
+
+    Returns:
+        int: The number of intervals of the grid.
+
+    """
+    if sampling_mode == SamplingMode.HIGH_RESOLUTION:
+        return x_samples * HIGH_RESOLUTION_FACTOR
+    return x_samples
+
+
+def is_progressive(x_samples: int, sampling_mode: SamplingMode) -> bool:
+    """
+    Decide whether a plot is worth drawing progressively.
+
+    Uniform grids of at least PROGRESSIVE_MIN_SAMPLES samples are drawn progressively. Adaptive sampling
+    chooses its points from the values it has seen, so it is always evaluated in one go.
+
+    Args:
+        x_samples (int): The number of x samples.
+        sampling_mode (SamplingMode): The way of choosing the x samples.
+
+    Returns:
+        bool: True if the plot should be drawn progressively.
+
+    """
+    return sampling_mode != SamplingMode.ADAPTIVE and grid_intervals(x_samples, sampling_mode) >= PROGRESSIVE_MIN_SAMPLES
+
+
+def progressive_strides(intervals: int, coarse_samples: int = PROGRESSIVE_COARSE_SAMPLES) -> List[int]:
+    """
+    Choose the strides of the passes over a grid, from coarse to fine.
+
+    The first pass takes every stride-th point of the grid, with the largest power of two stride that
+    still gives at least coarse_samples intervals, and each following pass halves the stride down to 1.
+
+    Args:
+        intervals (int): The number of intervals of the full grid.
+        coarse_samples (int): The minimum number of intervals of the first pass.
+
+    Returns:
+        list: The stride of each pass, the last one being 1.
+
+    """
+    stride = 1
+    while intervals // (stride * 2) >= coarse_samples:
+        stride *= 2
+    strides = []
+    while stride >= 1:
+        strides.append(stride)
+        stride //= 2
+    return strides
+
+
+def sample_progressive(n_bins: int, function_string: str, x_range: Tuple[float, float], x_samples: int,
+                       sampling_mode: SamplingMode = SamplingMode.UNIFORM) -> Iterator[Pass]:
+    """
+    Sample a function in passes from a coarse grid to the full grid, yielding each pass decimated.
+
+    The passes are nested subsets of the full uniform grid: each pass evaluates only the points
+    halfway between those of the previous pass, so the whole sequence evaluates every point once,
+    as much work as sampling the full grid in one go. The first pass is small enough to be drawn
+    right away, and the last pass holds the full grid, the same samples as parse_2d_function.
+    Each pass is broken at the discontinuities of the curves before it is decimated, see
+    app.utils.discontinuities.
+    A full grid found in the on-disk cache is yielded at once as the only pass, and a full grid
+    evaluated here is stored in it.
+
+    Args:
+        n_bins (int): The number of bins the passes are decimated to, see minmax_decimate.
+        function_string (str): The input function string.
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        x_samples (int): The number of x samples.
+        sampling_mode (SamplingMode): The way of choosing the x samples.
+
+    Yields:
+        tuple: The decimated x data and y data of the pass, and whether it is the last pass.
+
+    """
+    cached = disk_cache.load(function_string, x_range, x_samples, sampling_mode)
+    if cached is not None:
+        with instrumentation.stage("decimate"):
+            x_pass, y_pass = minmax_decimate(cached[0], cached[1], n_bins)
+        yield x_pass, y_pass, True
+        return
+    function = expression_cache.get_function(function_string)
+    intervals = grid_intervals(x_samples, sampling_mode)
+    x_data = linear_grid(x_range, intervals)
+    indices = np.arange(x_data.size)
+    y_data: Optional[np.ndarray] = None
+    evaluated = np.zeros(x_data.size, dtype=bool)
+    strides = progressive_strides(intervals)
+
+    for stride in strides:
+        selected = (indices % stride == 0)
+        selected[-1] = True
+        new = selected & ~evaluated
+        with instrumentation.stage("sample"):
+            values = parallel_evaluator(function, x_data[new])
+            if y_data is None:
+                y_data = np.full(values.shape[:-1] + x_data.shape, np.nan)
+            y_data[..., new] = values
+        instrumentation.count("samples", values.size)
+        evaluated |= new
+        x_full, y_full = break_discontinuities(function, x_data[selected], y_data[..., selected])
+        with instrumentation.stage("decimate"):
+            x_pass, y_pass = minmax_decimate(x_full, y_full, n_bins)
+        yield x_pass, y_pass, stride == 1
+    disk_cache.store(function_string, x_range, x_samples, sampling_mode, x_full, y_full)
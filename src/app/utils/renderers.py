@@ -0,0 +1,635 @@
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.lines import Line2D
+from matplotlib.figure import Figure
+
+from app.utils.analysis import FEATURE_KINDS, INTERSECTION, MAXIMUM, MINIMUM, ROOT, Feature
+from app.utils.constants import EXPORT_WIDTH, EXPORT_HEIGHT, EXPORT_DPI, PLOT_PLACE_FROM_CANVAS, BAR_WIDTH, \
+    COLLECTION_RENDERER_THRESHOLD
+from app.utils.discontinuities import has_breaks, visible_range
+from app.utils.instrumentation import instrumentation
+from app.utils.plot_option import PlotOption
+from app.utils.surface_option import SurfaceOption
+
+
+class Renderer:
+    """
+    Draws one plot type on an axes and keeps its artists to update them in place.
+
+    The artists are created by the first call to update(). Later calls only replace the data of
+    the existing artists, so redrawing with new samples does not tear down and rebuild the axes.
+
+    Attributes:
+        ax (Axes): The axes the artists are drawn on.
+        color (str): The color of the artists, None for the next color of the property cycle.
+        artists (list): The matplotlib artists owned by the renderer.
+
+    """
+
+    def __init__(self, ax: Axes, color: Optional[str] = None) -> None:
+        self.ax = ax
+        self.color = color
+        self.artists: List = []
+
+    def style(self) -> Dict[str, Any]:
+        """Return the keyword arguments setting the color of new artists."""
+        return {} if self.color is None else {"color": self.color}
+
+    def update(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        """
+        Show the data, creating the artists on the first call and updating them afterwards.
+
+        Args:
+            x_data (np.ndarray): The x data to plot.
+            y_data (np.ndarray): The y data to plot.
+
+        """
+        x_data = np.asarray(x_data, dtype=np.float64)
+        y_data = np.asarray(y_data, dtype=np.float64)
+        if not self.artists:
+            self.create(x_data, y_data)
+            instrumentation.count("artists", len(self.artists))
+        else:
+            self.set_data(x_data, y_data)
+        self.set_visible(True)
+
+    def create(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        """Create the artists showing the data."""
+        raise NotImplementedError
+
+    def set_data(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        """Replace the data shown by the existing artists."""
+        raise NotImplementedError
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        Show or hide all the artists of the renderer.
+
+        Args:
+            visible (bool): Whether the artists are visible.
+
+        """
+        for artist in self.artists:
+            artist.set_visible(visible)
+
+    def remove(self) -> None:
+        """Remove the artists from the axes."""
+        for artist in self.artists:
+            artist.remove()
+        self.artists = []
+
+
+class LineRenderer(Renderer):
+    """Draws a line plot as a single Line2D."""
+
+    drawstyle = 'default'
+
+    def create(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        self.artists = self.ax.plot(x_data, y_data, drawstyle=self.drawstyle, **self.style())
+
+    def set_data(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        self.artists[0].set_data(x_data, y_data)
+
+
+class StepRenderer(LineRenderer):
+    """Draws a step plot as a single Line2D with the same steps as Axes.step."""
+
+    drawstyle = 'steps-pre'
+
+
+class ScatterRenderer(Renderer):
+    """Draws a scatter plot as a single PathCollection."""
+
+    def create(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        self.artists = [self.ax.scatter(x_data, y_data, **self.style())]
+
+    def set_data(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        self.artists[0].set_offsets(np.column_stack((x_data, y_data)))
+
+
+class BarRenderer(Renderer):
+    """Draws a bar plot with Axes.bar, moving and resizing the existing bars when their number is unchanged."""
+
+    def create(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        self.container = self.ax.bar(x_data, y_data, **self.style())
+        self.artists = list(self.container.patches)
+
+    def set_data(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        if len(self.artists) != len(x_data):
+            self.remove()
+            self.create(x_data, y_data)
+            return
+        for bar, xi, yi in zip(self.artists, x_data, y_data):
+            bar.set_x(xi - bar.get_width() / 2)
+            bar.set_height(yi)
+
+    def remove(self) -> None:
+        self.container.remove()
+        self.artists = []
+
+
+class StemRenderer(Renderer):
+    """Draws a stem plot with Axes.stem, updating the markers, the stem lines and the baseline in place."""
+
+    def create(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        if self.color is None:
+            self.container = self.ax.stem(x_data, y_data)
+        else:
+            self.container = self.ax.stem(x_data, y_data, linefmt=f"{self.color}-", markerfmt=f"{self.color}o")
+        self.artists = [self.container.markerline, self.container.stemlines, self.container.baseline]
+
+    def set_data(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        markerline, stemlines, baseline = self.artists
+        markerline.set_data(x_data, y_data)
+        stemlines.set_segments(np.stack((np.column_stack((x_data, np.zeros_like(x_data))),
+                                         np.column_stack((x_data, y_data))), axis=1))
+        finite = x_data[np.isfinite(x_data)]
+        if finite.size:
+            baseline.set_data([finite.min(), finite.max()], [0, 0])
+
+    def remove(self) -> None:
+        self.container.remove()
+        self.artists = []
+
+
+class BarCollectionRenderer(Renderer):
+    """
+    Draws a bar plot as a single PolyCollection, for large numbers of samples.
+
+    Axes.bar creates one Rectangle artist per sample, so drawing and updating it grows expensive with
+    the number of bars. Here the rectangles of all the bars are built as one array of vertices and drawn
+    by one collection, which is updated with a single call whatever the number of bars.
+    """
+
+    def create(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        self.artists = [self.ax.add_collection(PolyCollection(bar_vertices(x_data, y_data),
+                                                              facecolors=self.color or "C0"), autolim=False)]
+
+    def set_data(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        self.artists[0].set_verts(bar_vertices(x_data, y_data))
+
+
+class StemCollectionRenderer(Renderer):
+    """
+    Draws a stem plot as a single LineCollection of stems, one Line2D of markers and a baseline, for large numbers of samples.
+
+    The artists mirror those of Axes.stem, but the stems of all the samples are one collection, so drawing
+    and updating them does not depend on the number of artists.
+    """
+
+    def create(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        color = self.color or "C0"
+        markerline = self.ax.add_line(Line2D(x_data, y_data, color=color, marker="o", linestyle="None"))
+        stemlines = self.ax.add_collection(LineCollection(stem_segments(x_data, y_data), colors=color), autolim=False)
+        baseline = self.ax.add_line(Line2D(*baseline_data(x_data), color="C3"))
+        self.artists = [markerline, stemlines, baseline]
+
+    def set_data(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        markerline, stemlines, baseline = self.artists
+        markerline.set_data(x_data, y_data)
+        stemlines.set_segments(stem_segments(x_data, y_data))
+        baseline.set_data(*baseline_data(x_data))
+
+
+def bar_vertices(x_data: np.ndarray, y_data: np.ndarray) -> np.ndarray:
+    """
+    Build the rectangles of bars centered on the x values, as wide as the bars of Axes.bar.
+
+    Args:
+        x_data (np.ndarray): The x values of the bars.
+        y_data (np.ndarray): The heights of the bars.
+
+    Returns:
+        np.ndarray: The four vertices of each bar with a finite height, of shape (bars, 4, 2).
+
+    """
+    finite = np.isfinite(x_data) & np.isfinite(y_data)
+    x_data, y_data = x_data[finite], y_data[finite]
+    left = x_data - BAR_WIDTH / 2
+    right = x_data + BAR_WIDTH / 2
+    zeros = np.zeros_like(y_data)
+    return np.stack((np.column_stack((left, zeros)), np.column_stack((left, y_data)),
+                     np.column_stack((right, y_data)), np.column_stack((right, zeros))), axis=1)
+
+
+def stem_segments(x_data: np.ndarray, y_data: np.ndarray) -> np.ndarray:
+    """Build the segments of stems from the x axis up to the values, of shape (stems, 2, 2)."""
+    return np.stack((np.column_stack((x_data, np.zeros_like(x_data))), np.column_stack((x_data, y_data))), axis=1)
+
+
+def baseline_data(x_data: np.ndarray) -> Tuple[List[float], List[float]]:
+    """Return the x and y data of a baseline at y = 0 spanning the finite x values."""
+    finite = x_data[np.isfinite(x_data)]
+    if not finite.size:
+        return [], []
+    return [finite.min(), finite.max()], [0, 0]
+
+
+RENDERERS: Dict[PlotOption, Type[Renderer]] = {
+    PlotOption.PLOT: LineRenderer,
+    PlotOption.SCATTER: ScatterRenderer,
+    PlotOption.BAR: BarRenderer,
+    PlotOption.STEM: StemRenderer,
+    PlotOption.STEP: StepRenderer,
+}
+
+COLLECTION_RENDERERS: Dict[PlotOption, Type[Renderer]] = {
+    PlotOption.BAR: BarCollectionRenderer,
+    PlotOption.STEM: StemCollectionRenderer,
+}
+
+
+def renderer_class(draw_option: PlotOption, samples: int) -> Type[Renderer]:
+    """
+    Choose the renderer of a plot type for a number of samples.
+
+    Plot types drawing one artist per sample switch to their collection renderer from
+    COLLECTION_RENDERER_THRESHOLD samples on.
+
+    Args:
+        draw_option (PlotOption): The option for the type of plot to be drawn.
+        samples (int): The number of samples of each curve.
+
+    Returns:
+        type: The renderer to draw the samples with.
+
+    """
+    if samples >= COLLECTION_RENDERER_THRESHOLD and draw_option in COLLECTION_RENDERERS:
+        return COLLECTION_RENDERERS[draw_option]
+    return RENDERERS[draw_option]
+
+
+class CurveSet:
+    """
+    Draws one or several curves sharing their x data, with one renderer of a plot type per curve.
+
+    Curve number i is drawn in the color 'Ci' of the property cycle, so each function of an overlay
+    keeps its color between draws. The renderers of the curves are kept and updated in place, and
+    the renderers of curves that are no longer drawn are removed. The renderer is chosen by the
+    number of samples, see renderer_class(), and the curves are rebuilt when that choice changes.
+
+    Attributes:
+        ax (Axes): The axes the curves are drawn on.
+        draw_option (PlotOption): The type of plot of the curves.
+        renderers (list): The renderer of each curve.
+
+    """
+
+    def __init__(self, ax: Axes, draw_option: PlotOption) -> None:
+        self.ax = ax
+        self.draw_option = draw_option
+        self.renderers: List[Renderer] = []
+
+    @property
+    def artists(self) -> List:
+        """The matplotlib artists of all the curves."""
+        return [artist for renderer in self.renderers for artist in renderer.artists]
+
+    def update(self, x_data: np.ndarray, y_data: np.ndarray) -> None:
+        """
+        Show the curves, creating their renderers on first use.
+
+        Args:
+            x_data (np.ndarray): The x data shared by the curves.
+            y_data (np.ndarray): The y data of one curve, or one row of y data per curve.
+
+        """
+        rows = np.atleast_2d(np.asarray(y_data, dtype=np.float64))
+        curve_renderer = renderer_class(self.draw_option, rows.shape[-1])
+        if self.renderers and type(self.renderers[0]) is not curve_renderer:
+            self.remove()
+        while len(self.renderers) > len(rows):
+            self.renderers.pop().remove()
+        while len(self.renderers) < len(rows):
+            self.renderers.append(curve_renderer(self.ax, color=f"C{len(self.renderers)}"))
+        for renderer, row in zip(self.renderers, rows):
+            renderer.update(x_data, row)
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        Show or hide all the curves.
+
+        Args:
+            visible (bool): Whether the curves are visible.
+
+        """
+        for renderer in self.renderers:
+            renderer.set_visible(visible)
+
+    def remove(self) -> None:
+        """Remove all the curves from the axes."""
+        for renderer in self.renderers:
+            renderer.remove()
+        self.renderers = []
+
+    def legend_handles(self) -> List:
+        """Return one artist per curve, to represent the curves in a legend."""
+        return [renderer.artists[0] for renderer in self.renderers if renderer.artists]
+
+
+def update_legend(ax: Axes, curves: CurveSet, labels: Sequence[str]) -> None:
+    """
+    Label the curves in a legend when there are several of them, removing the legend otherwise.
+
+    Args:
+        ax (Axes): The axes the curves are drawn on.
+        curves (CurveSet): The drawn curves.
+        labels (Sequence[str]): The label of each curve.
+
+    """
+    if len(curves.renderers) > 1:
+        ax.legend(curves.legend_handles(), list(labels)[:len(curves.renderers)])
+    elif ax.get_legend() is not None:
+        ax.get_legend().remove()
+
+
+def autoscale(ax: Axes, x_data: np.ndarray, y_data: np.ndarray,
+              extra_data: Sequence[Tuple[np.ndarray, np.ndarray]] = ()) -> None:
+    """
+    Fit the view limits of the axes to the visible artists and the given data.
+
+    Axes.relim does not account for collections, so the data drawn by the current renderer is
+    added to the data limits explicitly. When the curves are broken at an asymptote, see
+    app.utils.discontinuities, the y limits are clamped to the visible range of the data, so the
+    samples closest to the asymptote do not squash the rest of the curves. The extra data, such as
+    the loaded datasets, whose lines only hold the samples within the current view, is fitted too
+    and is never clamped away.
+
+    Args:
+        ax (Axes): The axes to rescale.
+        x_data (np.ndarray): The x data drawn on the axes.
+        y_data (np.ndarray): The y data drawn on the axes, or one row of y data per curve.
+        extra_data (Sequence[tuple]): The x data and y data of other curves to fit.
+
+    """
+    rows = np.atleast_2d(np.asarray(y_data, dtype=np.float64))
+    points = np.column_stack((np.tile(np.asarray(x_data, dtype=np.float64), rows.shape[0]), rows.ravel()))
+    extra = np.concatenate([np.column_stack((np.asarray(x_extra, dtype=np.float64), np.asarray(y_extra, dtype=np.float64)))
+                            for x_extra, y_extra in extra_data] or [np.empty((0, 2))])
+    points = np.concatenate((points, extra))
+    points = points[np.isfinite(points).all(axis=1)]
+    ax.relim(visible_only=True)
+    if points.size:
+        ax.update_datalim(points)
+    ax.set_autoscale_on(True)
+    ax.autoscale_view()
+    bounds = visible_range(rows) if has_breaks(rows) else None
+    if bounds is not None:
+        extra = extra[np.isfinite(extra[:, 1]), 1]
+        if extra.size:
+            bounds = min(bounds[0], float(extra.min())), max(bounds[1], float(extra.max()))
+        bottom, top = ax.get_ylim()
+        margin = ax.margins()[1] * (bounds[1] - bounds[0])
+        ax.set_ylim(max(bottom, bounds[0] - margin), min(top, bounds[1] + margin))
+
+
+FEATURE_MARKERS = {ROOT: "o", MINIMUM: "v", MAXIMUM: "^", INTERSECTION: "X"}
+
+
+class FeatureMarkers:
+    """
+    Marks the roots, extrema and intersections found by app.utils.analysis on an axes.
+
+    Each kind of feature is drawn as one marker-only line, created on first use and updated in place,
+    and kept out of the legend.
+
+    Attributes:
+        ax (Axes): The axes the markers are drawn on.
+        lines (dict): The line of the markers of each kind of feature.
+
+    """
+
+    def __init__(self, ax: Axes) -> None:
+        self.ax = ax
+        self.lines: Dict[str, Line2D] = {}
+
+    def update(self, features: Sequence[Feature]) -> None:
+        """
+        Mark the features, hiding the markers of the kinds that have none.
+
+        Args:
+            features (Sequence[Feature]): The features to mark.
+
+        """
+        for kind in FEATURE_KINDS:
+            points = [(feature.x, feature.y) for feature in features if feature.kind == kind]
+            if kind not in self.lines:
+                if not points:
+                    continue
+                self.lines[kind], = self.ax.plot([], [], linestyle="none", marker=FEATURE_MARKERS[kind], color="k",
+                                                 label=f"_{kind}", zorder=3)
+            x_data, y_data = zip(*points) if points else ((), ())
+            self.lines[kind].set_data(x_data, y_data)
+            self.lines[kind].set_visible(bool(points))
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        Show or hide all the markers.
+
+        Args:
+            visible (bool): Whether the markers are visible.
+
+        """
+        for line in self.lines.values():
+            line.set_visible(visible)
+
+    def remove(self) -> None:
+        """Remove all the markers from the axes."""
+        for line in self.lines.values():
+            line.remove()
+        self.lines = {}
+
+
+class SurfaceRenderer:
+    """
+    Draws a function of x and y on a figure as a surface, a wireframe or a contour plot.
+
+    Surfaces and wireframes are drawn on a 3D axes and contours on a 2D axes, both created on first
+    use in the place of the axes of the plots of x and shown only while they hold the current view.
+    A new grid replaces the previous artist, since matplotlib cannot update the data of a surface in
+    place. The grid is drawn at its full resolution, so the interactive view samples a coarse grid,
+    see app.utils.surface.grid_samples.
+
+    Attributes:
+        figure (Figure): The figure the views are drawn on.
+        axes (dict): The 3D axes and the 2D axes, once created.
+        artist: The artist of the current view, None if nothing is drawn.
+
+    """
+
+    def __init__(self, figure: Figure) -> None:
+        self.figure = figure
+        self.axes: Dict[str, Axes] = {}
+        self.artist = None
+
+    def axes_for(self, option: SurfaceOption) -> Axes:
+        """
+        Return the axes of a view, creating it on first use.
+
+        Args:
+            option (SurfaceOption): The view of the function.
+
+        Returns:
+            Axes: The 3D axes for surfaces and wireframes, the 2D axes for contours.
+
+        """
+        key = "2d" if option == SurfaceOption.CONTOUR else "3d"
+        if key not in self.axes:
+            projection = None if key == "2d" else "3d"
+            self.axes[key] = self.figure.add_subplot(PLOT_PLACE_FROM_CANVAS, projection=projection, label=f"surface {key}")
+            self.axes[key].set_visible(False)
+        return self.axes[key]
+
+    def plot(self, option: SurfaceOption, x_data: np.ndarray, y_data: np.ndarray, z_data: np.ndarray,
+             title: str = "") -> Axes:
+        """
+        Show a grid of values of a function of x and y, replacing the previous view.
+
+        Args:
+            option (SurfaceOption): The view of the function.
+            x_data (np.ndarray): The x values of the grid.
+            y_data (np.ndarray): The y values of the grid.
+            z_data (np.ndarray): The z values, with one row per y value.
+            title (str): The title of the plot.
+
+        Returns:
+            Axes: The axes the view is drawn on.
+
+        """
+        self.remove()
+        ax = self.axes_for(option)
+        self.set_visible(False)
+        x_grid, y_grid = np.meshgrid(x_data, y_data)
+        z_masked = np.ma.masked_invalid(z_data)
+        rows, columns = z_data.shape
+        if option == SurfaceOption.SURFACE:
+            self.artist = ax.plot_surface(x_grid, y_grid, z_masked, rcount=rows, ccount=columns, cmap="viridis")
+        elif option == SurfaceOption.WIREFRAME:
+            self.artist = ax.plot_wireframe(x_grid, y_grid, z_masked, rcount=rows, ccount=columns)
+        else:
+            self.artist = ax.contourf(x_grid, y_grid, z_masked, cmap="viridis")
+        finite = z_data[np.isfinite(z_data)]
+        if option != SurfaceOption.CONTOUR and finite.size:
+            ax.set_zlim(finite.min(), finite.max() if finite.max() > finite.min() else finite.min() + 1)
+        ax.set_xlim(x_data[0], x_data[-1])
+        ax.set_ylim(y_data[0], y_data[-1])
+        ax.set_title(title)
+        ax.set_visible(True)
+        return ax
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        Show or hide the axes of the current view, hiding the axes of the other views.
+
+        Args:
+            visible (bool): Whether the current view is visible.
+
+        """
+        for ax in self.axes.values():
+            ax.set_visible(visible and self.artist is not None and self.artist_axes() is ax)
+
+    def artist_axes(self) -> Optional[Axes]:
+        """Return the axes of the current view, None if nothing is drawn."""
+        if self.artist is None:
+            return None
+        return self.artist.axes
+
+    def remove(self) -> None:
+        """Remove the current view from its axes."""
+        if self.artist is None:
+            return
+        if isinstance(self.artist, Artist):
+            self.artist.remove()
+        else:
+            for collection in self.artist.collections:
+                collection.remove()
+        self.artist = None
+
+
+class FigureRenderer:
+    """
+    Renders plots to image files on a reusable Agg figure, without a GUI toolkit.
+
+    The figure, its axes and the renderer of each plot type are kept between plots, so rendering
+    many plots only updates the data of existing artists, the same way the Plotter window does.
+
+    Attributes:
+        figure (Figure): The figure the plots are drawn on.
+        ax (Axes): The axes of the figure.
+        renderers (dict): The curves of each plot type used so far.
+        surface_renderer (SurfaceRenderer): The renderer of functions of x and y, None until first used.
+
+    """
+
+    def __init__(self, width: float = EXPORT_WIDTH, height: float = EXPORT_HEIGHT, dpi: int = EXPORT_DPI) -> None:
+        self.figure = Figure(figsize=(width, height), dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(PLOT_PLACE_FROM_CANVAS)
+        self.renderers: Dict[PlotOption, CurveSet] = {}
+        self.surface_renderer: Optional[SurfaceRenderer] = None
+
+    def pixel_width(self) -> int:
+        """Return the width of the rendered images in pixels."""
+        return int(self.figure.get_figwidth() * self.figure.dpi)
+
+    def plot(self, draw_option: PlotOption, x_data: np.ndarray, y_data: np.ndarray, title: str = "",
+             labels: Sequence[str] = ()) -> None:
+        """
+        Show the data on the axes with the renderer of the drawing option, hiding the other plot types.
+
+        Args:
+            draw_option (PlotOption): The option for the type of plot to be drawn.
+            x_data (np.ndarray): The x data to plot.
+            y_data (np.ndarray): The y data to plot, or one row of y data per curve.
+            title (str): The title of the plot.
+            labels (Sequence[str]): The legend label of each curve, shown when there are several curves.
+
+        """
+        if self.surface_renderer is not None:
+            self.surface_renderer.set_visible(False)
+            self.ax.set_visible(True)
+        for option, curves in self.renderers.items():
+            if option != draw_option:
+                curves.set_visible(False)
+        if draw_option not in self.renderers:
+            self.renderers[draw_option] = CurveSet(self.ax, draw_option)
+        self.renderers[draw_option].update(x_data, y_data)
+        update_legend(self.ax, self.renderers[draw_option], labels)
+        autoscale(self.ax, x_data, y_data)
+        self.ax.set_title(title)
+
+    def plot_surface(self, option: SurfaceOption, x_data: np.ndarray, y_data: np.ndarray, z_data: np.ndarray,
+                     title: str = "") -> None:
+        """
+        Show a grid of values of a function of x and y at its full resolution, hiding the plots of x.
+
+        Args:
+            option (SurfaceOption): The view of the function.
+            x_data (np.ndarray): The x values of the grid.
+            y_data (np.ndarray): The y values of the grid.
+            z_data (np.ndarray): The z values, with one row per y value.
+            title (str): The title of the plot.
+
+        """
+        if self.surface_renderer is None:
+            self.surface_renderer = SurfaceRenderer(self.figure)
+        self.ax.set_visible(False)
+        self.surface_renderer.plot(option, x_data, y_data, z_data, title=title)
+
+    def save(self, output: Union[str, BinaryIO], image_format: Optional[str] = None) -> None:
+        """
+        Write the current plot to a file.
+
+        Args:
+            output (str or file): The path or the binary file to write to.
+            image_format (str): The image format, such as 'png' or 'svg'. Inferred from the path if None.
+
+        """
+        self.figure.savefig(output, format=image_format)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from app.utils.constants import ADAPTIVE_POINT_BUDGET, ADAPTIVE_MIN_INITIAL_SAMPLES, ADAPTIVE_MAX_DEPTH, \
+    ADAPTIVE_TOLERANCE, HIGH_RESOLUTION_FACTOR
+from app.utils.discontinuities import break_discontinuities, find_discontinuities, visible_range
+from app.utils.evaluation import linear_grid
+from app.utils.instrumentation import instrumentation
+from app.utils.parallel import parallel_evaluator
+from app.utils.sampling_mode import SamplingMode
+
+Function = Callable[[np.ndarray], np.ndarray]
+
+
+def sample_uniform(function: Function, x_range: Tuple[float, float], x_samples: int) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample a function on an evenly spaced grid.
+
+    Large grids are evaluated in chunks on several threads, see app.utils.parallel.
+
+    Args:
+        function (Callable): The vectorized function of x.
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        x_samples (int): The number of intervals; x_samples + 1 points are evaluated.
+
+    Returns:
+        tuple: The x data and y data as arrays.
+
+    """
+    x_data = linear_grid(x_range, x_samples)
+    return x_data, parallel_evaluator(function, x_data)
+
+
+def sample_adaptive(function: Function, x_range: Tuple[float, float], x_samples: int,
+                    budget: int = ADAPTIVE_POINT_BUDGET, tolerance: float = ADAPTIVE_TOLERANCE,
+                    max_depth: int = ADAPTIVE_MAX_DEPTH) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample a function on a grid that is refined where the curve bends.
+
+    Sampling starts from a coarse uniform grid. In each pass the midpoints of all intervals still
+    marked for refinement are evaluated in one vectorized call, and an interval is split again only
+    if its midpoint deviates from the straight line between its ends by more than tolerance times
+    the height of the curve. Straight stretches therefore stop after one pass while bends and sharp
+    features keep being subdivided, until no interval needs refinement, max_depth passes were made
+    or the point budget is used up. When the budget does not cover every interval of a pass, the
+    intervals with the largest error are refined first.
+
+    If the starting grid holds an asymptote, the tolerance is relative to the visible range of the
+    curve instead of its whole height, see app.utils.discontinuities.visible_range, and intervals lying
+    wholly above or below that range are not refined, so the budget is not spent on values like 1e16.
+
+    A function returning several rows of values, such as a FunctionGroup, is sampled on one shared
+    grid, refined wherever any of its curves bends.
+
+    Args:
+        function (Callable): The vectorized function of x.
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        x_samples (int): The number of intervals of the starting grid.
+        budget (int): The maximum number of function evaluations.
+        tolerance (float): The accepted deviation from a straight line, relative to the curve height.
+        max_depth (int): The maximum number of refinement passes.
+
+    Returns:
+        tuple: The x data and y data as arrays, sorted by x, with one row of y data per curve for
+            functions returning several rows.
+
+    """
+    x_samples = min(max(x_samples, ADAPTIVE_MIN_INITIAL_SAMPLES), max(budget - 1, 1))
+    x_data, y_data = sample_uniform(function, x_range, x_samples)
+    bounds = visible_range(y_data) if find_discontinuities(function, x_data, y_data)[1].size else None
+    evaluations = x_data.size
+    active = np.ones(x_data.size - 1, dtype=bool)
+    priority = np.full(x_data.size - 1, np.inf)
+
+    for _ in range(max_depth):
+        intervals = np.flatnonzero(active)
+        remaining = budget - evaluations
+        if intervals.size == 0 or remaining <= 0:
+            break
+        if intervals.size > remaining:
+            intervals = np.sort(intervals[np.argsort(-priority[intervals], kind="stable")[:remaining]])
+
+        x_mid = (x_data[intervals] + x_data[intervals + 1]) / 2
+        y_mid = function(x_mid)
+        evaluations += intervals.size
+
+        y_left, y_right = y_data[..., intervals], y_data[..., intervals + 1]
+        error = relative_error(y_left, y_right, y_mid, y_data, bounds)
+        if bounds is not None:
+            error[offscreen(y_left, y_right, y_mid, bounds)] = 0.0
+        refine = error > tolerance
+
+        active[intervals] = refine
+        priority[intervals] = error
+        x_data = np.insert(x_data, intervals + 1, x_mid)
+        y_data = np.insert(y_data, intervals + 1, y_mid, axis=-1)
+        active = np.insert(active, intervals + 1, refine)
+        priority = np.insert(priority, intervals + 1, error)
+
+    return x_data, y_data
+
+
+def interpolation_error(y_left: np.ndarray, y_right: np.ndarray, y_mid: np.ndarray) -> np.ndarray:
+    """
+    Measure how far the midpoints of intervals are from the straight line between their ends.
+
+    An interval where only some of the three values are finite holds a discontinuity or the edge
+    of the domain, so its error is infinite. An interval where none of them is finite has no
+    curve to draw, so its error is zero.
+
+    Args:
+        y_left (np.ndarray): The values at the left ends of the intervals.
+        y_right (np.ndarray): The values at the right ends of the intervals.
+        y_mid (np.ndarray): The values at the midpoints of the intervals.
+
+    Returns:
+        np.ndarray: The absolute error of linear interpolation at the midpoints.
+
+    """
+    finite = np.isfinite(y_left) & np.isfinite(y_right) & np.isfinite(y_mid)
+    undefined = ~(np.isfinite(y_left) | np.isfinite(y_right) | np.isfinite(y_mid))
+    with np.errstate(all="ignore"):
+        error = np.abs(y_mid - (y_left + y_right) / 2)
+    return np.where(finite, error, np.where(undefined, 0.0, np.inf))
+
+
+def offscreen(y_left: np.ndarray, y_right: np.ndarray, y_mid: np.ndarray, bounds: Tuple[float, float]) -> np.ndarray:
+    """
+    Tell which intervals lie wholly above or below a range of y values, for every curve.
+
+    Args:
+        y_left (np.ndarray): The values at the left ends of the intervals.
+        y_right (np.ndarray): The values at the right ends of the intervals.
+        y_mid (np.ndarray): The values at the midpoints of the intervals.
+        bounds (tuple): The range as a tuple (ymin, ymax).
+
+    Returns:
+        np.ndarray: True for each interval outside the range.
+
+    """
+    with np.errstate(invalid="ignore"):
+        lowest = np.minimum(np.minimum(y_left, y_right), y_mid)
+        highest = np.maximum(np.maximum(y_left, y_right), y_mid)
+        outside = (lowest > bounds[1]) | (highest < bounds[0])
+    return outside if outside.ndim == 1 else outside.all(axis=0)
+
+
+def relative_error(y_left: np.ndarray, y_right: np.ndarray, y_mid: np.ndarray, y_data: np.ndarray,
+                   bounds: Optional[Tuple[float, float]] = None) -> np.ndarray:
+    """
+    Measure the interpolation error of intervals relative to the height of their curve.
+
+    For several curves sampled on a shared grid, the error of an interval is the largest relative
+    error of any of the curves.
+
+    Args:
+        y_left (np.ndarray): The values at the left ends of the intervals.
+        y_right (np.ndarray): The values at the right ends of the intervals.
+        y_mid (np.ndarray): The values at the midpoints of the intervals.
+        y_data (np.ndarray): All the sampled values, one row per curve for several curves.
+        bounds (tuple): The range of y values the heights are measured within, None for the whole curves.
+
+    Returns:
+        np.ndarray: The relative error of each interval.
+
+    """
+    error = interpolation_error(y_left, y_right, y_mid)
+    if error.ndim == 1:
+        return error / curve_height(y_data, bounds)
+    heights = np.array([curve_height(row, bounds) for row in y_data])
+    return (error / heights[:, np.newaxis]).max(axis=0)
+
+
+def curve_height(y_data: np.ndarray, bounds: Optional[Tuple[float, float]] = None) -> float:
+    """
+    Measure the height of the finite part of a curve, used to scale the refinement tolerance.
+
+    Args:
+        y_data (np.ndarray): The sampled values.
+        bounds (tuple): The range of y values the values are clipped to, None to keep them all.
+
+    Returns:
+        float: The difference between the largest and the smallest finite value, or 1 for flat curves.
+
+    """
+    finite = y_data[np.isfinite(y_data)]
+    if finite.size == 0:
+        return 1.0
+    if bounds is not None:
+        finite = np.clip(finite, *bounds)
+    height = float(finite.max() - finite.min())
+    return height if height > 0 else 1.0
+
+
+def sample_function(function: Function, x_range: Tuple[float, float], x_samples: int,
+                    sampling_mode: SamplingMode = SamplingMode.UNIFORM) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample a function with the chosen sampling mode.
+
+    In high resolution mode the grid is HIGH_RESOLUTION_FACTOR times denser than x_samples, up to
+    millions of samples, which should be decimated before rendering, see app.utils.decimation.
+    In every mode the curves are broken with NaN at their discontinuities and asymptotes, see
+    app.utils.discontinuities.
+
+    Args:
+        function (Callable): The vectorized function of x.
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        x_samples (int): The number of x samples, or the size of the starting grid in adaptive mode.
+        sampling_mode (SamplingMode): The way of choosing the x samples.
+
+    Returns:
+        tuple: The x data and y data as arrays, with one row of y data per curve for functions
+            returning several rows.
+
+    """
+    with instrumentation.stage("sample"):
+        if sampling_mode == SamplingMode.ADAPTIVE:
+            x_data, y_data = sample_adaptive(function, x_range, x_samples)
+        elif sampling_mode == SamplingMode.HIGH_RESOLUTION:
+            x_data, y_data = sample_uniform(function, x_range, x_samples * HIGH_RESOLUTION_FACTOR)
+        else:
+            x_data, y_data = sample_uniform(function, x_range, x_samples)
+    x_data, y_data = break_discontinuities(function, x_data, y_data)
+    instrumentation.count("samples", y_data.size)
+    return x_data, y_data
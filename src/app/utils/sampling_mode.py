@@ -0,0 +1,20 @@
+import enum
+from enum import Enum
+
+
+class SamplingMode(Enum):
+    """
+        Enum representing different ways of choosing the x samples of a function.
+
+        This enumeration defines the available sampling modes for the Plotter class.
+        Each option is associated with a unique integer value.
+
+        Attributes:
+            UNIFORM (int): Option for sampling on an evenly spaced grid.
+            ADAPTIVE (int): Option for refining the samples where the curve bends.
+            HIGH_RESOLUTION (int): Option for sampling on an evenly spaced grid HIGH_RESOLUTION_FACTOR times denser.
+
+        """
+    UNIFORM = enum.auto()
+    ADAPTIVE = enum.auto()
+    HIGH_RESOLUTION = enum.auto()
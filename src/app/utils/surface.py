@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from app.utils.constants import SURFACE_CHUNK_ELEMENTS, SURFACE_HIGH_RESOLUTION_FACTOR
+from app.utils.evaluation import linear_grid
+from app.utils.instrumentation import instrumentation
+from app.utils.sampling_mode import SamplingMode
+
+Surface = Callable[[np.ndarray, np.ndarray], np.ndarray]
+Grid = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def grid_samples(samples: int, sampling_mode: SamplingMode = SamplingMode.UNIFORM, max_points: Optional[int] = None) -> int:
+    """
+    Choose the number of intervals along each axis of the grid of a function of x and y.
+
+    The grid follows the number of samples, and is SURFACE_HIGH_RESOLUTION_FACTOR times denser
+    in high resolution mode. Adaptive sampling does not apply to surfaces, which use the uniform grid.
+    The interactive view passes max_points so its grid is sampled at the size it is drawn at, rather
+    than evaluated in full and thinned out; exports through app.batch keep the full grid.
+
+    Args:
+        samples (int): The number of x samples chosen for plots of x.
+        sampling_mode (SamplingMode): The way of choosing the samples.
+        max_points (int): The maximum number of points along each axis, None for no limit.
+
+    Returns:
+        int: The number of intervals along each axis.
+
+    """
+    if sampling_mode == SamplingMode.HIGH_RESOLUTION:
+        samples *= SURFACE_HIGH_RESOLUTION_FACTOR
+    if max_points is not None:
+        samples = min(samples, max(max_points - 1, 1))
+    return samples
+
+
+def sample_surface(surface: Surface, x_range: Tuple[float, float], y_range: Tuple[float, float],
+                   x_samples: int, y_samples: int, chunk_elements: int = SURFACE_CHUNK_ELEMENTS) -> Grid:
+    """
+    Evaluate a function of x and y over a regular grid, a chunk of rows at a time.
+
+    The result is allocated once, and each chunk of rows is evaluated by broadcasting the row of
+    x values against a column of y values, so the temporaries of the kernel never hold more than
+    about chunk_elements values however large the grid is, and no meshgrid is built.
+
+    Args:
+        surface (Callable): The vectorized function of x and y.
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        y_range (tuple): The range of y as a tuple (ymin, ymax).
+        x_samples (int): The number of intervals along x.
+        y_samples (int): The number of intervals along y.
+        chunk_elements (int): The number of grid points evaluated per chunk.
+
+    Returns:
+        tuple: The x values, the y values and the z values, with one row of z per y value.
+
+    """
+    with instrumentation.stage("sample"):
+        x_data = linear_grid(x_range, x_samples)
+        y_data = linear_grid(y_range, y_samples)
+        z_data = np.empty((y_data.size, x_data.size), dtype=np.float64)
+        chunk_rows = max(chunk_elements // x_data.size, 1)
+        for start in range(0, y_data.size, chunk_rows):
+            stop = min(start + chunk_rows, y_data.size)
+            z_data[start:stop] = surface(x_data[np.newaxis, :], y_data[start:stop, np.newaxis])
+    instrumentation.count("samples", z_data.size)
+    return x_data, y_data, z_data
@@ -0,0 +1,20 @@
+import enum
+from enum import Enum
+
+
+class SurfaceOption(Enum):
+    """
+        Enum representing the views of a function of x and y.
+
+        This enumeration defines the available views of f(x, y) for the Plotter class.
+        Each option is associated with a unique integer value.
+
+        Attributes:
+            SURFACE (int): Option for plotting a shaded 3D surface.
+            WIREFRAME (int): Option for plotting a 3D wireframe.
+            CONTOUR (int): Option for plotting filled contours on a 2D axes.
+
+        """
+    SURFACE = enum.auto()
+    WIREFRAME = enum.auto()
+    CONTOUR = enum.auto()
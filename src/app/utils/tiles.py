@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from app.utils.cache import LRUCache, expression_cache, normalize_function_string
+from app.utils.constants import TILE_CACHE_MAX_BYTES, TILE_CACHE_SIZE, TILES_PER_VIEW
+from app.utils.sampling import sample_function
+from app.utils.sampling_mode import SamplingMode
+
+
+def tile_layout(x_window: Tuple[float, float], x_samples: int) -> Tuple[float, int, int, int]:
+    """
+    Choose the tiles that cover a window of x at a given sample density.
+
+    Tiles are aligned to multiples of a power of two width that fits roughly TILES_PER_VIEW times
+    into the window, and the number of samples per tile is rounded up to a power of two. Panning
+    keeps the same tiles, and zooming back and forth between nearby scales lands on tiles that
+    were already computed.
+
+    Args:
+        x_window (tuple): The visible range of x as a tuple (xmin, xmax).
+        x_samples (int): The number of samples wanted across the window.
+
+    Returns:
+        tuple: The tile width, the samples per tile and the indices of the first and last tile.
+
+    """
+    width = x_window[1] - x_window[0]
+    if not width > 0:
+        raise ValueError("The window of x must have a positive width.")
+    tile_width = 2.0 ** math.floor(math.log2(width / TILES_PER_VIEW))
+    tile_samples = 2 ** max(math.ceil(math.log2(max(x_samples * tile_width / width, 1))), 0)
+    first_tile = math.floor(x_window[0] / tile_width)
+    last_tile = math.ceil(x_window[1] / tile_width) - 1
+    return tile_width, tile_samples, first_tile, max(last_tile, first_tile)
+
+
+class TileCache(LRUCache):
+    """
+    An LRU cache of sampled tiles of x, used to resample the visible window when zooming and panning.
+
+    Each tile holds the samples of one function over one aligned stretch of x, keyed by the
+    normalized function string, the sampling mode, the tile width, the samples per tile and the
+    position of the tile. Only the tiles that are not cached yet are evaluated when the view moves.
+
+    Tiles of high resolution sampling hold HIGH_RESOLUTION_FACTOR times more samples, megabytes each,
+    so besides the number of tiles the cache bounds the total size of their arrays, evicting the least
+    recently used tiles beyond max_bytes. The most recent tile is always kept.
+
+    Attributes:
+        max_bytes (int): The maximum total size of the arrays of the cached tiles.
+        nbytes (int): The total size of the arrays of the cached tiles.
+
+    """
+
+    def __init__(self, max_size: int, max_bytes: int = TILE_CACHE_MAX_BYTES) -> None:
+        super().__init__(max_size)
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a tile, evicting the least recently used tiles if the cache holds too many or too large ones.
+
+        Args:
+            key (Hashable): The key of the tile.
+            value (tuple): The x data and y data of the tile.
+
+        """
+        with self.lock:
+            if key in self.entries:
+                self.nbytes -= tile_nbytes(self.entries.pop(key))
+            self.entries[key] = value
+            self.nbytes += tile_nbytes(value)
+            while len(self.entries) > self.max_size or (self.nbytes > self.max_bytes and len(self.entries) > 1):
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= tile_nbytes(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all tiles and reset the counters."""
+        with self.lock:
+            super().clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report the size of the cache and its counters.
+
+        Returns:
+            dict: The stats of LRUCache.stats(), with the total size of the tiles as nbytes.
+
+        """
+        return dict(super().stats(), nbytes=self.nbytes)
+
+    def sample_window(self, function_string: str, x_window: Tuple[float, float], x_samples: int,
+                      sampling_mode: SamplingMode = SamplingMode.UNIFORM) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sample a function over the tiles covering a window of x.
+
+        Args:
+            function_string (str): The input function string.
+            x_window (tuple): The visible range of x as a tuple (xmin, xmax).
+            x_samples (int): The number of samples wanted across the window.
+            sampling_mode (SamplingMode): The way of choosing the x samples inside each tile.
+
+        Returns:
+            tuple: The x data and y data as arrays, covering at least the window.
+
+        """
+        function_key = normalize_function_string(function_string)
+        tile_width, tile_samples, first_tile, last_tile = tile_layout(x_window, x_samples)
+        x_parts: List[np.ndarray] = []
+        y_parts: List[np.ndarray] = []
+        for index in range(first_tile, last_tile + 1):
+            key = (function_key, sampling_mode, tile_width, tile_samples, index)
+            tile = self.get(key)
+            if tile is None:
+                function = expression_cache.get_function(function_string)
+                tile_range = index * tile_width, (index + 1) * tile_width
+                tile = sample_function(function, tile_range, tile_samples, sampling_mode)
+                self.put(key, tile)
+            start = 1 if x_parts else 0
+            x_parts.append(tile[0][start:])
+            y_parts.append(tile[1][..., start:])
+        return np.concatenate(x_parts), np.concatenate(y_parts, axis=-1)
+
+
+def tile_nbytes(tile: Tuple[np.ndarray, np.ndarray]) -> int:
+    """Return the total size of the arrays of a tile."""
+    return sum(array.nbytes for array in tile)
+
+
+tile_cache = TileCache(TILE_CACHE_SIZE)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-import re
-from typing import Tuple, List
+from typing import Optional, Tuple
 
-import sympy
+import numpy as np
 from PySide6.QtWidgets import QMessageBox
 
+from app.utils.cache import expression_cache
+from app.utils.checks import check_range, check_2d_function, check_3d_function
+from app.utils.disk_cache import disk_cache
+from app.utils.sampling import sample_function
+from app.utils.sampling_mode import SamplingMode
+from app.utils.surface import grid_samples, sample_surface
 
-def validate_range(plotter, xmin: str, xmax: str) -> None | Tuple[float, float]:
+
+def validate_range(plotter, xmin: str, xmax: str, variable: str = "x") -> None | Tuple[float, float]:
     """
     Validate the range of x and create a valid x_range.
 
@@ -19,62 +25,124 @@ def validate_range(plotter, xmin: str, xmax: str) -> None | Tuple[float, float]:
         plotter: The Plotter instance.
         xmin (str): The minimum value of x.
         xmax (str): The maximum value of x.
+        variable (str): The name of the variable the range is of, used in the warning.
 
     Returns:
         tuple: The x_range as a tuple (xmin, xmax) if the input is valid, None otherwise.
 
     """
-    try:
-        x_range = float(xmin), float(xmax)
-
-    except ValueError:
-        QMessageBox.warning(plotter, "Invalid input", "Enter a valid range of x.")
-        return None
+    x_range = check_range(xmin, xmax)
+    if x_range is None:
+        QMessageBox.warning(plotter, "Invalid input", f"Enter a valid range of {variable}.")
     return x_range
 
 
-def validate_2d_function(plotter, function_string: str) -> None:
+def validate_2d_function(plotter, function_string: str) -> bool:
     """
     Validate the input function string for 2D plotting.
 
     This function checks if the input function string is valid for 2D plotting.
-    It uses regular expressions to match the allowed characters and format.
+    It parses the function with app.utils.expression_parser, see check_2d_function().
+    Several functions can be entered, separated by ';' or one per line, and they may use the free
+    parameters of PARAMETER_NAMES, which are given sliders in the window.
     If the function string is not valid, it displays a warning message using a QMessageBox.
 
     Args:
         plotter: The Plotter instance.
         function_string (str): The input function string.
 
+    Returns:
+        bool: True if the function string is valid, False otherwise.
+
     """
-    if not re.match(r"^[0-9x+\-*/^(). ]+$", function_string):
+    if not check_2d_function(function_string):
         QMessageBox.warning(plotter, "Invalid input", "Enter a valid function of x.")
+        return False
+    return True
+
+
+def validate_3d_function(plotter, function_string: str) -> bool:
+    """
+    Validate the input function string for plotting a function of x and y.
+
+    This function checks if the input function string is valid for surface, wireframe and contour plots.
+    It parses the function with app.utils.expression_parser, with x and y as the variables.
+    If the function string is not valid, it displays a warning message using a QMessageBox.
+
+    Args:
+        plotter: The Plotter instance.
+        function_string (str): The input function string.
 
+    Returns:
+        bool: True if the function string is valid, False otherwise.
 
-def parse_2d_function(function_string: str, x_range: Tuple[float, float], x_samples: int) \
-        -> Tuple[List[float], List[float]]:
+    """
+    if not check_3d_function(function_string):
+        QMessageBox.warning(plotter, "Invalid input", "Enter a valid function of x and y.")
+        return False
+    return True
+
+
+def parse_2d_function(function_string: str, x_range: Tuple[float, float], x_samples: int,
+                      sampling_mode: SamplingMode = SamplingMode.UNIFORM) -> Tuple[np.ndarray, np.ndarray]:
     """
     Parse the function string and prepare data for 2D plotting.
 
-    This function parses the input function string using sympy.
-    It replaces '^' with '**' to represent exponentiation.
-    It creates a sympy expression for the function and evaluates it at various x values.
-    The x data is generated based on the x_range and x_samples.
-    The corresponding y data is computed by substituting the x values into the function.
-    The x data and y data are returned as lists.
+    This function parses the input function string and compiles it into a chain of NumPy ufuncs,
+    without sympy, see app.utils.evaluation. Compiled functions are kept in an LRU cache keyed by
+    the normalized function string, so redrawing the same function does not parse it again.
+    The x data is generated based on the x_range, x_samples and sampling_mode, either as an evenly
+    spaced grid or as a grid refined where the curve bends, see app.utils.sampling.
+    The corresponding y data is computed by evaluating the kernel over the whole x grid in one call.
+    The x data and y data are returned as float64 arrays. For several functions, separated by ';' or
+    one per line, all of them are evaluated by one kernel over a shared x grid and the y data holds
+    one row per function.
+
+    When the on-disk cache is enabled, large samplings are kept across sessions and memory-mapped back
+    read-only instead of being evaluated again, see app.utils.disk_cache.
 
     Args:
         function_string (str): The input function string.
         x_range (tuple): The range of x as a tuple (xmin, xmax).
         x_samples (int): The number of x samples.
+        sampling_mode (SamplingMode): The way of choosing the x samples.
 
     Returns:
-        tuple: The x data and y data as lists.
+        tuple: The x data and y data as arrays.
 
     """
-    function_string = function_string.replace("^", "**")
-    x = sympy.Symbol('x')
-    function = sympy.parse_expr(function_string)
-    x_data = [x_range[0] + (x_range[1] - x_range[0]) * i / x_samples for i in range(x_samples + 1)]
-    y_data = [function.subs(x, xi) for xi in x_data]
-
+    cached = disk_cache.load(function_string, x_range, x_samples, sampling_mode)
+    if cached is not None:
+        return cached
+    function = expression_cache.get_function(function_string)
+    x_data, y_data = sample_function(function, x_range, x_samples, sampling_mode)
+    disk_cache.store(function_string, x_range, x_samples, sampling_mode, x_data, y_data)
     return x_data, y_data
+
+
+def parse_3d_function(function_string: str, x_range: Tuple[float, float], y_range: Tuple[float, float],
+                      samples: int, sampling_mode: SamplingMode = SamplingMode.UNIFORM, max_points: Optional[int] = None) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a function string of x and y and evaluate it over a grid for surface plotting.
+
+    The function is compiled into a vectorized NumPy kernel of x and y and cached like the functions
+    of x. The grid has the same number of intervals along both axes, chosen from samples and
+    sampling_mode and capped to max_points points per axis, see app.utils.surface.grid_samples, and is
+    evaluated a chunk of rows at a time.
+
+    Args:
+        function_string (str): The input function string.
+        x_range (tuple): The range of x as a tuple (xmin, xmax).
+        y_range (tuple): The range of y as a tuple (ymin, ymax).
+        samples (int): The number of samples.
+        sampling_mode (SamplingMode): The way of choosing the samples.
+        max_points (int): The maximum number of points along each axis, None for no limit.
+
+    Returns:
+        tuple: The x values, the y values and the z values as arrays, with one row of z per y value.
+
+    """
+    surface = expression_cache.get_surface(function_string)
+    intervals = grid_samples(samples, sampling_mode, max_points)
+    return sample_surface(surface, x_range, y_range, intervals, intervals)
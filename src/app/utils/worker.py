@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+
+from PySide6.QtCore import QObject, Qt, Signal
+
+from app.utils.constants import EVALUATION_WORKERS
+
+
+class EvaluationWorker(QObject):
+    """
+    Runs evaluation jobs on a thread pool and posts their results back to the GUI thread.
+
+    Every submitted job gets a new generation number. Submitting a job supersedes the previous
+    one: it is cancelled if it has not started yet, and its result is dropped if it has. Only the
+    result of the latest job is handed to its callback, which runs on the GUI thread.
+
+    A progressive job produces a sequence of results, such as coarse to fine samplings of a function.
+    Each result is handed to the callback as soon as it is ready, and the job stops producing results
+    once it is superseded or cancelled.
+
+    Signals:
+        finished (int): Emitted with the generation of a job after its callback ran.
+        failed (int, str): Emitted with the generation of a job and the error it raised.
+        busy_changed (bool): Emitted when the worker starts or stops waiting for a result.
+
+    """
+
+    finished = Signal(int)
+    failed = Signal(int, str)
+    busy_changed = Signal(bool)
+    result_ready = Signal(int, object)
+    partial_ready = Signal(int, object)
+
+    def __init__(self, max_workers: int = EVALUATION_WORKERS, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.generation = 0
+        self.future: Optional[Future] = None
+        self.callback: Optional[Callable[[Any], None]] = None
+        self.progressive = False
+        # Queued even when a job finishes before its done callback is added and the result is emitted from
+        # the GUI thread, so the result always arrives after the partial results posted before it.
+        self.result_ready.connect(self.deliver, Qt.ConnectionType.QueuedConnection)
+        self.partial_ready.connect(self.deliver_partial, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, callback: Callable[[Any], None], function: Callable, *args: Any) -> int:
+        """
+        Run a function on the thread pool, superseding the previous job.
+
+        Args:
+            callback (Callable): Called on the GUI thread with the return value of the function.
+            function (Callable): The job to run on the thread pool.
+            *args: The arguments of the function.
+
+        Returns:
+            int: The generation number of the job.
+
+        """
+        return self.start(callback, False, function, *args)
+
+    def submit_progressive(self, callback: Callable[[Any], None], function: Callable[..., Iterator], *args: Any) -> int:
+        """
+        Run a generator function on the thread pool, handing each result it yields to the callback.
+
+        The job supersedes the previous one like submit(). The generator is abandoned between two
+        results as soon as another job is submitted or the worker is cancelled.
+
+        Args:
+            callback (Callable): Called on the GUI thread with each result yielded by the function.
+            function (Callable): The generator function to run on the thread pool.
+            *args: The arguments of the function.
+
+        Returns:
+            int: The generation number of the job.
+
+        """
+        return self.start(callback, True, self.run_passes, self.generation + 1, function, *args)
+
+    def start(self, callback: Callable[[Any], None], progressive: bool, function: Callable, *args: Any) -> int:
+        """Supersede the previous job and run a new one, see submit() and submit_progressive()."""
+        self.generation += 1
+        generation = self.generation
+        if self.future is not None:
+            self.future.cancel()
+        self.callback = callback
+        self.progressive = progressive
+        self.busy_changed.emit(True)
+        self.future = self.executor.submit(function, *args)
+        self.future.add_done_callback(lambda future: self.job_done(generation, future))
+        return generation
+
+    def run_passes(self, generation: int, function: Callable[..., Iterator], *args: Any) -> None:
+        """
+        Iterate a progressive job on the thread pool, posting each result to the GUI thread.
+
+        Args:
+            generation (int): The generation number of the job.
+            function (Callable): The generator function of the job.
+            *args: The arguments of the function.
+
+        """
+        passes = function(*args)
+        try:
+            for result in passes:
+                if generation != self.generation:
+                    return
+                self.partial_ready.emit(generation, result)
+        finally:
+            passes.close()
+
+    def job_done(self, generation: int, future: Future) -> None:
+        """
+        Forward a finished job to the GUI thread, called on the thread that completed the job.
+
+        Args:
+            generation (int): The generation number of the job.
+            future (Future): The future of the job.
+
+        """
+        if not future.cancelled():
+            self.result_ready.emit(generation, future)
+
+    def deliver(self, generation: int, future: Future) -> None:
+        """
+        Hand the result of the latest job to its callback, dropping the results of superseded jobs.
+
+        Args:
+            generation (int): The generation number of the job.
+            future (Future): The future of the job.
+
+        """
+        if generation != self.generation:
+            return
+        callback = self.callback
+        self.callback = None
+        self.busy_changed.emit(False)
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(generation, str(error))
+            return
+        if not self.progressive:
+            callback(future.result())
+        self.finished.emit(generation)
+
+    def deliver_partial(self, generation: int, result: Any) -> None:
+        """
+        Hand a result of the latest progressive job to its callback, dropping those of superseded jobs.
+
+        Args:
+            generation (int): The generation number of the job.
+            result: The result yielded by the job.
+
+        """
+        if generation == self.generation and self.callback is not None:
+            self.callback(result)
+
+    def cancel(self) -> None:
+        """Abandon the latest job, dropping its result and any result it has not yielded yet."""
+        if self.callback is None:
+            return
+        self.generation += 1
+        if self.future is not None:
+            self.future.cancel()
+        self.callback = None
+        self.busy_changed.emit(False)
+
+    def is_busy(self) -> bool:
+        """Return True while the result of the latest job has not been delivered."""
+        return self.callback is not None
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and drop the result of the running one."""
+        self.generation += 1
+        self.callback = None
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from app.utils.analysis import INTERSECTION, MAXIMUM, MINIMUM, ROOT, Feature, analyze, describe, find_crossings, \
+    function_labels, refine_roots
+from app.utils.cache import expression_cache
+
+
+@pytest.mark.auto
+def test_refine_roots_all_brackets_at_once():
+    """Test the bracketed roots are refined to machine precision, even where the derivative vanishes."""
+    roots = refine_roots(lambda x: x ** 3 - 2 * x, lambda x: 3 * x ** 2 - 2, np.array([-2.0, -0.5, 1.0]),
+                         np.array([-1.0, 0.5, 2.0]))
+    np.testing.assert_allclose(roots, [-np.sqrt(2), 0, np.sqrt(2)], atol=1e-12)
+
+
+@pytest.mark.auto
+def test_find_crossings_rejects_poles():
+    """Test the sign changes of 1/x around its pole are not taken for roots."""
+    x_data = np.linspace(-1, 1, 20)
+    crossings, directions = find_crossings(lambda x: 1 / x, lambda x: -1 / x ** 2, x_data, 1 / x_data)
+    assert crossings.size == 0 and directions.size == 0
+
+
+@pytest.mark.auto
+def test_analyze_roots_and_extrema():
+    """Test the roots and the local extrema of a cubic are found and classified."""
+    features = analyze("x^3 - 3*x", (-3, 3))
+
+    assert [feature.kind for feature in features] == [ROOT, MAXIMUM, ROOT, MINIMUM, ROOT]
+    np.testing.assert_allclose([feature.x for feature in features], [-np.sqrt(3), -1, 0, 1, np.sqrt(3)], atol=1e-12)
+    assert features[1].y == pytest.approx(2) and features[3].y == pytest.approx(-2)
+
+
+@pytest.mark.auto
+def test_analyze_intersections():
+    """Test the intersections of two functions are found with the functions they belong to."""
+    features = [feature for feature in analyze("x^2; x + 2", (-5, 5)) if feature.kind == INTERSECTION]
+
+    assert [feature.curves for feature in features] == [(0, 1), (0, 1)]
+    np.testing.assert_allclose([(feature.x, feature.y) for feature in features], [(-1, 1), (2, 4)], atol=1e-12)
+
+
+@pytest.mark.auto
+def test_analyze_skips_poles_and_handles_kinks():
+    """Test poles are not reported as roots and the derivative of abs(x) can be evaluated."""
+    roots = [feature.x for feature in analyze("tan(x)", (-2, 2)) if feature.kind == ROOT]
+    assert roots == [pytest.approx(0, abs=1e-12)]
+
+    features = analyze("abs(x) - 1", (-2, 2))
+    assert [feature.kind for feature in features] == [ROOT, MINIMUM, ROOT]
+    assert expression_cache.get_derivative("abs(x) - 1")(np.array([-1.0, 1.0])).tolist() == [-1.0, 1.0]
+
+
+@pytest.mark.auto
+def test_describe_features():
+    """Test the features are described with the names of their functions."""
+    labels = function_labels("x; x^2")
+    assert labels == ["f1", "f2"] and function_labels("x") == ["f"]
+    assert describe(Feature(ROOT, 1.5, 0.0, (0,)), labels) == "root of f1 at x = 1.5"
+    assert describe(Feature(INTERSECTION, 1, 1, (0, 1)), labels) == "intersection of f1 and f2 at x = 1, y = 1"
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from app.utils.animation import BlitAnimator, FrameTimer
+
+
+@pytest.mark.auto
+def test_frame_timer(mocker):
+    """Test that the frame timer averages the frame times and the frame rate over its window."""
+    clock = mocker.patch("app.utils.animation.time.perf_counter")
+    timer = FrameTimer(window=3)
+    assert timer.summary() == "frame 0.0 ms | 0 fps"
+
+    for start in (0.0, 0.1, 0.2, 0.3):
+        clock.return_value = start
+        timer.begin()
+        clock.return_value = start + 0.002
+        timer.end()
+
+    assert timer.frame_time() == pytest.approx(0.002)
+    assert timer.frame_rate() == pytest.approx(10)
+    assert timer.summary() == "frame 2.0 ms | 10 fps"
+    timer.reset()
+    assert timer.frame_time() == 0.0
+
+
+@pytest.mark.auto
+def test_blit_animator_draws_frames_over_background():
+    """Test that the animator leaves its artists out of full draws and blits them over the background."""
+    figure = Figure()
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    line, = ax.plot([0, 1], [0, 1])
+    animator = BlitAnimator(ax, [line])
+
+    animator.frame()
+    assert line.get_animated()
+    background = np.asarray(animator.background).copy()
+
+    line.set_data([0, 1], [1, 0])
+    animator.frame()
+    np.testing.assert_array_equal(np.asarray(animator.background), background)
+    assert canvas is animator.canvas
+
+    animator.stop()
+    assert not line.get_animated()
+    assert animator.background is None
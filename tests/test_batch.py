@@ -0,0 +1,115 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from app.batch import main, read_specs, sample_spec
+from app.utils.plot_option import PlotOption
+from app.utils.sampling_mode import SamplingMode
+from app.utils.surface_option import SurfaceOption
+
+
+def write_specs(path, specs) -> str:
+    """Write plot specs to a JSON lines file and return its path."""
+    path.write_text("\n".join(json.dumps(spec) for spec in specs) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.auto
+def test_read_specs(tmp_path):
+    """Test read_specs fills in the defaults of optional fields."""
+    path = write_specs(tmp_path / "specs.jsonl", [
+        {"function": "x^2", "xmin": 0, "xmax": 1},
+        {"function": "x", "xmin": -1, "xmax": 1, "samples": 10, "plot": "stem", "sampling": "adaptive",
+         "output": "line.svg"},
+    ])
+
+    first, second = read_specs(path, "out", "png")
+
+    assert first.function == "x^2"
+    assert first.draw_option == PlotOption.PLOT
+    assert first.sampling_mode == SamplingMode.UNIFORM
+    assert first.output.endswith("plot_00001.png")
+    assert second.samples == 10
+    assert second.draw_option == PlotOption.STEM
+    assert second.sampling_mode == SamplingMode.ADAPTIVE
+    assert second.output.endswith("line.svg")
+
+
+@pytest.mark.auto
+def test_read_specs_invalid(tmp_path):
+    """Test read_specs reports the line of an invalid spec."""
+    path = write_specs(tmp_path / "specs.jsonl", [{"function": "x", "xmin": 0, "xmax": 1, "plot": "pie"}])
+
+    with pytest.raises(ValueError, match="specs.jsonl:1"):
+        list(read_specs(path, "out", "png"))
+
+
+@pytest.mark.auto
+def test_main_renders_images(tmp_path, capsys):
+    """Test the batch command renders every spec and reports the failures."""
+    path = write_specs(tmp_path / "specs.jsonl", [
+        {"function": "x^2", "xmin": -5, "xmax": 5, "plot": "scatter"},
+        {"function": "sin(x)", "xmin": 0, "xmax": 10, "plot": "step", "output": "sine.svg"},
+        {"function": "x +* 2", "xmin": 0, "xmax": 1},
+    ])
+    output_dir = tmp_path / "plots"
+
+    status = main([path, "--output-dir", str(output_dir), "--workers", "2"])
+
+    assert status == 1, "The invalid spec was not reported as a failure"
+    assert (output_dir / "plot_00001.png").read_bytes().startswith(b"\x89PNG")
+    assert b"<svg" in (output_dir / "sine.svg").read_bytes()
+    assert "Rendered 2 of 3 plots" in capsys.readouterr().out
+
+
+@pytest.mark.auto
+def test_main_renders_surfaces(tmp_path):
+    """Test the batch command renders functions of x and y, which need a range of y."""
+    path = write_specs(tmp_path / "specs.jsonl", [
+        {"function": "x^2 - y^2", "xmin": -1, "xmax": 1, "ymin": -1, "ymax": 1, "plot": "surface", "samples": 20},
+        {"function": "sin(x)*y", "xmin": 0, "xmax": 5, "ymin": 0, "ymax": 2, "plot": "contour", "output": "c.svg"},
+    ])
+    output_dir = tmp_path / "plots"
+
+    first, second = read_specs(path, str(output_dir), "png")
+    status = main([path, "--output-dir", str(output_dir), "--workers", "1"])
+
+    assert first.draw_option == SurfaceOption.SURFACE and first.y_range == (-1, 1)
+    assert second.draw_option == SurfaceOption.CONTOUR
+    assert status == 0
+    assert (output_dir / "plot_00001.png").read_bytes().startswith(b"\x89PNG")
+    assert b"<svg" in (output_dir / "c.svg").read_bytes()
+
+
+@pytest.mark.auto
+def test_batch_does_not_import_qt():
+    """Test the batch command can run on servers without Qt."""
+    code = "import sys, app.batch; sys.exit(any(name.startswith('PySide6') for name in sys.modules))"
+
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0, "app.batch imports Qt"
+
+
+@pytest.mark.auto
+def test_sample_spec_rejects_invalid_function(tmp_path):
+    """Test a spec whose function is not valid fails instead of plotting another function."""
+    path = write_specs(tmp_path / "specs.jsonl", [{"function": "1 2*x", "xmin": 0, "xmax": 1}])
+    spec, = read_specs(path, "out", "png")
+
+    with pytest.raises(ValueError, match="invalid function of x"):
+        sample_spec(spec)
+
+
+@pytest.mark.auto
+def test_specs_substitute_parameters(tmp_path):
+    """Test the parameters of a spec take the value of their field, or their starting value."""
+    path = write_specs(tmp_path / "specs.jsonl", [
+        {"function": "a*x + t", "xmin": 0, "xmax": 1, "samples": 2, "a": 3},
+        {"function": "a*x", "xmin": 0, "xmax": 1, "samples": 2},
+    ])
+    given, default = read_specs(path, "out", "png")
+
+    assert sample_spec(given)[1].tolist() == [0.0, 1.5, 3.0]
+    assert sample_spec(default)[1].tolist() == [0.0, 0.5, 1.0]
+    assert sample_spec(default._replace(function="a*x"))[1].tolist() == [0.0, 0.5, 1.0]
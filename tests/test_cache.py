@@ -0,0 +1,70 @@
+import pytest
+
+from app.utils.cache import LRUCache, ExpressionCache, normalize_function_string
+
+
+@pytest.mark.auto
+def test_lru_cache_counters():
+    """Test LRUCache counts hits, misses and evictions."""
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.get("a") == 1
+    assert cache.get("c") is None
+
+    cache.put("c", 3)
+
+    assert "b" not in cache, "The least recently used entry was not evicted"
+    assert "a" in cache and "c" in cache
+    assert cache.stats() == {"size": 2, "max_size": 2, "hits": 1, "misses": 1, "evictions": 1}
+
+
+@pytest.mark.auto
+def test_lru_cache_invalid_size():
+    """Test LRUCache rejects a size smaller than one."""
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+@pytest.mark.auto
+def test_normalize_function_string():
+    """Test normalize_function_string strips whitespace and normalizes exponentiation."""
+    assert normalize_function_string(" 2 * x ^ 2\t+ 1 ") == "2*x**2+1"
+
+
+@pytest.mark.auto
+def test_normalize_function_string_keeps_invalid_input_invalid():
+    """Test whitespace between numbers and names is kept, so invalid input does not become another function."""
+    assert normalize_function_string("1 2*x") == "1 2*x"
+    assert normalize_function_string("x  $ 1") == "x $ 1"
+    with pytest.raises(ValueError):
+        ExpressionCache(4).get_function("1 2*x")
+
+
+@pytest.mark.auto
+def test_expression_cache_reuses_compiled_function():
+    """Test equivalent function strings are parsed only once."""
+    cache = ExpressionCache(4)
+
+    first = cache.get_function("x^2 + 1")
+    second = cache.get_function("x**2+1")
+
+    assert first is second
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+@pytest.mark.auto
+def test_expression_cache_function_group_reuses_parts():
+    """Test several functions are compiled into a group built from the cached function of each part."""
+    cache = ExpressionCache(8)
+    square = cache.get_function("x^2")
+
+    group = cache.get_function(" x ^ 2 ;\nsin(x) ")
+
+    assert normalize_function_string(" x ^ 2 ;\nsin(x) ") == "x**2;sin(x)"
+    assert group.functions[0] is square, "The cached function of a part was parsed again"
+    assert cache.get_function("x^2; sin(x)") is group
+    with pytest.raises(ValueError):
+        cache.get_function(";")
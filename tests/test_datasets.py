@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from app.utils.datasets import Dataset, block_extremes, build_pyramid, load_dataset, search_sorted
+
+
+@pytest.mark.auto
+def test_block_extremes():
+    """Test each block keeps its smallest and largest finite sample in order, and undefined blocks their first sample."""
+    indices, values = block_extremes(np.array([3.0, 1.0, 2.0, 5.0, np.nan, 4.0, np.nan, np.nan, np.nan, 7.0]), 3)
+
+    assert indices.tolist() == [[0, 1], [3, 5], [6, 6], [9, 9]]
+    np.testing.assert_array_equal(values, [[3.0, 1.0], [5.0, 4.0], [np.nan, np.nan], [7.0, 7.0]])
+
+
+@pytest.mark.auto
+def test_build_pyramid():
+    """Test every level keeps the extremes of its blocks, also when the values are read in several chunks."""
+    y_data = np.random.default_rng(0).standard_normal(10_000)
+
+    levels = build_pyramid(y_data, block=16, factor=4, chunk_samples=1000)
+
+    assert [level.block for level in levels] == [16, 64, 256, 1024, 4096]
+    for level in levels:
+        assert np.all(np.diff(level.indices.ravel()) >= 0)
+        np.testing.assert_array_equal(level.values, y_data[level.indices])
+        blocks = np.pad(y_data, (0, -y_data.size % level.block), constant_values=np.nan).reshape(-1, level.block)
+        np.testing.assert_array_equal(level.values.max(axis=1), np.nanmax(blocks, axis=1))
+        np.testing.assert_array_equal(level.values.min(axis=1), np.nanmin(blocks, axis=1))
+    assert build_pyramid(np.ones(3), block=16) == []
+
+
+@pytest.mark.auto
+def test_search_sorted():
+    """Test bisection matches np.searchsorted, also on a strided column."""
+    data = np.column_stack((np.arange(10.0), np.zeros(10)))
+
+    for value in (-1, 0, 3.5, 9, 12):
+        assert search_sorted(data[:, 0], value) == np.searchsorted(data[:, 0], value)
+
+
+@pytest.mark.auto
+def test_dataset_view():
+    """Test a view holds about two samples per bin read from the pyramid, keeping the extremes of the visible range."""
+    x_data = np.linspace(0, 100, 1_000_001)
+    y_data = np.sin(x_data)
+    dataset = Dataset("sine", y_data, x_data)
+
+    x_view, y_view = dataset.view((10, 20), 200)
+
+    visible = (x_data >= 10) & (x_data <= 20)
+    assert 200 <= x_view.size <= 1000
+    assert x_view[0] <= 10 and x_view[-1] >= 20
+    assert y_view.max() == y_data[visible].max() and y_view.min() == y_data[visible].min()
+    np.testing.assert_allclose(y_view, np.sin(x_view))
+
+    x_close, y_close = dataset.view((50, 50.0005), 200)
+    np.testing.assert_array_equal(x_close, x_data[499_999:500_007])
+    assert dataset.x_range == (0.0, 100.0)
+
+
+@pytest.mark.auto
+def test_dataset_checks():
+    """Test datasets reject unsorted x values and data of the wrong shape."""
+    with pytest.raises(ValueError, match="not sorted"):
+        Dataset("unsorted", np.zeros(3), np.array([0.0, 2.0, 1.0]))
+    with pytest.raises(ValueError, match="one column"):
+        Dataset("matrix", np.zeros((3, 3)))
+    with pytest.raises(ValueError, match="empty"):
+        Dataset("empty", np.zeros(0))
+
+
+@pytest.mark.auto
+def test_load_npy_and_binary(tmp_path):
+    """Test NPY and raw binary files are memory-mapped, with x values for two columns and indices for one."""
+    x_data = np.linspace(-1, 1, 1000)
+    np.save(tmp_path / "data.npy", np.column_stack((x_data, x_data ** 2)))
+    (x_data ** 3).tofile(tmp_path / "data.bin")
+    (tmp_path / "broken.bin").write_bytes(b"12345")
+
+    npy = load_dataset(str(tmp_path / "data.npy"))
+    binary = load_dataset(str(tmp_path / "data.bin"))
+
+    assert isinstance(npy.y_data, np.memmap) and isinstance(binary.y_data, np.memmap)
+    np.testing.assert_array_equal(npy.x_data, x_data)
+    np.testing.assert_array_equal(npy.y_data, x_data ** 2)
+    assert binary.x_data is None and binary.x_range == (0.0, 999.0)
+    np.testing.assert_array_equal(binary.view((10, 12), 100)[1], (x_data ** 3)[9:14])
+    with pytest.raises(ValueError, match="whole rows"):
+        load_dataset(str(tmp_path / "broken.bin"))
+
+
+@pytest.mark.auto
+def test_load_csv(tmp_path):
+    """Test CSV files are parsed in chunks, skipping a header and sorting rows by x."""
+    rows = [f"{x},{2 * x}" for x in (3, 1, 2, 0, 5, 4)]
+    (tmp_path / "data.csv").write_text("x,y\n" + "\n".join(rows) + "\n")
+    (tmp_path / "column.txt").write_text("1.5\n2.5\n\n3.5")
+    (tmp_path / "wide.csv").write_text("1,2,3\n")
+
+    dataset = load_dataset(str(tmp_path / "data.csv"))
+    column = load_dataset(str(tmp_path / "column.txt"))
+
+    np.testing.assert_array_equal(dataset.x_data, np.arange(6))
+    np.testing.assert_array_equal(dataset.y_data, 2 * np.arange(6))
+    np.testing.assert_array_equal(column.y_data, [1.5, 2.5, 3.5])
+    with pytest.raises(ValueError, match="two columns"):
+        load_dataset(str(tmp_path / "wide.csv"))
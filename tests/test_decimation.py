@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from app.utils.decimation import minmax_decimate, sample_decimated
+
+
+@pytest.mark.auto
+def test_minmax_decimate_small_input_unchanged():
+    """Test that data with few samples per bin is not decimated."""
+    x_data = np.linspace(0, 1, 101)
+
+    x_decimated, y_decimated = minmax_decimate(x_data, x_data ** 2, 100)
+
+    np.testing.assert_array_equal(x_decimated, x_data)
+    np.testing.assert_array_equal(y_decimated, x_data ** 2)
+
+
+@pytest.mark.auto
+def test_minmax_decimate_keeps_envelope():
+    """Test that decimation keeps the extremes of every bin of an oscillating curve."""
+    x_data = np.linspace(0, 10, 1_000_001)
+    y_data = np.sin(1000 * x_data)
+    n_bins = 800
+
+    x_decimated, y_decimated = minmax_decimate(x_data, y_data, n_bins)
+
+    assert len(x_decimated) <= 2 * n_bins + 2
+    assert np.all(np.diff(x_decimated) > 0), "x data is not sorted"
+    assert y_decimated.max() == y_data.max()
+    assert y_decimated.min() == y_data.min()
+    block = -(-len(x_data) // n_bins)
+    for start in range(0, len(x_data), 97 * block):
+        kept = y_decimated[(x_decimated >= x_data[start]) & (x_decimated <= x_data[min(start + block, len(x_data)) - 1])]
+        assert kept.max() == y_data[start:start + block].max()
+        assert kept.min() == y_data[start:start + block].min()
+
+
+@pytest.mark.auto
+def test_minmax_decimate_keeps_undefined_values():
+    """Test that bins with undefined values keep one, so lines break at poles."""
+    x_data = np.linspace(-1, 1, 10_001)
+    with np.errstate(divide="ignore"):
+        y_data = 1 / x_data
+
+    x_decimated, y_decimated = minmax_decimate(x_data, y_data, 100)
+
+    assert np.isinf(y_decimated).sum() == 1
+    assert x_decimated[np.isinf(y_decimated)][0] == 0
+
+
+@pytest.mark.auto
+def test_sample_decimated():
+    """Test that sample_decimated decimates the result of the sampling function."""
+    x_data, y_data = sample_decimated(lambda n: (np.arange(n, dtype=float), np.zeros(n)), 10, 1000)
+
+    assert len(x_data) <= 22
+    assert x_data[0] == 0 and x_data[-1] == 999
+
+
+@pytest.mark.auto
+def test_minmax_decimate_several_curves():
+    """Test several curves keep the envelope of each of them on shared x data."""
+    x_data = np.linspace(0, 1, 100001)
+    y_data = np.stack((np.sin(40 * x_data), np.cos(40 * x_data)))
+
+    x_small, y_small = minmax_decimate(x_data, y_data, 100)
+
+    assert y_small.shape == (2, x_small.size)
+    assert x_small.size <= 4 * 100 + 2
+    for row, small_row in zip(y_data, y_small):
+        assert small_row.max() == row.max() and small_row.min() == row.min()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from app.utils.cache import expression_cache
+from app.utils.discontinuities import break_discontinuities, find_discontinuities, has_breaks, jump_candidates, \
+    visible_range
+from app.utils.evaluation import linear_grid
+
+
+@pytest.mark.auto
+def test_jump_candidates():
+    """Test sign changes and isolated steep steps are candidates, and intervals with undefined ends are not."""
+    rows, intervals = jump_candidates(np.array([[-2.0, -1.0, 1.0, 2.0, 3.0, 30.0, 31.0, np.nan, -1.0]]))
+
+    assert rows.tolist() == [0, 0]
+    assert intervals.tolist() == [1, 4]
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("function_string, breaks", [
+    ("1/(x - 2.1)", [2.1]),
+    ("tan(x)", [-np.pi / 2, np.pi / 2]),
+    ("abs(x - 0.55)/(x - 0.55)", [0.55]),
+    ("sin(3*x)", []),
+    ("x^3 - x", []),
+])
+def test_find_discontinuities(function_string: str, breaks):
+    """Test poles and jumps are confirmed by bisection, and roots of continuous curves are not."""
+    function = expression_cache.get_function(function_string)
+    x_data = linear_grid((-3, 3), 60)
+
+    _, intervals, x_breaks = find_discontinuities(function, x_data, function(x_data))
+
+    np.testing.assert_allclose(np.sort(x_breaks), breaks, atol=1e-5)
+    assert np.all((x_data[intervals] < x_breaks) & (x_breaks < x_data[intervals + 1]))
+
+
+@pytest.mark.auto
+def test_break_discontinuities_inserts_nan():
+    """Test a NaN sample is inserted at the pole of each curve that has one, and the others are evaluated there."""
+    function = expression_cache.get_function("1/(x - 0.3); x")
+    x_data = linear_grid((-1, 1), 20)
+
+    x_broken, y_broken = break_discontinuities(function, x_data, function(x_data))
+
+    assert x_broken.size == x_data.size + 1 and np.all(np.diff(x_broken) > 0)
+    index = int(np.flatnonzero(np.isnan(y_broken[0]))[0])
+    assert x_broken[index] == pytest.approx(0.3, abs=1e-6)
+    assert y_broken[1, index] == x_broken[index]
+    assert has_breaks(y_broken)
+
+
+@pytest.mark.auto
+def test_break_discontinuities_replaces_infinite_values():
+    """Test infinite values are replaced with NaN, and a curve without discontinuities is left unchanged."""
+    x_data = np.array([-1.0, 0.0, 1.0])
+
+    _, y_data = break_discontinuities(lambda x: np.abs(np.log(np.abs(x))), x_data, np.array([0.0, np.inf, 0.0]))
+    x_line, y_line = break_discontinuities(lambda x: 2 * x, x_data, 2 * x_data)
+
+    np.testing.assert_array_equal(y_data, [0.0, np.nan, 0.0])
+    np.testing.assert_array_equal(x_line, x_data)
+    np.testing.assert_array_equal(y_line, 2 * x_data)
+
+
+@pytest.mark.auto
+def test_has_breaks():
+    """Test single undefined samples are breaks, and undefined stretches such as the domain of sqrt(x) are not."""
+    assert has_breaks(np.array([1.0, np.nan, 2.0]))
+    assert not has_breaks(np.array([np.nan, np.nan, 1.0, 2.0]))
+    assert not has_breaks(np.array([1.0, 2.0]))
+
+
+@pytest.mark.auto
+def test_visible_range():
+    """Test the visible range leaves out the values close to an asymptote but keeps the whole of a bounded curve."""
+    x_data = linear_grid((-10, 10), 1000)
+    bottom, top = visible_range(1 / (x_data - 2.01))
+    assert -5 < bottom < -1 and 1 < top < 5
+
+    assert visible_range(np.sin(x_data)) == (pytest.approx(-1, abs=1e-3), pytest.approx(1, abs=1e-3))
+    assert visible_range(np.array([np.nan])) is None
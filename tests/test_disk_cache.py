@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.utils import validation
+from app.utils.disk_cache import DiskCache
+from app.utils.sampling_mode import SamplingMode
+from app.utils.validation import parse_2d_function
+
+
+def store_entry(cache: DiskCache, function_string: str, used: float) -> None:
+    """Store a sampling of 100 samples and set the time it was last used."""
+    x_data = np.linspace(0, 1, 101)
+    cache.store(function_string, (0, 1), 100, SamplingMode.UNIFORM, x_data, x_data * 2)
+    key = cache.key(function_string, (0, 1), 100, SamplingMode.UNIFORM)
+    for name in ("x", "y"):
+        os.utime(cache.path(key, name), (used, used))
+
+
+@pytest.mark.auto
+def test_disk_cache_round_trip(tmp_path):
+    """Test stored samples are loaded back memory-mapped and read-only."""
+    cache = DiskCache(str(tmp_path), min_samples=1)
+    x_data = np.linspace(0, 1, 11)
+    y_data = np.vstack([x_data, x_data ** 2])
+    cache.store("x; x^2", (0, 1), 10, SamplingMode.UNIFORM, x_data, y_data)
+
+    cached = cache.load("x;x**2", (0, 1), 10, SamplingMode.UNIFORM)
+
+    assert cached is not None, "An equivalent spelling of the function missed the cache"
+    assert all(isinstance(data, np.memmap) and not data.flags.writeable for data in cached)
+    np.testing.assert_array_equal(cached[0], x_data)
+    np.testing.assert_array_equal(cached[1], y_data)
+    assert cache.load("x; x^2", (0, 2), 10, SamplingMode.UNIFORM) is None
+    assert cache.load("x; x^2", (0, 1), 10, SamplingMode.ADAPTIVE) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.auto
+def test_disk_cache_key_includes_engine_version(monkeypatch):
+    """Test bumping the engine version changes every key."""
+    key = DiskCache.key("x^2", (0, 1), 10, SamplingMode.UNIFORM)
+    monkeypatch.setattr("app.utils.disk_cache.ENGINE_VERSION", "next")
+    assert DiskCache.key("x^2", (0, 1), 10, SamplingMode.UNIFORM) != key
+
+
+@pytest.mark.auto
+def test_disk_cache_skips_small_samplings_and_disabled_cache(tmp_path):
+    """Test small samplings are not stored, and a cache without a directory does nothing."""
+    cache = DiskCache(str(tmp_path), min_samples=1000)
+    x_data = np.linspace(0, 1, 11)
+    cache.store("x", (0, 1), 10, SamplingMode.UNIFORM, x_data, x_data)
+    assert cache.size() == 0
+
+    disabled = DiskCache(None)
+    disabled.store("x", (0, 1), 10, SamplingMode.UNIFORM, x_data, x_data)
+    assert disabled.load("x", (0, 1), 10, SamplingMode.UNIFORM) is None
+
+
+@pytest.mark.auto
+def test_disk_cache_removes_temporary_files_on_failure(tmp_path, mocker):
+    """Test a failed write leaves no temporary file behind and stores nothing."""
+    cache = DiskCache(str(tmp_path), min_samples=1)
+    x_data = np.linspace(0, 1, 11)
+    mocker.patch("app.utils.disk_cache.os.replace", side_effect=OSError("disk full"))
+
+    cache.store("x", (0, 1), 10, SamplingMode.UNIFORM, x_data, x_data)
+
+    assert os.listdir(tmp_path) == []
+    mocker.patch("app.utils.disk_cache.np.save", side_effect=OSError("disk full"))
+    cache.store("x", (0, 1), 10, SamplingMode.UNIFORM, x_data, x_data)
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.auto
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    """Test the least recently used entries are deleted once the cache exceeds its size."""
+    cache = DiskCache(str(tmp_path), min_samples=1)
+    store_entry(cache, "x", used=1000)
+    cache.max_bytes = cache.size() * 2
+    store_entry(cache, "2*x", used=2000)
+    store_entry(cache, "3*x", used=3000)
+
+    assert cache.evictions == 1
+    assert cache.load("x", (0, 1), 100, SamplingMode.UNIFORM) is None, "The oldest entry was not evicted"
+    assert cache.load("2*x", (0, 1), 100, SamplingMode.UNIFORM) is not None
+    assert cache.size() <= cache.max_bytes
+
+
+@pytest.mark.auto
+def test_parse_2d_function_uses_disk_cache(tmp_path, monkeypatch, mocker):
+    """Test a sampling found on disk is not evaluated again."""
+    monkeypatch.setattr(validation, "disk_cache", DiskCache(str(tmp_path), min_samples=1))
+    x_data, y_data = parse_2d_function("x^2 - 1", (0, 2), 20)
+    get_function = mocker.spy(validation.expression_cache, "get_function")
+
+    x_cached, y_cached = parse_2d_function("x^2 - 1", (0, 2), 20)
+
+    get_function.assert_not_called()
+    assert isinstance(y_cached, np.memmap)
+    np.testing.assert_array_equal(x_cached, x_data)
+    np.testing.assert_array_equal(y_cached, y_data)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+import sympy
+
+from app.utils.evaluation import CompiledFunction, FunctionGroup, x_symbol, compile_function, linear_grid, split_functions
+
+
+@pytest.fixture(params=["2*x + 3", "x^3 - 2*x^2 + x - 7", "(x^2 + 1)/(x - 0.5)", "sin(x)*exp(-x/4)", "sqrt(x^2 + 1)", "5"])
+def function_string(request):
+    """Fixture to provide function strings to compare against the symbolic path."""
+    return request.param
+
+
+@pytest.mark.auto
+def test_compiled_function_matches_symbolic(function_string: str):
+    """Test that the vectorized kernel agrees with per-point sympy substitution."""
+    function = compile_function(function_string)
+    x_data = linear_grid((-10, 10), 100)
+
+    y_vectorized = function(x_data)
+    y_symbolic = function.evaluate_symbolic(x_data)
+
+    assert function.vectorized
+    assert y_vectorized.dtype == np.float64
+    assert y_vectorized.shape == x_data.shape
+    np.testing.assert_allclose(y_vectorized, y_symbolic, rtol=1e-12)
+
+
+@pytest.mark.auto
+def test_compiled_function_not_real_is_nan():
+    """Test that points where the function is not real evaluate to NaN."""
+    function = compile_function("x^0.5")
+
+    y_data = function(np.array([-4.0, 4.0]))
+
+    assert np.isnan(y_data[0])
+    assert y_data[1] == 2.0
+
+
+@pytest.mark.auto
+def test_compiled_function_falls_back_to_symbolic():
+    """Test that expressions the kernel cannot evaluate use the symbolic path."""
+    function = CompiledFunction(x_symbol())
+    function.kernel = lambda x: sympy.Symbol('not_a_number') + x
+
+    y_data = function(np.array([1.0, 2.0]))
+
+    assert not function.vectorized
+    np.testing.assert_array_equal(y_data, [1.0, 2.0])
+
+
+@pytest.mark.auto
+def test_linear_grid():
+    """Test linear_grid includes both ends of the range."""
+    x_data = linear_grid((0, 10), 5)
+
+    np.testing.assert_array_equal(x_data, [0.0, 2.0, 4.0, 6.0, 8.0, 10.0])
+
+
+@pytest.mark.auto
+def test_split_functions():
+    """Test several functions are split on ';' and new lines, dropping empty parts."""
+    assert split_functions(" x^2 ; 2*x\n\n5;") == ["x^2", "2*x", "5"]
+
+
+@pytest.mark.auto
+def test_function_group_shares_subexpressions():
+    """Test a FunctionGroup evaluates all its functions on a shared grid, computing common subexpressions once."""
+    functions = [compile_function(function_string) for function_string in ("sin(x)^2", "x*sin(x)", "3")]
+    group = FunctionGroup(functions)
+    x_data = linear_grid((0, 4), 8)
+
+    y_data = group(x_data)
+
+    assert y_data.shape == (3, 9)
+    for row, function in zip(y_data, functions):
+        np.testing.assert_allclose(row, function(x_data))
+    assert group.vectorized
+    sines = [function for function, _ in group.kernel.instructions if function is np.sin]
+    assert len(sines) == 1, "The common subexpression was not eliminated"
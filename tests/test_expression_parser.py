@@ -0,0 +1,143 @@
+import pickle
+
+import numpy as np
+import pytest
+import sympy
+
+from app.utils.expression_parser import FUNCTIONS, MAX_DEPTH, ExpressionError, Kernel, Negation, Number, Operation, \
+    Variable, parse_expression, parse_functions, tokenize
+
+
+@pytest.mark.auto
+def test_tokenize():
+    """Test numbers, names and operators are split with their positions, and '**' is read as '^'."""
+    tokens = tokenize("2.5e-1*x ** sin(.5)")
+
+    assert [(token.kind, token.text, token.position) for token in tokens] == [
+        ("number", "2.5e-1", 0), ("*", "*", 6), ("name", "x", 7), ("^", "**", 9), ("name", "sin", 12),
+        ("(", "(", 15), ("number", ".5", 16), (")", ")", 18), ("end", "", 19),
+    ]
+
+
+@pytest.mark.auto
+def test_parse_precedence():
+    """Test the precedences and associativities of the operators."""
+    x = Variable("x")
+
+    assert parse_expression("1 + 2*x") == Operation("+", Number(1), Operation("*", Number(2), x))
+    assert parse_expression("x - 1 - 2") == Operation("-", Operation("-", x, Number(1)), Number(2))
+    assert parse_expression("x^2^3") == Operation("^", x, Operation("^", Number(2), Number(3)))
+    assert parse_expression("-x^2") == Negation(Operation("^", x, Number(2)))
+    assert parse_expression("x^-2") == Operation("^", x, Negation(Number(2)))
+    assert parse_expression("+(x)") == x
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("text, message, position", [
+    ("2*x + @", "unexpected character '@'", 6),
+    ("x +* 2", "expected a number, a name or '(' but found '*'", 3),
+    ("(x + 1", "expected ')' but found the end", 6),
+    ("x + 1)", "expected an operator but found ')'", 5),
+    ("2 x", "expected an operator but found 'x'", 2),
+    ("foo(x)", "unknown name 'foo'", 0),
+    ("y + 1", "unknown name 'y'", 0),
+    ("sin x", "expected '(' but found 'x'", 4),
+    ("", "expected a number, a name or '(' but found the end", 0),
+])
+def test_parse_errors(text: str, message: str, position: int):
+    """
+    Test invalid expressions raise an error at the position of the offending token.
+
+    Args:
+        text (str): The invalid expression.
+        message (str): The expected message.
+        position (int): The expected position.
+
+    """
+    with pytest.raises(ExpressionError) as error:
+        parse_expression(text)
+
+    assert error.value.message == message
+    assert error.value.position == position
+    assert str(error.value) == f"{message} at column {position + 1}"
+    copy = pickle.loads(pickle.dumps(error.value))
+    assert (copy.message, copy.position, str(copy)) == (message, position, str(error.value))
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("text", ["(" * 5000 + "x" + ")" * 5000, "-" * 5000 + "x", "+".join(["x"] * 5000), "x^" * 5000 + "x"])
+def test_parse_deep_nesting(text: str):
+    """
+    Test expressions nested thousands of levels deep raise an ExpressionError rather than a RecursionError.
+
+    Args:
+        text (str): The deeply nested expression.
+
+    """
+    with pytest.raises(ExpressionError) as error:
+        parse_expression(text)
+
+    assert error.value.message == f"the expression is nested more than {MAX_DEPTH} levels deep"
+    assert Kernel(parse_expression("(" * 150 + "x" + ")" * 150 + "+1" * 40))(2.0) == 42.0
+
+
+@pytest.mark.auto
+def test_parse_functions_positions():
+    """Test the errors of several functions are positioned in the whole input string."""
+    assert len(parse_functions("x; x^2\nsin(x);")) == 3
+    with pytest.raises(ExpressionError) as error:
+        parse_functions("x^2; 2*x + )")
+    assert error.value.position == 11
+    with pytest.raises(ExpressionError):
+        parse_functions(" ; ")
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("text", ["2*x + 3", "x^3 - 2*x^2 + x - 7", "(x^2 + 1)/(x - 0.5)", "sin(x)*exp(-x/4)", "x^0.5",
+                                  "sqrt(x^2 + 1) - abs(x)", "log(x^4) + tan(x)/cosh(x)", "atan(x)^-1 + 2^x", "pi*E - x**3"])
+def test_kernel_matches_sympy(text: str):
+    """
+    Test kernels agree with the sympy expression lambdified with NumPy.
+
+    Args:
+        text (str): The expression.
+
+    """
+    x_data = np.linspace(-5, 5, 101)
+    with np.errstate(all="ignore"):
+        expected = sympy.lambdify(sympy.Symbol("x"), sympy.parse_expr(text.replace("^", "**")), "numpy")(x_data)
+        y_data = Kernel(parse_expression(text))(x_data)
+
+    np.testing.assert_allclose(y_data, expected, rtol=1e-12)
+
+
+@pytest.mark.auto
+def test_kernel_folds_constants_and_shares_subtrees():
+    """Test subtrees without variables are computed when compiling and shared subtrees once per call."""
+    kernel = Kernel([parse_expression("sin(x)^2 + 2*pi"), parse_expression("sin(x)*sqrt(4)"), parse_expression("3")])
+    steps = [function for function, _ in kernel.instructions]
+
+    values = kernel(np.array([0.0, np.pi / 2]))
+
+    assert steps.count(np.sin) == 1
+    assert kernel.constants[kernel.outputs[2]] == 3
+    np.testing.assert_allclose(values[0], [2 * np.pi, 1 + 2 * np.pi])
+    np.testing.assert_allclose(values[1], [0, 2])
+    assert values[2] == 3
+
+
+@pytest.mark.auto
+def test_kernel_variables():
+    """Test kernels take their variables in order, as arrays or scalars."""
+    kernel = Kernel(parse_expression("a*x - y", ("x", "y", "a")), ("x", "y", "a"))
+
+    np.testing.assert_array_equal(kernel(np.array([1.0, 2.0]), np.array([[0.0], [1.0]]), 3.0), [[3, 6], [2, 5]])
+
+
+@pytest.mark.auto
+def test_functions_have_sympy_names():
+    """Test the functions of the language have the same meaning for sympy, which parses them for symbolic features."""
+    x_data = np.linspace(0.1, 0.9, 5)
+    for name, function in FUNCTIONS.items():
+        expected = sympy.lambdify(sympy.Symbol("x"), sympy.parse_expr(f"{name}(x)"), "numpy")(x_data)
+        np.testing.assert_allclose(function(x_data), expected, err_msg=name)
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from app.utils.instrumentation import Instrumentation, NULL_TIMER
+
+
+@pytest.mark.auto
+def test_stages_and_counters_are_added_to_the_active_trace():
+    """Test stage timings and counters are recorded in the trace active on the thread."""
+    instrumentation = Instrumentation()
+    trace = instrumentation.begin("draw")
+
+    with instrumentation.activate(trace):
+        with instrumentation.stage("parse"):
+            pass
+        with instrumentation.stage("parse"):
+            pass
+        instrumentation.count("samples", 101)
+        instrumentation.count("artists")
+    instrumentation.count("samples", 5)
+
+    assert list(trace.stages) == ["parse"]
+    assert trace.stages["parse"] >= 0
+    assert trace.counters == {"samples": 101, "artists": 1}, "Counts outside of the trace were recorded"
+    assert instrumentation.active() is None, "The trace is still active after the block"
+
+
+@pytest.mark.auto
+def test_call_activates_the_trace():
+    """Test call() runs a function with the trace active, as the evaluation worker does."""
+    instrumentation = Instrumentation()
+    trace = instrumentation.begin("draw")
+
+    def job(value):
+        with instrumentation.stage("sample"):
+            return value * 2
+
+    assert instrumentation.call(trace, job, 21) == 42
+    assert "sample" in trace.stages
+
+
+@pytest.mark.auto
+def test_disabled_instrumentation_records_nothing():
+    """Test a disabled instrumentation starts no traces and times stages with the shared no-op timer."""
+    instrumentation = Instrumentation(enabled=False)
+    trace = instrumentation.begin("draw")
+
+    with instrumentation.activate(trace):
+        assert instrumentation.stage("parse") is NULL_TIMER
+        instrumentation.count("samples")
+
+    assert trace is None
+    instrumentation.finish(trace)
+    assert instrumentation.last is None
+
+
+@pytest.mark.auto
+def test_finish_writes_json_lines(tmp_path):
+    """Test finished traces are kept as the last trace and appended to the log as JSON lines."""
+    log_path = tmp_path / "trace.jsonl"
+    instrumentation = Instrumentation(log_path=str(log_path))
+    for name in ("draw", "resample"):
+        trace = instrumentation.begin(name)
+        trace.add_time("sample", 0.5)
+        trace.add_count("samples", 10)
+        instrumentation.finish(trace)
+
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [record["name"] for record in records] == ["draw", "resample"]
+    assert records[0]["stages_ms"] == {"sample": 500.0}
+    assert records[0]["counters"] == {"samples": 10}
+    assert instrumentation.last is trace
+    assert trace.summary() == "resample: sample 500.0 ms | 10 samples"
@@ -0,0 +1,113 @@
+import logging
+
+import numpy as np
+import pytest
+import sympy
+
+from app.utils.evaluation import compile_function
+from app.utils.expression_parser import Kernel, Number, Variable, parse_expression
+from app.utils.optimization import fold_constants, kernel_operations, optimize_expression, optimize_tree, simplify_tree
+
+
+@pytest.mark.auto
+def test_fold_constants():
+    """Test constant subexpressions are evaluated and complex constants are left alone."""
+    x = sympy.Symbol('x')
+    folded = fold_constants(sympy.sqrt(2) * x + sympy.sin(1))
+    assert not folded.atoms(sympy.Pow, sympy.sin), "A constant was not folded"
+    assert float(folded.subs(x, 1)) == pytest.approx(np.sqrt(2) + np.sin(1))
+    assert fold_constants(sympy.log(-1) * x) == sympy.log(-1) * x
+
+
+@pytest.mark.auto
+def test_optimize_expression_reduces_operations():
+    """Test a simplification is kept only when it makes the expression cheaper."""
+    x = sympy.Symbol('x')
+    expression = x * sympy.sin(x) + x * sympy.cos(x) + x
+    optimized = optimize_expression(expression)
+    assert sympy.count_ops(optimized) < sympy.count_ops(expression)
+    assert sympy.simplify(optimized - expression) == 0
+    assert optimize_expression(x ** 2 + 1) == x ** 2 + 1
+
+
+@pytest.mark.auto
+def test_optimize_expression_time_budget(mocker):
+    """Test no simplification is started once the time budget is spent."""
+    factor_terms = mocker.spy(sympy, "factor_terms")
+    x = sympy.Symbol('x')
+    assert optimize_expression(x * sympy.sin(x) + x, time_budget=-1) == x * sympy.sin(x) + x
+    factor_terms.assert_not_called()
+
+
+@pytest.mark.auto
+def test_optimize_expression_logs_operation_counts(caplog):
+    """Test the operation counts before and after optimizing are logged at the debug level."""
+    x = sympy.Symbol('x')
+    expression = sympy.sin(x) ** 2 + sympy.sin(x) ** 3
+    with caplog.at_level(logging.DEBUG, logger="app.utils.optimization"):
+        optimize_expression(expression)
+    assert f"{sympy.count_ops(expression)} operations before, {kernel_operations([expression])} after" in caplog.text
+
+
+@pytest.mark.auto
+def test_compiled_kernel_computes_shared_subterms_once():
+    """Test the kernel of a function with a repeated subterm computes it once and gives the same values."""
+    function = compile_function("(x^2+1)*(x^2+1)/(x^2+1)^3 + (x^2+1)")
+    additions = [operands for operation, operands in function.kernel.instructions if operation is np.add]
+    assert len(additions) == 2, "The repeated subterm was not eliminated"
+    x_data = np.linspace(-3, 3, 13)
+    np.testing.assert_allclose(function(x_data), 1 / (x_data ** 2 + 1) + x_data ** 2 + 1)
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("function_string, simplified", [
+    ("x + x + 2*x - 3", "4*x - 3"),
+    ("a*x/a", "x"),
+    ("x - (x - 1)", "1"),
+    ("-x*-x", "x^2"),
+    ("2*3*x^2*x", "6*x^3"),
+])
+def test_simplify_tree(function_string, simplified):
+    """Test like terms and like factors are combined and numbers are folded."""
+    assert simplify_tree(parse_expression(function_string, ("x", "a"))) == parse_expression(simplified, ("x", "a"))
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("function_string", [
+    "3+(x-2)", "2+(x+1)", "x+3+(x*x-2)", "1-(x-4)", "-(x+1)+(x^2+2)", "2*x-(3-x)+(5-x*x)",
+    "(x+1)*(x-1)/(x+1)", "-x*-x*-x", "(x^2+1)^2/(x^2+1)^3 - (1-x)", "x/(2*x)/(x^-1)",
+    "sin(x+x)+(2-sin(2*x))", "exp(-x)*exp(-x)^-1+(x-0.5)^2", "(1+(2+(3+x)))-(4-(x-5))", "x^0.5*(x+1)-(x^0.5+3)",
+])
+def test_simplify_tree_keeps_values(function_string):
+    """Test the simplified kernel gives the values of the unsimplified kernel over a grid."""
+    tree = parse_expression(function_string, ("x",))
+    x_data = np.linspace(-2.3, 2.7, 51)
+    with np.errstate(all="ignore"):
+        expected = np.broadcast_to(Kernel(tree, ("x",))(x_data), x_data.shape)
+        values = np.broadcast_to(Kernel(simplify_tree(tree), ("x",))(x_data), x_data.shape)
+    defined = np.isfinite(expected) & np.isfinite(values)
+    assert defined.sum() > 20
+    np.testing.assert_allclose(values[defined], expected[defined], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(compile_function(function_string)(x_data)[defined], expected[defined], rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.auto
+def test_optimize_tree_simplifies_plotted_functions(caplog):
+    """Test compiled functions are simplified, with the kernel steps before and after logged at the debug level."""
+    function_string = "(x^2+1)*(x^2+1)/(x^2+1)^3 + (x^2+1)"
+    tree = parse_expression(function_string, ("x",))
+    with caplog.at_level(logging.DEBUG, logger="app.utils.optimization"):
+        function = compile_function(function_string)
+    assert function.tree == simplify_tree(tree)
+    assert function.kernel.steps < Kernel(tree, ("x",)).steps
+    assert f"{Kernel(tree, ('x',)).steps} kernel steps before, {function.kernel.steps} after" in caplog.text
+    x_data = np.linspace(-3, 3, 13)
+    np.testing.assert_allclose(function(x_data), 1 / (x_data ** 2 + 1) + x_data ** 2 + 1)
+
+
+@pytest.mark.auto
+def test_optimize_tree_keeps_trees_it_cannot_shorten():
+    """Test a tree is left as it is when simplifying it does not save operations."""
+    tree = parse_expression("sqrt(x)^0.5 + 1", ("x",))
+    assert optimize_tree(tree) is tree
+    assert simplify_tree(Variable("x")) == Variable("x") and simplify_tree(Number(2.0)) == Number(2.0)
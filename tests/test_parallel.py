@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.utils.cache import expression_cache
+from app.utils.parallel import ParallelEvaluator
+
+
+@pytest.mark.auto
+def test_parallel_evaluator_matches_single_call(mocker):
+    """Test a large array is evaluated in chunks, giving the same values as one call."""
+    function = expression_cache.get_function("sin(x)*x")
+    evaluate = mocker.spy(function, "evaluate_vectorized")
+    evaluator = ParallelEvaluator(threads=4, chunk_samples=1000, min_samples=2000)
+    x_data = np.linspace(-10, 10, 10_001)
+
+    y_data = evaluator(function, x_data)
+
+    assert evaluate.call_count == 11, "The array was not split into chunks"
+    np.testing.assert_array_equal(y_data, np.sin(x_data) * x_data)
+
+
+@pytest.mark.auto
+def test_parallel_evaluator_several_functions():
+    """Test the chunks of several functions fill one row of values per function."""
+    evaluator = ParallelEvaluator(threads=3, chunk_samples=100, min_samples=200)
+    x_data = np.linspace(0, 1, 1001)
+
+    y_data = evaluator(expression_cache.get_function("x; x^2"), x_data)
+
+    assert y_data.shape == (2, 1001)
+    np.testing.assert_allclose(y_data, [x_data, x_data ** 2])
+
+
+@pytest.mark.auto
+def test_parallel_evaluator_falls_back_to_one_call(mocker):
+    """Test small arrays, and any array with a single thread, are evaluated in one call."""
+    function = mocker.Mock(side_effect=lambda x_data: x_data * 2)
+    x_data = np.arange(5000, dtype=np.float64)
+
+    ParallelEvaluator(threads=4, chunk_samples=1000, min_samples=10_000)(function, x_data)
+    ParallelEvaluator(threads=1, chunk_samples=1000, min_samples=2000)(function, x_data)
+
+    assert function.call_count == 2
+
+
+@pytest.mark.auto
+def test_parallel_evaluator_set_threads():
+    """Test changing the number of threads replaces the thread pool."""
+    evaluator = ParallelEvaluator(threads=2)
+    pool = evaluator.pool()
+    evaluator.set_threads(4)
+    assert evaluator.threads == 4
+    assert evaluator.pool() is not pool
+    evaluator.set_threads(0)
+    assert evaluator.threads == 1
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.utils.cache import ExpressionCache
+from app.utils.constants import PARAMETER_MAX, PARAMETER_MIN, PARAMETER_STEPS
+from app.utils.parameters import compile_parametric, default_value, find_parameters, slider_position, slider_value, \
+    substitute_parameters
+
+
+@pytest.mark.auto
+def test_find_parameters():
+    """Test that the free parameters are found by name, ignoring x and the names of functions."""
+    assert find_parameters("a*sin(b*x) + c") == ["a", "b", "c"]
+    assert find_parameters("sqrt(x) + t; k*x") == ["k", "t"]
+    assert find_parameters("exp(x) + tan(x)") == []
+
+
+@pytest.mark.auto
+def test_substitute_parameters():
+    """Test that the parameters are replaced with their values in parentheses, leaving other names alone."""
+    assert substitute_parameters("a*sin(x) + t", {"a": -2.5, "t": 0.0}) == "(-2.5)*sin(x) + (0.0)"
+
+
+@pytest.mark.auto
+def test_slider_mapping():
+    """Test that slider positions and parameter values map onto each other."""
+    assert slider_position(PARAMETER_MIN) == 0
+    assert slider_position(PARAMETER_MAX) == PARAMETER_STEPS
+    assert slider_value(slider_position(default_value("a"))) == pytest.approx(default_value("a"))
+    assert slider_value(slider_position(default_value("t"))) == 0.0
+
+
+@pytest.mark.auto
+def test_parametric_function_matches_substitution():
+    """Test that evaluating the compiled parameters agrees with compiling the substituted function."""
+    x_data = np.linspace(-3, 3, 101)
+    values = {"a": 2.0, "t": 0.5}
+    function = compile_parametric("a*sin(x - t); x^2 + a")
+
+    y_data = function(x_data, values)
+
+    assert function.parameters == ["a", "t"]
+    assert y_data.shape == (2, x_data.size)
+    np.testing.assert_allclose(y_data[0], 2 * np.sin(x_data - 0.5))
+    np.testing.assert_allclose(y_data[1], x_data ** 2 + 2)
+
+
+@pytest.mark.auto
+def test_parametric_function_is_cached():
+    """Test that the expression cache compiles a parametric function once per normalized string."""
+    cache = ExpressionCache(4)
+    function = cache.get_parametric("a * x^2")
+
+    assert cache.get_parametric("a*x**2") is function
+    np.testing.assert_allclose(function(np.array([1.0, 2.0]), {"a": 3.0}), [3.0, 12.0])
@@ -1,12 +1,23 @@
 import pytest
 import unittest.mock as mock
 
+import numpy as np
+
 from PySide6.QtWidgets import QHBoxLayout
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
 from app.plotter import Plotter
+from app.utils.cache import expression_cache
 from app.utils.constants import ZOOM_IN, ZOOM_OUT
 from app.utils.plot_option import PlotOption
+from app.utils.sampling_mode import SamplingMode
+from app.utils.parameters import slider_position
+from app.utils.surface_option import SurfaceOption
+
+
+def wait_for_worker(plotter: Plotter, qtbot) -> None:
+    """Wait until the worker delivered the result of the latest job to the plotter."""
+    qtbot.waitUntil(lambda: not plotter.worker.is_busy(), timeout=5000)
 
 
 @pytest.mark.plotter
@@ -31,6 +42,7 @@ def test_create_widgets(plotter: Plotter):
     assert plotter.zoom_out_button is not None, "Zoom out button is not created"
     assert plotter.samples_label is not None, "Samples label is not created"
     assert plotter.samples_slider is not None, "Samples slider is not created"
+    assert plotter.sampling_combo is not None, "Sampling combo box is not created"
     assert plotter.scatter_button is not None, "Scatter button is not created"
     assert plotter.bar_button is not None, "Bar button is not created"
     assert plotter.stem_button is not None, "Stem button is not created"
@@ -73,6 +85,7 @@ def test_connect_signals(plotter: Plotter):
     assert plotter.stem_button.clicked is not None, "stem_button signal is not connected"
     assert plotter.step_button.clicked is not None, "step_button signal is not connected"
     assert plotter.samples_slider.sliderReleased is not None, "samples_slider signal is not connected"
+    assert plotter.sampling_combo.currentIndexChanged is not None, "sampling_combo signal is not connected"
     assert plotter.zoom_in_button.clicked is not None, "zoom_in_button signal is not connected"
     assert plotter.zoom_out_button.clicked is not None, "zoom_out_button signal is not connected"
 
@@ -99,8 +112,9 @@ def test_prepare_to_draw(plotter: Plotter):
     x_data, y_data = plotter.prepare_to_draw()
 
     # Perform assertions
-    assert isinstance(x_data, list), "x_data is not a list"
-    assert isinstance(y_data, list), "y_data is not a list"
+    assert isinstance(x_data, np.ndarray), "x_data is not an array"
+    assert isinstance(y_data, np.ndarray), "y_data is not an array"
+    assert y_data.dtype == np.float64, "y_data is not float64"
     assert len(x_data) == 101, "Unexpected length of x_data"
     assert len(y_data) == 101, "Unexpected length of y_data"
     assert x_data[0] == 0, "Unexpected start value of x_data"
@@ -110,7 +124,7 @@ def test_prepare_to_draw(plotter: Plotter):
 
 
 @pytest.mark.plotter
-def test_draw(plotter: Plotter):
+def test_draw(plotter: Plotter, qtbot):
     """
     Test the draw() method.
 
@@ -119,32 +133,37 @@ def test_draw(plotter: Plotter):
 
     Args:
         plotter (Plotter): The Plotter instance.
-        mocker: The mocker fixture from pytest.
+        qtbot: The qtbot fixture from pytest-qt.
 
     """
-    test_draw_option(plotter, PlotOption.PLOT)
-    test_draw_option(plotter, PlotOption.SCATTER)
-    test_draw_option(plotter, PlotOption.BAR)
-    test_draw_option(plotter, PlotOption.STEM)
-    test_draw_option(plotter, PlotOption.STEP)
+    test_draw_option(plotter, PlotOption.PLOT, qtbot)
+    test_draw_option(plotter, PlotOption.SCATTER, qtbot)
+    test_draw_option(plotter, PlotOption.BAR, qtbot)
+    test_draw_option(plotter, PlotOption.STEM, qtbot)
+    test_draw_option(plotter, PlotOption.STEP, qtbot)
 
 
 @pytest.mark.plotter
-def test_draw_option(plotter: Plotter, draw_option: PlotOption):
+def test_draw_option(plotter: Plotter, draw_option: PlotOption, qtbot):
     """
     Test the draw() method with a specific draw_option.
 
-    This function calls the draw() method with the specified draw_option and asserts that the draw_option
-    value is updated correctly.
+    This function calls the draw() method with the specified draw_option, waits for the worker to deliver
+    the data and asserts that the draw_option value is updated correctly.
 
     Args:
         plotter (Plotter): The Plotter instance.
         draw_option (PlotOption): The draw_option value to test.
+        qtbot: The qtbot fixture from pytest-qt.
 
     """
-    with mock.patch.object(Plotter, 'prepare_to_draw', return_value=([1, 2, 3], [4, 5, 6])):
+    inputs = ("x", (1.0, 3.0), 2, SamplingMode.UNIFORM)
+    with mock.patch.object(Plotter, 'read_inputs', return_value=inputs), \
+            mock.patch('app.plotter.parse_2d_function', return_value=([1, 2, 3], [4, 5, 6])):
         plotter.draw(draw_option)
+        wait_for_worker(plotter, qtbot)
         assert plotter.draw_option == draw_option, f"Unexpected draw_option value after {draw_option}"
+        assert plotter.renderers[draw_option].artists, f"Nothing was plotted for {draw_option}"
 
 
 @pytest.mark.plotter
@@ -162,7 +181,7 @@ def test_zoom(plotter: Plotter, mocker):
     """
     # Mock the FigureCanvas and Figure objects
     mocker.patch.object(FigureCanvas, '__init__', return_value=None)
-    mocker.patch.object(FigureCanvas, 'draw')
+    mocker.patch.object(FigureCanvas, 'draw_idle')
 
     # Mock the AxesSubplot object
     ax_mock = mocker.MagicMock()
@@ -174,7 +193,7 @@ def test_zoom(plotter: Plotter, mocker):
     plotter.zoom(ZOOM_IN)
     ax_mock.set_xlim.assert_called_with(0, 8)
     ax_mock.set_ylim.assert_called_with(0, 8)
-    plotter.canvas.draw.assert_called_once()
+    plotter.canvas.draw_idle.assert_called_once()
 
     # Test zoom out
     ax_mock.get_xlim.return_value = (0, 10)
@@ -182,7 +201,7 @@ def test_zoom(plotter: Plotter, mocker):
     plotter.zoom(ZOOM_OUT)
     ax_mock.set_xlim.assert_called_with(0, 12.5)
     ax_mock.set_ylim.assert_called_with(0, 12.5)
-    assert plotter.canvas.draw.call_count == 2
+    assert plotter.canvas.draw_idle.call_count == 2
 
 
 @pytest.mark.plotter
@@ -227,3 +246,533 @@ def test_zoom_out(plotter: Plotter, mocker):
 
     # Verify that the zoom method was called with ZOOM_OUT factor
     plotter.zoom.assert_called_with(ZOOM_OUT)
+
+
+@pytest.mark.plotter
+def test_draw_reuses_parsed_function(plotter: Plotter, qtbot):
+    """
+    Test that redrawing the same function does not parse it again.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x^2 + 3*x")
+
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+    misses = expression_cache.misses
+    plotter.draw(PlotOption.SCATTER)
+    wait_for_worker(plotter, qtbot)
+    plotter.samples_slider.setValue(20)
+    plotter.draw(PlotOption.STEP)
+    wait_for_worker(plotter, qtbot)
+
+    assert expression_cache.misses == misses, "The function was parsed again"
+
+
+@pytest.mark.plotter
+def test_prepare_to_draw_adaptive(plotter: Plotter):
+    """
+    Test the prepare_to_draw() method in adaptive sampling mode.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+
+    """
+    plotter.xmin_input.setText("-1")
+    plotter.xmax_input.setText("1")
+    plotter.function_input.setText("1/(x^2 + 0.001)")
+    plotter.samples_slider.setValue(20)
+    plotter.sampling_combo.setCurrentIndex(plotter.sampling_combo.findData(SamplingMode.ADAPTIVE))
+
+    x_data, y_data = plotter.prepare_to_draw()
+
+    assert len(x_data) > 21, "Adaptive sampling did not refine the grid"
+    assert np.all(np.diff(x_data) > 0), "x_data is not sorted"
+    assert x_data[0] == -1 and x_data[-1] == 1, "Unexpected range of x_data"
+
+
+@pytest.mark.plotter
+def test_zoom_resamples_view(plotter: Plotter, qtbot):
+    """
+    Test that zooming re-evaluates the function over the visible window.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("-10")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x^3")
+    plotter.samples_slider.setValue(50)
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+
+    plotter.zoom(ZOOM_IN)
+    plotter.zoom(ZOOM_IN)
+    wait_for_worker(plotter, qtbot)
+
+    x_data = plotter.ax.get_lines()[0].get_xdata()
+    xlim = plotter.ax.get_xlim()
+    visible = x_data[(x_data >= xlim[0]) & (x_data <= xlim[1])]
+    assert len(visible) >= 50, "The visible window was not resampled at the current density"
+
+
+@pytest.mark.plotter
+def test_pan(plotter: Plotter, mocker, qtbot):
+    """
+    Test that dragging with the left mouse button shifts the view and resamples it.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        mocker: The mocker fixture from pytest.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+    xlim = plotter.ax.get_xlim()
+    width = plotter.ax.bbox.width
+
+    plotter.pan_press(mocker.Mock(inaxes=plotter.ax, button=1, x=100, y=100))
+    plotter.pan_move(mocker.Mock(x=100 - width / 2, y=100))
+    plotter.pan_release(mocker.Mock())
+    wait_for_worker(plotter, qtbot)
+
+    new_xlim = plotter.ax.get_xlim()
+    assert new_xlim[0] == pytest.approx(xlim[0] + (xlim[1] - xlim[0]) / 2)
+    assert plotter.pan_start is None
+    assert plotter.ax.get_lines()[0].get_xdata()[-1] >= new_xlim[1], "The panned view was not resampled"
+
+
+@pytest.mark.plotter
+def test_draw_keeps_axes_and_artists(plotter: Plotter, qtbot):
+    """
+    Test that redrawing updates the existing axes and artists instead of rebuilding them.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x^2")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+    ax = plotter.ax
+    line = ax.get_lines()[0]
+
+    plotter.draw(PlotOption.SCATTER)
+    wait_for_worker(plotter, qtbot)
+    plotter.samples_slider.setValue(10)
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+
+    assert plotter.ax is ax, "The axes were recreated"
+    assert ax.get_lines()[0] is line, "The line was recreated"
+    assert len(line.get_xdata()) == 11, "The line was not updated"
+    assert not plotter.renderers[PlotOption.SCATTER].artists[0].get_visible(), "The scatter plot is still visible"
+
+
+@pytest.mark.plotter
+def test_draw_high_resolution_is_decimated(plotter: Plotter, qtbot):
+    """
+    Test that high resolution samples are decimated to about the width of the canvas before rendering.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x*(x-5)")
+    plotter.samples_slider.setValue(100)
+    plotter.sampling_combo.setCurrentIndex(plotter.sampling_combo.findData(SamplingMode.HIGH_RESOLUTION))
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+
+    y_data = plotter.ax.get_lines()[0].get_ydata()
+    assert len(y_data) <= 2 * plotter.pixel_width() + 2, "The samples were not decimated"
+    assert y_data.min() == pytest.approx(-6.25), "The minimum of the curve was lost"
+
+
+@pytest.mark.plotter
+def test_draw_shows_stage_breakdown(plotter: Plotter, qtbot):
+    """
+    Test that the timings of the stages of the last draw are shown in the status bar.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    expression_cache.clear()
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x^3 - 2*x")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+    qtbot.waitUntil(lambda: "canvas" in plotter.statusBar().currentMessage(), timeout=5000)
+
+    message = plotter.statusBar().currentMessage()
+    for stage in ("validate", "parse", "sample", "decimate", "artists", "canvas"):
+        assert f"{stage} " in message, f"The {stage} stage is missing from the status bar"
+    assert "51 samples" in message
+    assert "1 artists" in message
+
+
+@pytest.mark.plotter
+def test_draw_several_functions(plotter: Plotter, qtbot):
+    """
+    Test that several functions separated by ';' are drawn as one curve each, with a legend.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x; x^2; 2*x + 1")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+
+    lines = plotter.ax.get_lines()
+    assert len(lines) == 3
+    np.testing.assert_allclose(lines[1].get_ydata(), lines[1].get_xdata() ** 2)
+    assert len({line.get_color() for line in lines}) == 3, "The curves share a color"
+    assert [text.get_text() for text in plotter.ax.get_legend().get_texts()] == ["x", "x^2", "2*x + 1"]
+
+
+@pytest.mark.plotter
+def test_draw_surface(plotter: Plotter, qtbot):
+    """
+    Test that a function of x and y is drawn on its own axes in each view, and that plots of x come back after.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("-2")
+    plotter.xmax_input.setText("2")
+    plotter.ymin_input.setText("-1")
+    plotter.ymax_input.setText("1")
+    plotter.function_input.setText("x^2 - y^2")
+    plotter.sampling_combo.setCurrentIndex(plotter.sampling_combo.findData(SamplingMode.HIGH_RESOLUTION))
+
+    for option in SurfaceOption:
+        plotter.draw(option)
+        wait_for_worker(plotter, qtbot)
+        ax = plotter.surface_renderer.artist_axes()
+        assert ax.get_visible(), f"The {option} view is not shown"
+        assert plotter.draw_option == option
+
+    plotter.function_input.setText("x^2")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+
+    assert plotter.ax.get_visible(), "The axes of the plots of x were not shown again"
+    assert not any(ax.get_visible() for ax in plotter.surface_renderer.axes.values())
+
+
+@pytest.mark.plotter
+def test_draw_surface_invalid_range_of_y(plotter: Plotter, mocker):
+    """
+    Test that a function of x and y is not drawn without a valid range of y.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        mocker: The mocker fixture from pytest-mock.
+
+    """
+    warning = mocker.patch("app.utils.validation.QMessageBox.warning")
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("1")
+    plotter.function_input.setText("x*y")
+
+    plotter.draw(SurfaceOption.SURFACE)
+
+    warning.assert_called_once_with(plotter, "Invalid input", "Enter a valid range of y.")
+    assert not plotter.worker.is_busy()
+
+
+@pytest.mark.plotter
+def test_draw_progressive(plotter: Plotter, qtbot, mocker):
+    """
+    Test that a large grid is drawn in coarse to fine passes updating the same line, ending with the full grid.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+        mocker: The mocker fixture from pytest-mock.
+
+    """
+    show_data = mocker.spy(plotter, "show_data")
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x*(x-5)")
+    plotter.samples_slider.setValue(100)
+    plotter.sampling_combo.setCurrentIndex(plotter.sampling_combo.findData(SamplingMode.HIGH_RESOLUTION))
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+
+    assert show_data.call_count > 2, "The plot was not drawn in passes"
+    traces = [call.kwargs["trace"] for call in show_data.call_args_list]
+    assert traces[-1] is not None and not any(traces[:-1]), "The trace was not finished by the last pass only"
+    assert len(plotter.ax.get_lines()) == 1, "A pass created a new line"
+    assert plotter.ax.get_lines()[0].get_ydata().min() == pytest.approx(-6.25)
+
+
+@pytest.mark.plotter
+def test_editing_input_abandons_progressive_draw(plotter: Plotter, qtbot):
+    """
+    Test that editing the function while a progressive draw runs abandons its remaining passes.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("x^3 - x")
+    plotter.samples_slider.setValue(100)
+    plotter.sampling_combo.setCurrentIndex(plotter.sampling_combo.findData(SamplingMode.HIGH_RESOLUTION))
+    plotter.draw(PlotOption.PLOT)
+
+    assert plotter.worker.is_busy()
+    plotter.function_input.textEdited.emit("x^3 - x +")
+
+    assert not plotter.worker.is_busy(), "The progressive draw was not abandoned"
+
+
+@pytest.mark.plotter
+def test_live_preview_debounces_typing(plotter: Plotter, qtbot, mocker):
+    """
+    Test that typing a function in live preview mode plots it once at a reduced sample count, then at full resolution.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+        mocker: The mocker fixture from pytest-mock.
+
+    """
+    warning = mocker.patch("app.utils.validation.QMessageBox.warning")
+    show_data = mocker.spy(plotter, "show_data")
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.progressive_checkbox.setChecked(False)
+    plotter.sampling_combo.setCurrentIndex(plotter.sampling_combo.findData(SamplingMode.HIGH_RESOLUTION))
+    qtbot.keyClicks(plotter.function_input, "x^2 - (x + 1)")
+
+    qtbot.waitUntil(lambda: show_data.call_count == 1, timeout=5000)
+    assert plotter.plotted_function == ("x^2 - (x + 1)", 1000, SamplingMode.UNIFORM), "The preview was not reduced"
+    qtbot.waitUntil(lambda: show_data.call_count == 2, timeout=5000)
+    assert plotter.plotted_function == ("x^2 - (x + 1)", 50, SamplingMode.HIGH_RESOLUTION)
+    assert plotter.draw_option == PlotOption.PLOT
+    warning.assert_not_called()
+
+
+@pytest.mark.plotter
+def test_live_preview_is_silent_on_invalid_function(plotter: Plotter, qtbot, mocker):
+    """
+    Test that the live preview skips unfinished functions and reports the position of errors in the status bar.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+        mocker: The mocker fixture from pytest-mock.
+
+    """
+    warnings = [mocker.patch("app.utils.validation.QMessageBox.warning"), mocker.patch("app.plotter.QMessageBox.warning")]
+    submit = mocker.spy(plotter.worker, "submit")
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("(x + 1")
+    plotter.input_changed()
+    plotter.preview()
+    assert submit.call_count == 0, "An unfinished function was evaluated"
+
+    plotter.function_input.setText("x*/2")
+    plotter.preview()
+
+    assert submit.call_count == 0, "An invalid function was evaluated"
+    assert plotter.statusBar().currentMessage() == "Invalid function of x: expected a number, a name or '(' but found '/' at column 3"
+    for warning in warnings:
+        warning.assert_not_called()
+
+
+@pytest.mark.plotter
+def test_find_features(plotter: Plotter, qtbot):
+    """
+    Test that analyzing the function marks its roots and extrema and lists them, until the function is drawn again.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("-3")
+    plotter.xmax_input.setText("3")
+    plotter.function_input.setText("x^2 - 4")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+
+    plotter.analyze_button.click()
+    wait_for_worker(plotter, qtbot)
+
+    items = [plotter.analysis_list.item(row).text() for row in range(plotter.analysis_list.count())]
+    assert items == ["root of f at x = -2", "minimum of f at x = 0, y = -4", "root of f at x = 2"]
+    assert plotter.analysis_list.isVisibleTo(plotter)
+    assert plotter.feature_markers.lines["root"].get_visible()
+
+    plotter.draw(PlotOption.PLOT)
+    assert not plotter.analysis_list.isVisibleTo(plotter)
+    assert not any(line.get_visible() for line in plotter.feature_markers.lines.values())
+
+
+@pytest.mark.plotter
+def test_parameter_sliders(plotter: Plotter, qtbot, mocker):
+    """
+    Test that parameters get sliders, that dragging a slider updates the curve in place and that releasing it redraws the plot.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+        mocker: The mocker fixture from pytest-mock.
+
+    """
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("a*x")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+
+    assert list(plotter.parameter_sliders) == ["a"]
+    assert plotter.parameters_widget.isVisibleTo(plotter)
+    assert not plotter.play_button.isEnabled()
+    assert plotter.plotted_function[0] == "(1.0)*x"
+    line = plotter.renderers[PlotOption.PLOT].renderers[0].artists[0]
+
+    parse = mocker.spy(plotter, "read_inputs")
+    slider = plotter.parameter_sliders["a"][1]
+    slider.setSliderDown(True)
+    slider.setValue(slider_position(2.0))
+    parse.assert_not_called()
+    assert plotter.animator is not None
+    assert plotter.renderers[PlotOption.PLOT].renderers[0].artists[0] is line
+    assert line.get_ydata()[-1] == pytest.approx(20)
+    assert plotter.statusBar().currentMessage().startswith("frame ")
+
+    slider.setSliderDown(False)
+    wait_for_worker(plotter, qtbot)
+    assert plotter.animator is None
+    assert plotter.plotted_function[0] == "(2.0)*x"
+
+    plotter.function_input.setText("x")
+    plotter.input_changed()
+    assert not plotter.parameter_sliders
+    assert not plotter.parameters_widget.isVisibleTo(plotter)
+
+
+@pytest.mark.plotter
+def test_play_time_parameter(plotter: Plotter, qtbot):
+    """
+    Test that playing a function of t advances t until it is stopped.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+
+    """
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("10")
+    plotter.function_input.setText("sin(x - t)")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+    assert plotter.play_button.isEnabled()
+
+    plotter.play_button.setChecked(True)
+    qtbot.waitUntil(lambda: plotter.parameter_values()["t"] > 0.05, timeout=5000)
+    assert plotter.animator is not None
+
+    plotter.play_button.setChecked(False)
+    wait_for_worker(plotter, qtbot)
+    assert not plotter.animation_timer.isActive()
+    assert plotter.animator is None
+
+
+@pytest.mark.plotter
+def test_draw_invalid_function_moves_cursor_to_error(plotter: Plotter, mocker):
+    """
+    Test that drawing an invalid function warns and moves the cursor of the function input to the error.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        mocker: The mocker fixture from pytest-mock.
+
+    """
+    warning = mocker.patch("app.utils.validation.QMessageBox.warning")
+    plotter.xmin_input.setText("0")
+    plotter.xmax_input.setText("1")
+    plotter.function_input.setText("2*x + foo(x)")
+    plotter.draw(PlotOption.PLOT)
+
+    warning.assert_called_once()
+    assert plotter.function_input.cursorPosition() == 6
+    assert plotter.statusBar().currentMessage() == "Invalid function of x: unknown name 'foo' at column 7"
+
+
+@pytest.mark.plotter
+def test_load_data(plotter: Plotter, qtbot, mocker, tmp_path):
+    """
+    Test that a loaded dataset is drawn over the view, reduced to its visible samples, and follows the zoom.
+
+    Args:
+        plotter (Plotter): The Plotter instance.
+        qtbot: The qtbot fixture from pytest-qt.
+        mocker: The mocker fixture from pytest-mock.
+        tmp_path: The temporary directory fixture from pytest.
+
+    """
+    x_data = np.linspace(0, 10, 1_000_001)
+    np.save(tmp_path / "data.npy", np.column_stack((x_data, np.sin(x_data))))
+    mocker.patch("app.plotter.QFileDialog.getOpenFileName", return_value=(str(tmp_path / "data.npy"), ""))
+    plotter.load_data()
+    wait_for_worker(plotter, qtbot)
+
+    (dataset, line), = plotter.datasets
+    assert dataset.size == x_data.size
+    assert line.get_xdata().size < 10 * plotter.pixel_width()
+    assert plotter.ax.get_xlim()[0] <= 0 and plotter.ax.get_xlim()[1] >= 10
+
+    plotter.zoom_in()
+    xmin, xmax = plotter.ax.get_xlim()
+    assert line.get_xdata()[1] >= xmin and line.get_xdata()[-2] <= xmax
+
+    plotter.xmin_input.setText("2")
+    plotter.xmax_input.setText("3")
+    plotter.function_input.setText("x / 10")
+    plotter.draw(PlotOption.PLOT)
+    wait_for_worker(plotter, qtbot)
+    assert plotter.ax.get_xlim()[0] <= 0 and plotter.ax.get_xlim()[1] >= 10
+    assert plotter.ax.get_ylim()[0] <= -1 and plotter.ax.get_ylim()[1] >= 1
+
+    warning = mocker.patch("app.plotter.QMessageBox.warning")
+    (tmp_path / "broken.bin").write_bytes(b"123")
+    mocker.patch("app.plotter.QFileDialog.getOpenFileName", return_value=(str(tmp_path / "broken.bin"), ""))
+    plotter.load_data()
+    wait_for_worker(plotter, qtbot)
+    warning.assert_called_once()
+    assert len(plotter.datasets) == 1
@@ -0,0 +1,20 @@
+import pytest
+
+from app.utils.preview import preview_inputs, preview_key
+from app.utils.sampling_mode import SamplingMode
+
+
+@pytest.mark.auto
+def test_preview_inputs_reduce_samples():
+    """Test the preview samples a uniform grid of at most the given number of intervals."""
+    assert preview_inputs(("x", (0, 1), 50, SamplingMode.UNIFORM)) == ("x", (0, 1), 50, SamplingMode.UNIFORM)
+    assert preview_inputs(("x", (0, 1), 50, SamplingMode.ADAPTIVE)) == ("x", (0, 1), 50, SamplingMode.UNIFORM)
+    assert preview_inputs(("x", (0, 1), 50, SamplingMode.HIGH_RESOLUTION), max_samples=200) == \
+        ("x", (0, 1), 200, SamplingMode.UNIFORM)
+
+
+@pytest.mark.auto
+def test_preview_key_ignores_spelling():
+    """Test inputs differing only in spaces or in the power operator share a preview key."""
+    assert preview_key(("x^2 + 1", (0, 1), 50, SamplingMode.UNIFORM)) == preview_key(("x**2+1", (0, 1), 50, SamplingMode.UNIFORM))
+    assert preview_key(("x^2", (0, 1), 50, SamplingMode.UNIFORM)) != preview_key(("x^2", (0, 2), 50, SamplingMode.UNIFORM))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from app.utils.constants import HIGH_RESOLUTION_FACTOR
+from app.utils.parallel import parallel_evaluator
+from app.utils.progressive import is_progressive, progressive_strides, sample_progressive
+from app.utils.sampling_mode import SamplingMode
+from app.utils.validation import parse_2d_function
+
+
+@pytest.mark.auto
+def test_progressive_strides():
+    """Test the passes start with a coarse power of two stride and halve it down to the full grid."""
+    assert progressive_strides(1000, coarse_samples=100) == [8, 4, 2, 1]
+    assert progressive_strides(50, coarse_samples=100) == [1]
+
+
+@pytest.mark.auto
+def test_is_progressive():
+    """Test only large uniform grids are drawn progressively."""
+    assert is_progressive(100, SamplingMode.HIGH_RESOLUTION)
+    assert not is_progressive(100, SamplingMode.UNIFORM)
+    assert not is_progressive(100_000, SamplingMode.ADAPTIVE)
+
+
+@pytest.mark.auto
+def test_sample_progressive_refines_to_the_full_grid(mocker):
+    """Test the passes get denser, evaluate each point of the grid once and end with the samples of a full evaluation."""
+    evaluate = mocker.patch("app.utils.progressive.parallel_evaluator", wraps=parallel_evaluator)
+    samples = 5
+
+    passes = list(sample_progressive(10 ** 6, "sin(x)*x", (0, 10), samples, SamplingMode.HIGH_RESOLUTION))
+
+    sizes = [x_data.size for x_data, _, _ in passes]
+    assert sizes == sorted(sizes) and len(passes) > 2
+    assert [final for _, _, final in passes] == [False] * (len(passes) - 1) + [True]
+    assert sum(call.args[1].size for call in evaluate.call_args_list) == samples * HIGH_RESOLUTION_FACTOR + 1
+    x_full, y_full = parse_2d_function("sin(x)*x", (0, 10), samples, SamplingMode.HIGH_RESOLUTION)
+    np.testing.assert_array_equal(passes[-1][0], x_full)
+    np.testing.assert_array_equal(passes[-1][1], y_full)
+    x_coarse, y_coarse, _ = passes[0]
+    assert x_coarse[0] == 0 and x_coarse[-1] == 10
+    np.testing.assert_allclose(y_coarse, np.sin(x_coarse) * x_coarse)
+
+
+@pytest.mark.auto
+def test_sample_progressive_several_functions():
+    """Test the passes of several functions hold one row of y data per function."""
+    x_data, y_data, final = next(sample_progressive(100, "x; x^2", (0, 1), 100, SamplingMode.HIGH_RESOLUTION))
+
+    assert not final
+    assert y_data.shape == (2, x_data.size)
+    np.testing.assert_allclose(y_data[1], x_data ** 2)
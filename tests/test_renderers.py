@@ -0,0 +1,209 @@
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+from app.utils.analysis import MINIMUM, ROOT, Feature
+from app.utils.plot_option import PlotOption
+from app.utils.constants import COLLECTION_RENDERER_THRESHOLD
+from app.utils.renderers import RENDERERS, COLLECTION_RENDERERS, CurveSet, FeatureMarkers, SurfaceRenderer, autoscale, \
+    bar_vertices, renderer_class, update_legend
+from app.utils.surface_option import SurfaceOption
+
+
+@pytest.mark.auto
+def test_renderer_updates_artists_in_place(draw_option: PlotOption):
+    """Test that a second update reuses the artists created by the first one."""
+    ax = Figure().add_subplot(111)
+    renderer = RENDERERS[draw_option](ax)
+    x_data = np.linspace(0, 1, 11)
+
+    renderer.update(x_data, x_data ** 2)
+    artists = list(renderer.artists)
+    renderer.update(x_data, x_data ** 3)
+
+    assert renderer.artists == artists, "The artists were recreated"
+    assert all(artist.axes is ax for artist in renderer.artists)
+
+
+@pytest.mark.auto
+def test_renderer_set_visible(draw_option: PlotOption):
+    """Test that set_visible hides and shows every artist of the renderer."""
+    ax = Figure().add_subplot(111)
+    renderer = RENDERERS[draw_option](ax)
+    renderer.update([1, 2, 3], [4, 5, 6])
+
+    renderer.set_visible(False)
+
+    assert not any(artist.get_visible() for artist in renderer.artists)
+
+
+@pytest.mark.auto
+def test_bar_renderer_changes_number_of_bars():
+    """Test that the bar renderer rebuilds its bars when the number of samples changes."""
+    ax = Figure().add_subplot(111)
+    renderer = RENDERERS[PlotOption.BAR](ax)
+
+    renderer.update([1, 2, 3], [4, 5, 6])
+    renderer.update([1, 2, 3, 4], [4, 5, 6, 7])
+
+    assert len(renderer.artists) == 4
+    assert len(ax.patches) == 4, "The old bars were not removed"
+
+
+@pytest.mark.auto
+def test_autoscale_includes_collections():
+    """Test that autoscale fits the view to data drawn as a collection."""
+    ax = Figure().add_subplot(111)
+    renderer = RENDERERS[PlotOption.SCATTER](ax)
+    renderer.update([0, 1], [0, 1])
+    renderer.update([0, 100], [0, 50])
+
+    autoscale(ax, [0, 100], [0, 50])
+
+    assert ax.get_xlim()[1] >= 100
+    assert ax.get_ylim()[1] >= 50
+
+
+@pytest.mark.auto
+def test_autoscale_clamps_to_visible_range():
+    """Test that autoscale leaves out the values close to an asymptote, and keeps the whole of an unbroken curve."""
+    ax = Figure().add_subplot(111)
+    x_data = np.linspace(-10, 10, 1001)
+    y_data = 1 / (x_data - 2.01)
+    y_broken = np.insert(y_data, 601, np.nan)
+    x_broken = np.insert(x_data, 601, 2.01)
+    ax.plot(x_broken, y_broken)
+
+    autoscale(ax, x_broken, y_broken)
+    assert -10 < ax.get_ylim()[0] < ax.get_ylim()[1] < 10
+
+    ax.lines[0].set_data(x_data, np.exp(x_data))
+    autoscale(ax, x_data, np.exp(x_data))
+    assert ax.get_ylim()[1] >= np.exp(10)
+
+
+@pytest.mark.auto
+def test_autoscale_includes_extra_data():
+    """Test that autoscale fits the extra data, such as datasets, even when the curves are clamped at an asymptote."""
+    ax = Figure().add_subplot(111)
+    x_data = np.array([-1.0, -0.5, 0.0, 0.5, 1.0])
+    y_data = np.array([-2.0, -4.0, np.nan, 4.0, 2.0])
+    ax.plot(x_data, y_data)
+
+    autoscale(ax, x_data, y_data, [(np.array([-20.0, 30.0]), np.array([-50.0, 60.0]))])
+
+    assert ax.get_xlim()[0] <= -20 and ax.get_xlim()[1] >= 30
+    assert ax.get_ylim()[0] <= -50 and ax.get_ylim()[1] >= 60
+
+
+@pytest.mark.auto
+def test_curve_set_draws_one_curve_per_row(draw_option: PlotOption):
+    """Test a CurveSet draws each row of y data as a curve with its own color, removing curves no longer drawn."""
+    ax = Figure().add_subplot(111)
+    curves = CurveSet(ax, draw_option)
+    x_data = np.linspace(0, 1, 11)
+
+    curves.update(x_data, np.stack((x_data, x_data ** 2, x_data ** 3)))
+    first = curves.renderers[0]
+    update_legend(ax, curves, ["x", "x^2", "x^3"])
+
+    assert [renderer.color for renderer in curves.renderers] == ["C0", "C1", "C2"]
+    assert [text.get_text() for text in ax.get_legend().get_texts()] == ["x", "x^2", "x^3"]
+
+    curves.update(x_data, x_data ** 2)
+    update_legend(ax, curves, ["x^2"])
+
+    assert curves.renderers == [first], "The renderer of the first curve was not reused"
+    assert all(artist.axes is ax for artist in curves.artists)
+    assert ax.get_legend() is None, "The legend of a single curve was not removed"
+
+
+@pytest.mark.auto
+def test_surface_renderer_switches_views():
+    """Test the surface renderer replaces its view and shows only the axes of the current one."""
+    figure = Figure()
+    renderer = SurfaceRenderer(figure)
+    x_data = np.linspace(-1, 1, 11)
+    z_data = np.add.outer(x_data ** 2, x_data ** 2)
+
+    surface_ax = renderer.plot(SurfaceOption.SURFACE, x_data, x_data, z_data)
+    renderer.plot(SurfaceOption.WIREFRAME, x_data, x_data, z_data)
+
+    assert len(surface_ax.collections) == 1, "The previous surface was not removed"
+
+    contour_ax = renderer.plot(SurfaceOption.CONTOUR, x_data, x_data, z_data)
+
+    assert contour_ax is not surface_ax
+    assert contour_ax.get_visible() and not surface_ax.get_visible()
+    assert not surface_ax.collections
+    renderer.set_visible(False)
+    assert not contour_ax.get_visible()
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("draw_option", list(COLLECTION_RENDERERS))
+def test_collection_renderer_draws_a_fixed_number_of_artists(draw_option: PlotOption):
+    """Test the collection renderers draw any number of samples with the same artists, updated in place."""
+    figure = Figure()
+    ax = figure.add_subplot(111)
+    renderer = COLLECTION_RENDERERS[draw_option](ax)
+    x_data = np.linspace(0, 100, 100001)
+
+    renderer.update(x_data[:11], x_data[:11])
+    artists = list(renderer.artists)
+    renderer.update(x_data, np.sin(x_data))
+    figure.canvas.draw()
+
+    assert renderer.artists == artists, "The artists were recreated"
+    assert len(ax.patches) == 0 and len(ax.collections) == 1
+    renderer.set_visible(False)
+    assert not any(artist.get_visible() for artist in renderer.artists)
+
+
+@pytest.mark.auto
+def test_bar_vertices():
+    """Test the bars are as wide as those of Axes.bar and undefined heights are skipped."""
+    vertices = bar_vertices(np.array([0.0, 1.0, 2.0]), np.array([2.0, np.nan, -1.0]))
+
+    np.testing.assert_allclose(vertices, [[[-0.4, 0], [-0.4, 2], [0.4, 2], [0.4, 0]],
+                                          [[1.6, 0], [1.6, -1], [2.4, -1], [2.4, 0]]])
+
+
+@pytest.mark.auto
+def test_curve_set_switches_to_collection_renderer():
+    """Test bar plots switch to the collection renderer from the threshold on, and back below it."""
+    ax = Figure().add_subplot(111)
+    curves = CurveSet(ax, PlotOption.BAR)
+    small = np.arange(10.0)
+    large = np.arange(float(COLLECTION_RENDERER_THRESHOLD))
+
+    curves.update(small, small)
+    curves.update(large, large)
+
+    assert renderer_class(PlotOption.BAR, large.size) is COLLECTION_RENDERERS[PlotOption.BAR]
+    assert renderer_class(PlotOption.PLOT, large.size) is RENDERERS[PlotOption.PLOT]
+    assert isinstance(curves.renderers[0], COLLECTION_RENDERERS[PlotOption.BAR])
+    assert len(ax.patches) == 0, "The bars of the previous renderer were not removed"
+
+    curves.update(small, small)
+
+    assert isinstance(curves.renderers[0], RENDERERS[PlotOption.BAR])
+    assert len(ax.collections) == 0
+
+
+@pytest.mark.auto
+def test_feature_markers():
+    """Test the features are marked with one line per kind, kept out of the legend, and hidden on demand."""
+    figure = Figure()
+    ax = figure.add_subplot(111)
+    markers = FeatureMarkers(ax)
+
+    markers.update([Feature(ROOT, -1, 0, (0,)), Feature(ROOT, 1, 0, (0,)), Feature(MINIMUM, 0, -1, (0,))])
+
+    assert set(markers.lines) == {ROOT, MINIMUM}
+    assert list(markers.lines[ROOT].get_xdata()) == [-1, 1]
+    assert all(line.get_label().startswith("_") for line in markers.lines.values())
+    markers.update([Feature(MINIMUM, 0, -1, (0,))])
+    assert not markers.lines[ROOT].get_visible() and markers.lines[MINIMUM].get_visible()
+    markers.set_visible(False)
+    assert not any(line.get_visible() for line in markers.lines.values())
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from app.utils.cache import expression_cache
+from app.utils.constants import HIGH_RESOLUTION_FACTOR
+from app.utils.sampling import sample_adaptive, sample_function, sample_uniform
+from app.utils.sampling_mode import SamplingMode
+
+
+def max_interpolation_error(x_data: np.ndarray, y_data: np.ndarray, function, x_range) -> float:
+    """Measure the largest gap between the piecewise linear curve through the samples and the function."""
+    x_dense = np.linspace(x_range[0], x_range[1], 100001)
+    return float(np.max(np.abs(np.interp(x_dense, x_data, y_data) - function(x_dense))))
+
+
+@pytest.mark.auto
+def test_sample_adaptive_straight_line():
+    """Test that a straight line is not refined beyond one pass."""
+    function = expression_cache.get_function("3*x - 1")
+
+    x_data, y_data = sample_adaptive(function, (0, 10), 16)
+
+    assert len(x_data) == 2 * 16 + 1
+    np.testing.assert_allclose(y_data, 3 * x_data - 1)
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("function_string, x_range", [
+    ("x^5 - 3*x^3 + x", (-2, 2)),
+    ("1/(x^2 + 0.01)", (-3, 3)),
+    ("(x^2 - 1)/(x^2 + 0.05)", (-4, 4)),
+])
+def test_sample_adaptive_fewer_points_than_uniform(function_string: str, x_range):
+    """Test that adaptive sampling matches the accuracy of a uniform grid with fewer evaluations."""
+    function = expression_cache.get_function(function_string)
+
+    x_adaptive, y_adaptive = sample_adaptive(function, x_range, 16)
+    adaptive_error = max_interpolation_error(x_adaptive, y_adaptive, function, x_range)
+    x_uniform, y_uniform = sample_uniform(function, x_range, len(x_adaptive) - 1)
+    uniform_error = max_interpolation_error(x_uniform, y_uniform, function, x_range)
+
+    assert np.all(np.diff(x_adaptive) > 0), "x_data is not sorted"
+    assert adaptive_error < uniform_error, "Adaptive sampling is less accurate than a uniform grid"
+
+
+@pytest.mark.auto
+def test_sample_adaptive_respects_budget():
+    """Test that adaptive sampling stops at the point budget."""
+    function = expression_cache.get_function("sin(50*x)")
+
+    x_data, y_data = sample_adaptive(function, (0, 10), 16, budget=200)
+
+    assert len(x_data) == 200
+    assert len(y_data) == 200
+
+
+@pytest.mark.auto
+def test_sample_function_modes():
+    """Test sample_function dispatches on the sampling mode."""
+    function = expression_cache.get_function("x^2")
+
+    x_uniform, _ = sample_function(function, (0, 1), 10, SamplingMode.UNIFORM)
+    x_adaptive, _ = sample_function(function, (0, 1), 10, SamplingMode.ADAPTIVE)
+
+    assert len(x_uniform) == 11
+    assert len(x_adaptive) > 11
+
+
+@pytest.mark.auto
+def test_sample_function_high_resolution():
+    """Test that high resolution mode samples a much denser grid."""
+    function = expression_cache.get_function("sin(1000*x)")
+
+    x_data, y_data = sample_function(function, (0, 1), 100, SamplingMode.HIGH_RESOLUTION)
+
+    assert len(x_data) == 100 * HIGH_RESOLUTION_FACTOR + 1
+    assert y_data.dtype == np.float64
+
+
+@pytest.mark.auto
+def test_sample_adaptive_several_functions():
+    """Test several functions are refined on one shared grid wherever any of them bends."""
+    group = expression_cache.get_function("x; x^2")
+    x_data, y_data = sample_adaptive(group, (0, 4), 16)
+
+    assert y_data.shape == (2, x_data.size)
+    np.testing.assert_allclose(y_data[1], x_data ** 2)
+    assert max_interpolation_error(x_data, y_data[1], lambda x: x ** 2, (0, 4)) < 0.02
+
+
+@pytest.mark.auto
+def test_sample_adaptive_skips_values_beyond_asymptotes():
+    """Test adaptive sampling spends its budget on the visible part of a curve rather than close to its poles."""
+    function = expression_cache.get_function("1/(x - 2) + sin(5*x)")
+
+    x_data, y_data = sample_adaptive(function, (-10, 10), 16)
+
+    visible = np.abs(y_data) < 10
+    assert np.count_nonzero(~visible) < 10
+    assert max_interpolation_error(x_data[x_data < 1.5], y_data[x_data < 1.5], function, (-10, 1.5)) < 0.05
+
+
+@pytest.mark.auto
+def test_sample_function_breaks_at_poles():
+    """Test sampled curves are broken with NaN at their poles."""
+    function = expression_cache.get_function("tan(x)")
+
+    x_data, y_data = sample_function(function, (0, 3), 100)
+
+    np.testing.assert_allclose(x_data[np.isnan(y_data)], [np.pi / 2], atol=1e-6)
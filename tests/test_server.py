@@ -0,0 +1,132 @@
+import io
+import json
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+
+import numpy as np
+import pytest
+
+from app.server import PlotServer, read_request
+from app.utils.plot_option import PlotOption
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Run a plot server with one worker on a free port for the tests of this module."""
+    plot_server = PlotServer(("127.0.0.1", 0), workers=1)
+    thread = threading.Thread(target=plot_server.serve_forever, daemon=True)
+    thread.start()
+    yield plot_server
+    plot_server.shutdown()
+    plot_server.server_close()
+
+
+def fetch(server: PlotServer, path: str, body: bytes = None):
+    """Send a request to the server and return the response, also for error statuses."""
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    try:
+        return urllib.request.urlopen(url, data=body, timeout=60)
+    except urllib.error.HTTPError as error:
+        return error
+
+
+@pytest.mark.auto
+def test_read_request():
+    """Test read_request fills in the defaults, substitutes the parameters and rejects invalid requests."""
+    request = read_request({"function": "a*x", "xmin": "0", "xmax": "1", "a": "2", "plot": "step"})
+
+    assert request.output_format == "png"
+    assert request.spec.function == "(2.0)*x"
+    assert request.spec.draw_option == PlotOption.STEP
+    assert request == read_request({"function": "a*x", "xmin": 0, "xmax": 1, "a": 2.0, "plot": "STEP"})
+    for fields in ({"function": "x", "xmin": 0}, {"function": "x", "xmin": 0, "xmax": 1, "format": "gif"},
+                   {"function": "__import__('os')", "xmin": 0, "xmax": 1},
+                   {"function": "x", "xmin": 0, "xmax": 1, "samples": 10 ** 9}):
+        with pytest.raises(ValueError):
+            read_request(fields)
+
+
+@pytest.mark.auto
+def test_render_image_and_cache(server):
+    """Test a plot is rendered to an image once and identical requests are answered from the cache."""
+    query = urlencode({"function": "sin(x); cos(x)", "xmin": 0, "xmax": 10, "plot": "scatter"})
+
+    first = fetch(server, f"/plot?{query}")
+    second = fetch(server, f"/plot?{query}")
+    svg = fetch(server, f"/plot?{query}&format=svg")
+
+    assert first.status == 200 and first.headers["Content-Type"] == "image/png"
+    assert first.headers["X-Cache"] == "miss" and second.headers["X-Cache"] == "hit"
+    assert first.read().startswith(b"\x89PNG") and second.read().startswith(b"\x89PNG")
+    assert b"<svg" in svg.read()
+
+    metrics = json.loads(fetch(server, "/metrics").read())
+    assert metrics["cache"]["hits"] >= 1
+    assert 0 < metrics["cache"]["hit_rate"] < 1
+    assert metrics["latency_ms"]["png"]["count"] >= 2
+    assert set(metrics["latency_ms"]["all"]) == {"count", "p50", "p90", "p99"}
+
+
+@pytest.mark.auto
+def test_render_samples(server):
+    """Test the samples of a plot are returned as JSON or as a NumPy archive, with undefined values as null."""
+    fields = {"function": "sqrt(x)", "xmin": -1, "xmax": 1, "samples": 2}
+
+    data = json.loads(fetch(server, "/plot?" + urlencode(dict(fields, format="json"))).read())
+    archive = np.load(io.BytesIO(fetch(server, "/plot", json.dumps(dict(fields, format="bin")).encode()).read()))
+
+    assert data == {"x": [-1.0, 0.0, 1.0], "y": [None, 0.0, 1.0]}
+    np.testing.assert_array_equal(archive["x"], [-1.0, 0.0, 1.0])
+    np.testing.assert_array_equal(archive["y"], [np.nan, 0.0, 1.0])
+
+
+@pytest.mark.auto
+def test_render_surface_samples(server):
+    """Test the grid of a function of x and y is returned with its z values."""
+    fields = {"function": "x*y", "xmin": 0, "xmax": 1, "ymin": 0, "ymax": 2, "samples": 1, "plot": "contour", "format": "json"}
+
+    data = json.loads(fetch(server, "/plot?" + urlencode(fields)).read())
+
+    assert data["x"] == [0.0, 1.0] and data["y"] == [0.0, 2.0]
+    assert data["z"] == [[0.0, 0.0], [0.0, 2.0]]
+
+
+@pytest.mark.auto
+def test_invalid_requests(server):
+    """Test invalid requests and failed renders are answered with an error, and failures are not cached."""
+    invalid = fetch(server, "/plot?" + urlencode({"function": "x +* 2", "xmin": 0, "xmax": 1}))
+    failed = fetch(server, "/plot?" + urlencode({"function": "x/", "xmin": 0, "xmax": 1}))
+    missing = fetch(server, "/nothing")
+
+    assert invalid.status == 400 and "error" in json.loads(invalid.read())
+    assert failed.status == 400
+    assert missing.status == 404
+    assert not any(request.spec.function == "x/" for request in server.cache.entries)
+    assert json.loads(fetch(server, "/metrics").read())["errors"] >= 2
+
+
+@pytest.mark.auto
+def test_error_statuses_and_metrics_keys(server, mocker):
+    """Test unknown formats share one metrics key, and failures of valid requests are answered with status 500."""
+    for output_format in ("gif", "jpeg", "tiff"):
+        assert fetch(server, "/plot?" + urlencode({"function": "x", "xmin": 0, "xmax": 1, "format": output_format})).status == 400
+    assert fetch(server, "/plot", json.dumps({"function": "x", "xmin": [0], "xmax": 1}).encode()).status == 400
+
+    mocker.patch.object(server, "render", side_effect=RuntimeError("renderer crashed"))
+    failed = fetch(server, "/plot?" + urlencode({"function": "x", "xmin": 0, "xmax": 1}))
+
+    assert failed.status == 500 and "renderer crashed" in json.loads(failed.read())["error"]
+    latencies = json.loads(fetch(server, "/metrics").read())["latency_ms"]
+    assert "invalid" in latencies and not {"gif", "jpeg", "tiff"} & set(latencies)
+
+
+@pytest.mark.auto
+def test_server_does_not_import_qt():
+    """Test the plot server can run on machines without Qt."""
+    code = "import sys, app.server; sys.exit(any(name.startswith('PySide6') for name in sys.modules))"
+
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0, "app.server imports Qt"
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.auto
+@pytest.mark.parametrize("module", ["sympy", "matplotlib"])
+def test_plotter_import_is_lazy(module: str):
+    """Test that importing the Plotter does not load the modules that are loaded after the window is shown."""
+    code = f"import sys, app.plotter; sys.exit({module!r} in sys.modules)"
+
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0, f"app.plotter imports {module}"
+
+
+@pytest.mark.auto
+def test_plotting_does_not_import_sympy():
+    """Test that parsing and evaluating functions of x, and of x and y, does not load sympy."""
+    code = ("import sys, numpy, app.utils.cache as cache; "
+            "cache.expression_cache.get_function('sin(x)^2; 2*x')(numpy.ones(3)); "
+            "cache.expression_cache.get_surface('x*y')(numpy.ones(3), numpy.ones(3)); "
+            "sys.exit('sympy' in sys.modules)")
+
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0, "plotting imports sympy"
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.utils.cache import expression_cache
+from app.utils.evaluation import compile_surface
+from app.utils.sampling_mode import SamplingMode
+from app.utils.surface import grid_samples, sample_surface
+from app.utils.validation import parse_3d_function
+
+
+@pytest.mark.auto
+def test_compiled_surface_broadcasts():
+    """Test a compiled function of x and y evaluates a row of x against a column of y."""
+    surface = compile_surface("x^2 - y")
+
+    z_data = surface(np.array([[0.0, 1.0, 2.0]]), np.array([[0.0], [1.0]]))
+
+    np.testing.assert_array_equal(z_data, [[0, 1, 4], [-1, 0, 3]])
+
+
+@pytest.mark.auto
+def test_compiled_surface_constant():
+    """Test a constant function of x and y fills the whole grid."""
+    z_data = compile_surface("3")(np.zeros((1, 4)), np.zeros((2, 1)))
+
+    np.testing.assert_array_equal(z_data, np.full((2, 4), 3.0))
+
+
+@pytest.mark.auto
+def test_sample_surface_in_chunks():
+    """Test evaluating the grid a few rows at a time gives the same values as a single pass."""
+    surface = expression_cache.get_surface("sin(x)*cos(y) + sqrt(x - y)")
+
+    x_data, y_data, z_data = sample_surface(surface, (-2, 2), (-1, 3), 40, 30, chunk_elements=50)
+
+    assert x_data.shape == (41,) and y_data.shape == (31,)
+    x_grid, y_grid = np.meshgrid(x_data, y_data)
+    with np.errstate(invalid="ignore"):
+        expected = np.sin(x_grid) * np.cos(y_grid) + np.sqrt(x_grid - y_grid)
+    np.testing.assert_allclose(z_data, expected)
+
+
+@pytest.mark.auto
+def test_grid_samples_caps_view_grid():
+    """Test the grid of the interactive view is capped, while the full grid follows the sampling mode."""
+    assert grid_samples(50, SamplingMode.HIGH_RESOLUTION) == 1000
+    assert grid_samples(50, SamplingMode.HIGH_RESOLUTION, max_points=80) == 79
+    assert grid_samples(50, SamplingMode.UNIFORM, max_points=80) == 50
+
+
+@pytest.mark.auto
+def test_parse_3d_function_samples_view_grid_directly():
+    """Test a high resolution view is sampled at the view grid size rather than evaluated in full."""
+    x_data, y_data, z_data = parse_3d_function("x*y", (0, 1), (0, 1), 50, SamplingMode.HIGH_RESOLUTION, 80)
+
+    assert z_data.shape == (80, 80)
+    assert (x_data[0], x_data[-1], y_data[0], y_data[-1]) == (0, 1, 0, 1)
+    np.testing.assert_allclose(z_data, np.outer(y_data, x_data))
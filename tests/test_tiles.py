@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from app.utils.tiles import TileCache, tile_layout
+
+
+@pytest.mark.auto
+def test_tile_layout():
+    """Test tile_layout covers the window with aligned power of two tiles."""
+    tile_width, tile_samples, first_tile, last_tile = tile_layout((-3, 7), 100)
+
+    assert tile_width == 2.0
+    assert tile_samples == 32
+    assert first_tile * tile_width <= -3
+    assert (last_tile + 1) * tile_width >= 7
+
+
+@pytest.mark.auto
+def test_tile_layout_invalid_window():
+    """Test tile_layout rejects an empty window."""
+    with pytest.raises(ValueError):
+        tile_layout((1, 1), 100)
+
+
+@pytest.mark.auto
+def test_sample_window_covers_window():
+    """Test sample_window returns sorted samples of the function over the whole window."""
+    cache = TileCache(64)
+
+    x_data, y_data = cache.sample_window("x^2", (-3, 7), 100)
+
+    assert x_data[0] <= -3 and x_data[-1] >= 7
+    assert np.all(np.diff(x_data) > 0), "x_data is not sorted or has duplicated tile edges"
+    np.testing.assert_allclose(y_data, x_data ** 2)
+
+
+@pytest.mark.auto
+def test_sample_window_reuses_tiles_when_panning():
+    """Test panning back and forth only evaluates the tiles that were not visible before."""
+    cache = TileCache(64)
+
+    cache.sample_window("sin(x)", (0, 8), 100)
+    first_misses = cache.misses
+    cache.sample_window("sin(x)", (2, 10), 100)
+    cache.sample_window("sin(x)", (0, 8), 100)
+
+    assert cache.misses == first_misses + 1, "Only the newly visible tile should be evaluated"
+
+
+@pytest.mark.auto
+def test_tile_cache_bounds_total_size():
+    """Test the cache evicts the least recently used tiles once their arrays exceed max_bytes, keeping the newest one."""
+    cache = TileCache(100, max_bytes=3000)
+    tile = np.zeros(100), np.zeros(100)
+
+    for index in range(3):
+        cache.put(index, tile)
+    cache.put(1, tile)
+
+    assert list(cache.entries) == [1]
+    assert cache.nbytes == 1600 and cache.stats()["nbytes"] == 1600
+    assert cache.evictions == 3
+    cache.put("large", (np.zeros(1000), np.zeros(1000)))
+    assert list(cache.entries) == ["large"]
+    cache.clear()
+    assert cache.nbytes == 0
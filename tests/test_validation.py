@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 from PySide6.QtWidgets import QMessageBox
 from app.plotter import Plotter
+from app.utils.checks import is_complete_function, check_2d_function, check_3d_function
 from app.utils.validation import validate_range, validate_2d_function, parse_2d_function
 
 
@@ -49,6 +51,19 @@ def test_validate_2d_function_valid_input(mocker):
     QMessageBox.warning.assert_not_called()
 
 
+@pytest.mark.validation
+def test_validate_2d_function_several_functions(mocker):
+    """Test validate_2d_function accepts several functions separated by ';' and rejects an empty list."""
+    plotter = mocker.Mock(spec=Plotter)
+    mocker.patch.object(QMessageBox, 'warning')
+
+    assert validate_2d_function(plotter, "x^2; 2*x + 3\nx")
+    QMessageBox.warning.assert_not_called()
+
+    assert not validate_2d_function(plotter, " ; ")
+    QMessageBox.warning.assert_called_once()
+
+
 @pytest.mark.validation
 def test_validate_2d_function_invalid_input(mocker):
     """Test validate_2d_function with invalid input."""
@@ -76,5 +91,64 @@ def test_parse_2d_function():
     expected_x_data = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
     expected_y_data = [3.0, 7.0, 11.0, 15.0, 19.0, 23.0]
 
-    assert x_data == expected_x_data
-    assert y_data == expected_y_data
+    np.testing.assert_array_equal(x_data, expected_x_data)
+    np.testing.assert_array_equal(y_data, expected_y_data)
+
+
+@pytest.mark.auto
+def test_parse_2d_function_several_functions():
+    """Test parse_2d_function evaluates several functions over a shared x grid, one row each."""
+    x_data, y_data = parse_2d_function("2*x + 3; x^2", (0, 10), 5)
+
+    np.testing.assert_array_equal(x_data, [0.0, 2.0, 4.0, 6.0, 8.0, 10.0])
+    np.testing.assert_array_equal(y_data, [[3.0, 7.0, 11.0, 15.0, 19.0, 23.0], [0.0, 4.0, 16.0, 36.0, 64.0, 100.0]])
+
+
+@pytest.mark.validation
+@pytest.mark.parametrize("function_string, complete", [
+    ("x^2 + 1", True),
+    ("(x + 1)*(x - 1); x", True),
+    ("x^", False),
+    ("(x + 1", False),
+    ("x + 1)", False),
+    ("x^2; 3*", False),
+    ("2*()", False),
+    ("1.", False),
+])
+def test_is_complete_function(function_string, complete):
+    """
+    Test that unfinished function strings are recognized without parsing them.
+
+    Args:
+        function_string (str): The input function string.
+        complete (bool): Whether the function string looks finished.
+
+    """
+    assert is_complete_function(function_string) == complete
+
+
+@pytest.mark.validation
+@pytest.mark.parametrize("function_string, valid", [
+    ("sin(x) + exp(-x)", True),
+    ("a*cos(k*x - t) + pi", True),
+    ("foo(x)", False),
+    ("x + y", False),
+])
+def test_check_2d_function_names(function_string, valid):
+    """
+    Test that functions of x may use the known functions, constants and parameters, and no other names.
+
+    Args:
+        function_string (str): The input function string.
+        valid (bool): Whether the function string is accepted.
+
+    """
+    assert check_2d_function(function_string) == valid
+
+
+@pytest.mark.validation
+def test_check_3d_function():
+    """Test that functions of x and y may use the known functions and constants, and no other variables."""
+    assert check_3d_function("sin(x)*cos(y) + pi")
+    assert not check_3d_function("x*z")
+    assert not check_3d_function("x +* y")
@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+from app.utils.worker import EvaluationWorker
+
+
+@pytest.fixture
+def worker(qtbot):
+    evaluation_worker = EvaluationWorker()
+    yield evaluation_worker
+    evaluation_worker.shutdown()
+
+
+@pytest.mark.plotter
+def test_worker_delivers_result(worker: EvaluationWorker, qtbot):
+    """Test that the callback receives the result of the job on the GUI thread."""
+    results = []
+
+    with qtbot.waitSignal(worker.finished, timeout=5000) as blocker:
+        generation = worker.submit(lambda result: results.append((result, threading.current_thread())), sum, [1, 2, 3])
+
+    assert blocker.args == [generation]
+    assert results == [(6, threading.main_thread())]
+    assert not worker.is_busy()
+
+
+@pytest.mark.plotter
+def test_worker_drops_superseded_results(worker: EvaluationWorker, qtbot):
+    """Test that only the result of the latest job is delivered."""
+    release = threading.Event()
+    results = []
+
+    worker.submit(results.append, lambda: release.wait(5) and "stale")
+    with qtbot.waitSignal(worker.finished, timeout=5000):
+        worker.submit(results.append, lambda: "latest")
+    release.set()
+    qtbot.wait(100)
+
+    assert results == ["latest"]
+
+
+@pytest.mark.plotter
+def test_worker_reports_failures(worker: EvaluationWorker, qtbot):
+    """Test that an error raised by the job is reported instead of calling the callback."""
+    results = []
+
+    with qtbot.waitSignal(worker.failed, timeout=5000) as blocker:
+        worker.submit(results.append, lambda: 1 / 0)
+
+    assert "division" in blocker.args[1]
+    assert results == []
+    assert not worker.is_busy()
+
+
+@pytest.mark.plotter
+def test_worker_busy_changed(worker: EvaluationWorker, qtbot):
+    """Test that the worker reports when it starts and stops waiting for a result."""
+    states = []
+    worker.busy_changed.connect(states.append)
+
+    with qtbot.waitSignal(worker.finished, timeout=5000):
+        worker.submit(lambda result: None, lambda: None)
+
+    assert states == [True, False]
+
+
+@pytest.mark.plotter
+def test_worker_progressive_delivers_each_pass(worker: EvaluationWorker, qtbot):
+    """Test that every result yielded by a progressive job is handed to the callback, then finished is emitted."""
+    results = []
+
+    def passes(count):
+        yield from range(count)
+
+    with qtbot.waitSignal(worker.finished, timeout=5000):
+        worker.submit_progressive(results.append, passes, 3)
+
+    assert results == [0, 1, 2]
+    assert not worker.is_busy()
+
+
+@pytest.mark.plotter
+def test_worker_progressive_abandoned(worker: EvaluationWorker, qtbot):
+    """Test that a progressive job stops yielding once it is cancelled."""
+    started = threading.Event()
+    release = threading.Event()
+    yielded = []
+    results = []
+
+    def passes():
+        for index in range(10):
+            yielded.append(index)
+            yield index
+            started.set()
+            release.wait(5)
+
+    worker.submit_progressive(results.append, passes)
+    assert started.wait(5)
+    worker.cancel()
+    release.set()
+    qtbot.wait(100)
+
+    assert yielded == [0, 1], "The job went on after it was cancelled"
+    assert results in ([], [0]), "A pass yielded after the cancellation was delivered"
+    assert not worker.is_busy()